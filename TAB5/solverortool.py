@@ -11,6 +11,9 @@ Contraintes gérées:
 - Respect des limites horaires de chaque service
 - Gestion des services coupés (avec pause)
 - Répartition équitable des voyages selon la durée des services
+- Objectif lexicographique (optionnel) : d'abord le moins de services, puis l'équité
+- Services identiques ordonnés (pas de permutations en double)
+- Décomposition en groupes indépendants (plages horaires disjointes) résolus en parallèle
 
 Utilisation:
     from solver import VoyageSolver, afficher_proposition
@@ -31,200 +34,236 @@ Utilisation:
         afficher_proposition(prop, i)
 """
 
+import os
+import time
+
 from ortools.sat.python import cp_model
 from objet import service_agent, voyage, proposition
+from graphe_compatibilite import GrapheCompatibilite
+from symetries import cle_service, groupes_services_identiques, ordonner_colonnes
+from dedoublonnage import signature_planning, FiltreSolutions
+from decomposition import composantes_independantes, resoudre_composantes
+from profils_solveur import configurer_solveur
+from audit_modele import rapport_audit
+
+# "equite" : minimiser les écarts à la répartition idéale
+# "lexicographique" : minimiser le nombre de services utilisés, puis les écarts
+OBJECTIFS = ("equite", "lexicographique")
+
+
+def copier_service(service):
+    """Copie vide d'un service (mêmes limites et coupure) pour une proposition."""
+    new_service = service_agent(
+        num_service=service.num_service,
+        type_service=service.type_service
+    )
+    new_service.set_limites(service.heure_debut, service.heure_fin)
+    if service.type_service == "coupé":
+        new_service.set_coupure(service.heure_debut_coupure, service.heure_fin_coupure)
+    return new_service
+
+
+def lire_affectations(x, nb_voyages, nb_services, valeur):
+    """
+    Indices des voyages affectés à chaque service. x[v][s] n'existe que pour
+    les paires admissibles ; valeur lit une variable (solveur ou callback).
+    """
+    return [
+        [v_idx for v_idx in range(nb_voyages) if s_idx in x[v_idx] and valeur(x[v_idx][s_idx]) == 1]
+        for s_idx in range(nb_services)
+    ]
+
+
+def construire_proposition(numero, voyages, services, affectations):
+    """Proposition à partir des indices de voyages affectés à chaque service (affectations[s_idx])."""
+    prop = proposition(numero)
+    for s_idx, service in enumerate(services):
+        new_service = copier_service(service)
+        for v in sorted((voyages[v_idx] for v_idx in affectations[s_idx]), key=lambda x: x.hdebut):
+            new_service.ajouter_voyage(v)
+        prop.ajout_service(new_service)
+    return prop
 
 
 class SolutionCollector(cp_model.CpSolverSolutionCallback):
-    """Collecte toutes les solutions trouvées par le solveur."""
+    """
+    Collecte les solutions trouvées par le solveur, sans doublons : deux
+    solutions qui ne diffèrent que par la numérotation de services
+    interchangeables (même étiquette) ne sont comptées qu'une fois, et une
+    solution à moins de mouvements_min voyages déplacés d'une solution déjà
+    retenue est ignorée. Avec un objectif (expression du modèle), sa
+    valeur est relevée pour chaque solution retenue.
+    """
 
-    def __init__(self, variables, voyages, services, max_solutions=100):
+    def __init__(self, variables, voyages, services, max_solutions=100,
+                 etiquettes=None, mouvements_min=1, objectif=None):
         cp_model.CpSolverSolutionCallback.__init__(self)
-        self._variables = variables  # variables[v][s] = 1 si voyage v assigné au service s
+        self._variables = variables  # variables[v][s] = 1 si voyage v assigné au service s (paires admissibles)
         self._voyages = voyages
         self._services = services
         self._solutions = []
         self._max_solutions = max_solutions
         self._solution_count = 0
+        # etiquettes[s] : services de même étiquette interchangeables (défaut : tous distincts)
+        self._etiquettes = etiquettes if etiquettes is not None else list(range(len(services)))
+        self._filtre = FiltreSolutions(mouvements_min)
+        self._objectif = objectif
+        self._valeurs = []  # valeur de l'objectif de chaque solution retenue
 
     def on_solution_callback(self):
         if self._solution_count >= self._max_solutions:
             self.StopSearch()
             return
 
-        # Créer une nouvelle proposition pour cette solution
-        prop = proposition()
-
-        for s_idx, service in enumerate(self._services):
-            # Créer une copie du service pour cette solution
-            new_service = service_agent(
-                num_service=service.num_service,
-                type_service=service.type_service
-            )
-            new_service.set_limites(service.heure_debut, service.heure_fin)
-            if service.type_service == "coupé":
-                new_service.set_coupure(service.heure_debut_coupure, service.heure_fin_coupure)
-
-            # Ajouter les voyages assignés à ce service
-            voyages_assignes = []
-            for v_idx, v in enumerate(self._voyages):
-                if self.Value(self._variables[v_idx][s_idx]) == 1:
-                    voyages_assignes.append(v)
-
-            # Trier par heure de début et ajouter au service
-            voyages_assignes.sort(key=lambda x: x.hdebut)
-            for v in voyages_assignes:
-                new_service.ajouter_voyage(v)
-
-            prop.ajout_service(new_service)
+        affectations = lire_affectations(self._variables, len(self._voyages), len(self._services), self.Value)
+        signature = signature_planning(zip(self._etiquettes, affectations))
+        if not self._filtre.ajouter(signature):
+            return
 
+        # Créer une nouvelle proposition pour cette solution
+        prop = construire_proposition(self._solution_count + 1, self._voyages, self._services, affectations)
         self._solutions.append(prop)
+        self._valeurs.append(self.Value(self._objectif) if self._objectif is not None else 0)
         self._solution_count += 1
 
     def get_solutions(self):
         return self._solutions
 
+    def get_solutions_triees(self):
+        """Solutions de la meilleure à la moins bonne valeur d'objectif (minimisé), renumérotées"""
+        ordre = sorted(range(len(self._solutions)), key=lambda k: self._valeurs[k])
+        solutions = [self._solutions[k] for k in ordre]
+        for numero, prop in enumerate(solutions, 1):
+            prop.num_proposition = numero
+        return solutions
+
     def solution_count(self):
         return self._solution_count
 
+    def rejected_count(self):
+        return self._filtre.nb_rejetees
+
 
 class VoyageSolver:
     """Solveur pour assigner les voyages aux services."""
 
-    def __init__(self, voyages_disponibles, services, temps_minimum_entre_voyages=5):
+    def __init__(self, voyages_disponibles, services, temps_minimum_entre_voyages=5, graphe=None,
+                 objectif="equite"):
         """
         Args:
             voyages_disponibles: Liste des voyages à assigner
             services: Liste des services (service_agent) avec leurs limites définies
             temps_minimum_entre_voyages: Temps minimum en minutes entre deux voyages (défaut: 5)
+            graphe: GrapheCompatibilite déjà construit pour ces voyages (optionnel)
+            objectif: "equite" ou "lexicographique" (voir OBJECTIFS)
         """
+        if objectif not in OBJECTIFS:
+            raise ValueError(f"Objectif inconnu : {objectif} (attendu : {', '.join(OBJECTIFS)})")
+
+        self.objectif = objectif
         self.voyages = voyages_disponibles
         self.services = services
         self.temps_min = temps_minimum_entre_voyages
         self.model = cp_model.CpModel()
         self.variables = {}
 
+        if graphe is None:
+            graphe = GrapheCompatibilite.depuis_voyages(
+                self.voyages, battement_min=self.temps_min, battement_max=None
+            )
+        self.graphe = graphe
+
     def _creer_variables(self):
-        """Crée les variables de décision."""
+        """
+        Crée les variables de décision, seulement pour les paires
+        voyage/service admissibles (limites horaires et coupure du service) :
+        les autres paires n'existent pas dans le modèle.
+        """
         # x[v][s] = 1 si le voyage v est assigné au service s
         self.x = {}
-        for v_idx in range(len(self.voyages)):
+        for v_idx, v in enumerate(self.voyages):
             self.x[v_idx] = {}
-            for s_idx in range(len(self.services)):
-                self.x[v_idx][s_idx] = self.model.NewBoolVar(f'x_{v_idx}_{s_idx}')
-
-        # Variables d'ordre: order[v][s] = position du voyage v dans le service s
-        self.order = {}
-        max_voyages = len(self.voyages)
-        for v_idx in range(len(self.voyages)):
-            self.order[v_idx] = {}
-            for s_idx in range(len(self.services)):
-                self.order[v_idx][s_idx] = self.model.NewIntVar(0, max_voyages, f'order_{v_idx}_{s_idx}')
+            for s_idx, s in enumerate(self.services):
+                if self.voyage_admissible(v, s):
+                    self.x[v_idx][s_idx] = self.model.NewBoolVar(f'x_{v_idx}_{s_idx}')
 
     def _contrainte_voyage_unique(self):
-        """Chaque voyage est assigné à exactement un service."""
+        """Chaque voyage est assigné à exactement un service (aucun admissible : infaisable)."""
         for v_idx in range(len(self.voyages)):
-            self.model.Add(sum(self.x[v_idx][s_idx] for s_idx in range(len(self.services))) == 1)
-
-    def _contrainte_limites_service(self):
-        """Les voyages doivent respecter les limites horaires du service."""
-        for v_idx, v in enumerate(self.voyages):
-            for s_idx, s in enumerate(self.services):
-                # Si le voyage est assigné à ce service, il doit respecter les limites
-                if s.heure_debut is not None:
-                    # Si x[v][s] = 1, alors v.hdebut >= s.heure_debut
-                    self.model.Add(v.hdebut >= s.heure_debut).OnlyEnforceIf(self.x[v_idx][s_idx])
-
-                if s.heure_fin is not None:
-                    # Si x[v][s] = 1, alors v.hfin <= s.heure_fin
-                    self.model.Add(v.hfin <= s.heure_fin).OnlyEnforceIf(self.x[v_idx][s_idx])
-
-                # Contrainte de coupure pour les services coupés
-                if s.type_service == "coupé" and s.heure_debut_coupure is not None:
-                    # Le voyage ne doit pas chevaucher la coupure
-                    # Soit il finit avant la coupure, soit il commence après
-                    finit_avant = self.model.NewBoolVar(f'finit_avant_{v_idx}_{s_idx}')
-                    commence_apres = self.model.NewBoolVar(f'commence_apres_{v_idx}_{s_idx}')
-
-                    self.model.Add(v.hfin <= s.heure_debut_coupure).OnlyEnforceIf(finit_avant)
-                    self.model.Add(v.hfin > s.heure_debut_coupure).OnlyEnforceIf(finit_avant.Not())
-                    self.model.Add(v.hdebut >= s.heure_fin_coupure).OnlyEnforceIf(commence_apres)
-                    self.model.Add(v.hdebut < s.heure_fin_coupure).OnlyEnforceIf(commence_apres.Not())
-
-                    # Si assigné à ce service, une des deux conditions doit être vraie
-                    self.model.AddBoolOr([finit_avant, commence_apres]).OnlyEnforceIf(self.x[v_idx][s_idx])
+            self.model.Add(sum(self.x[v_idx].values()) == 1)
 
     def _contrainte_enchainement_arrets(self):
         """
         Un voyage doit commencer là où se termine le précédent.
         Compare les 3 premiers caractères des arrêts.
+
+        Chaque service est un chemin dépôt → voyages → dépôt (AddCircuit) :
+        seuls les arcs du graphe de compatibilité (arrêts identiques, au moins
+        temps_min minutes d'écart) entre voyages admissibles dans le service
+        reçoivent un littéral, les autres paires ne peuvent pas se suivre.
         """
+        self.arcs = {}  # (v1, v2, s) -> v2 suit directement v1 dans le service s
+        self.premiers = {}
+        self.derniers = {}
+        self.vides = {}
+
         for s_idx in range(len(self.services)):
-            for v1_idx, v1 in enumerate(self.voyages):
-                for v2_idx, v2 in enumerate(self.voyages):
-                    if v1_idx == v2_idx:
-                        continue
-
-                    # Si v1 et v2 sont dans le même service et v1 est juste avant v2
-                    both_in_service = self.model.NewBoolVar(f'both_{v1_idx}_{v2_idx}_{s_idx}')
-                    self.model.AddBoolAnd([
-                        self.x[v1_idx][s_idx],
-                        self.x[v2_idx][s_idx]
-                    ]).OnlyEnforceIf(both_in_service)
-                    self.model.AddBoolOr([
-                        self.x[v1_idx][s_idx].Not(),
-                        self.x[v2_idx][s_idx].Not()
-                    ]).OnlyEnforceIf(both_in_service.Not())
-
-                    # v1 est chronologiquement avant v2 et directement consécutif
-                    if v1.hfin <= v2.hdebut:
-                        # Vérifier qu'il y a au moins 5 minutes entre les voyages
-                        if v2.hdebut - v1.hfin < self.temps_min:
-                            # Pas assez de temps entre ces deux voyages
-                            # Ils ne peuvent pas être consécutifs dans le même service
-                            # On vérifie s'il y a un voyage entre les deux
-                            pass
-
-                        # Vérifier l'enchaînement des arrêts
-                        arret_fin_v1 = v1.arret_fin_id()
-                        arret_debut_v2 = v2.arret_debut_id()
-
-                        if arret_fin_v1 != arret_debut_v2:
-                            # Ces voyages ne peuvent pas se suivre directement
-                            # On doit vérifier qu'il y a un voyage entre eux
-                            v1_before_v2 = self.model.NewBoolVar(f'v1_{v1_idx}_before_v2_{v2_idx}_s{s_idx}')
-
-                            # v1 est juste avant v2 si aucun autre voyage n'est entre eux
-                            intermediaires = []
-                            for v3_idx, v3 in enumerate(self.voyages):
-                                if v3_idx != v1_idx and v3_idx != v2_idx:
-                                    if v1.hfin <= v3.hdebut and v3.hfin <= v2.hdebut:
-                                        intermediaires.append(self.x[v3_idx][s_idx])
-
-                            if not intermediaires:
-                                # Pas de voyage intermédiaire possible
-                                # Si les deux sont dans le même service, c'est interdit
-                                self.model.AddBoolOr([
-                                    self.x[v1_idx][s_idx].Not(),
-                                    self.x[v2_idx][s_idx].Not()
-                                ])
+            voyages_service = [v_idx for v_idx in self.graphe.ordre if s_idx in self.x[v_idx]]
+            noeuds = {v_idx: pos + 1 for pos, v_idx in enumerate(voyages_service)}
+
+            # Service vide : boucle sur le dépôt (nœud 0)
+            vide = self.model.NewBoolVar(f'vide_{s_idx}')
+            self.vides[s_idx] = vide
+            arcs_circuit = [(0, 0, vide)]
+
+            for v_idx, noeud in noeuds.items():
+                x = self.x[v_idx][s_idx]
+                self.model.AddImplication(vide, x.Not())
+
+                # Voyage hors du service : boucle sur son nœud
+                arcs_circuit.append((noeud, noeud, x.Not()))
+                self.premiers[v_idx, s_idx] = self.model.NewBoolVar(f'premier_{v_idx}_{s_idx}')
+                self.derniers[v_idx, s_idx] = self.model.NewBoolVar(f'dernier_{v_idx}_{s_idx}')
+                arcs_circuit.append((0, noeud, self.premiers[v_idx, s_idx]))
+                arcs_circuit.append((noeud, 0, self.derniers[v_idx, s_idx]))
+
+                for v2_idx in self.graphe.successeurs[v_idx]:
+                    if v2_idx in noeuds:
+                        suit = self.model.NewBoolVar(f'suit_{v_idx}_{v2_idx}_{s_idx}')
+                        arcs_circuit.append((noeud, noeuds[v2_idx], suit))
+                        self.arcs[v_idx, v2_idx, s_idx] = suit
+
+            self.model.AddCircuit(arcs_circuit)
 
     def _contrainte_temps_minimum(self):
-        """Au moins 5 minutes entre chaque voyage consécutif dans un service."""
-        for s_idx in range(len(self.services)):
-            for v1_idx, v1 in enumerate(self.voyages):
-                for v2_idx, v2 in enumerate(self.voyages):
-                    if v1_idx >= v2_idx:
-                        continue
-
-                    # Si v1 finit après le début de v2 - temps_min, ils ne peuvent pas
-                    # être tous les deux dans le même service (chevauchement ou trop proche)
-                    if v1.hfin > v2.hdebut - self.temps_min and v1.hdebut < v2.hfin:
-                        # Chevauchement ou moins de 5 min d'écart
-                        self.model.AddBoolOr([
-                            self.x[v1_idx][s_idx].Not(),
-                            self.x[v2_idx][s_idx].Not()
-                        ])
+        """
+        Au moins temps_min minutes entre chaque voyage consécutif dans un service.
+
+        Chaque voyage admissible est un intervalle optionnel [début, fin +
+        temps_min), présent si le voyage est dans le service : un AddNoOverlap
+        par service remplace les interdictions deux à deux. La coupure est un
+        intervalle fixe du même service ; les horaires étant constants, les
+        voyages qui la chevauchent sont déjà écartés par voyage_admissible et
+        l'intervalle ne sert qu'aux propagateurs d'ordonnancement.
+        """
+        for s_idx, s in enumerate(self.services):
+            intervalles = []
+            for v_idx in self.graphe.ordre:
+                x = self.x[v_idx].get(s_idx)
+                if x is not None:
+                    v = self.voyages[v_idx]
+                    intervalles.append(self.model.NewOptionalFixedSizeIntervalVar(
+                        v.hdebut, v.hfin - v.hdebut + self.temps_min, x, f'intervalle_{v_idx}_{s_idx}'))
+
+            if len(intervalles) < 2:
+                continue
+            if s.type_service == "coupé" and s.heure_debut_coupure is not None:
+                # Un voyage qui finit à la coupure occupe [.., debut_coupure + temps_min)
+                debut = s.heure_debut_coupure + self.temps_min
+                if s.heure_fin_coupure > debut:
+                    intervalles.append(self.model.NewFixedSizeIntervalVar(
+                        debut, s.heure_fin_coupure - debut, f'coupure_{s_idx}'))
+            self.model.AddNoOverlap(intervalles)
 
     def _contrainte_repartition_equitable(self):
         """
@@ -255,50 +294,306 @@ class VoyageSolver:
             # Ajouter au service le plus long
             idx_max = durees.index(max(durees))
             nb_ideal[idx_max] += 1
-
-        # Ajouter une contrainte souple (minimiser l'écart à l'idéal)
-        ecarts = []
+        self.nb_ideal = nb_ideal
+
+        # Ajouter une contrainte souple (minimiser l'écart à l'idéal).
+        # L'écart étant minimisé, ecart >= |d| suffit : deux inégalités
+        # linéaires propagent mieux qu'un AddAbsEquality (max réifié).
+        # Sans objectif (énumération), voir _figer_ecarts.
+        self.ecarts = []
+        self.differences = []  # d = voyages du service - nombre idéal
         for s_idx in range(len(self.services)):
-            nb_voyages_service = sum(self.x[v_idx][s_idx] for v_idx in range(len(self.voyages)))
+            nb_voyages_service = sum(self.x[v_idx][s_idx] for v_idx in range(len(self.voyages))
+                                     if s_idx in self.x[v_idx])
             ecart = self.model.NewIntVar(0, nb_voyages, f'ecart_{s_idx}')
-            self.model.AddAbsEquality(ecart, nb_voyages_service - nb_ideal[s_idx])
-            ecarts.append(ecart)
+            self.model.Add(ecart >= nb_voyages_service - nb_ideal[s_idx])
+            self.model.Add(ecart >= nb_ideal[s_idx] - nb_voyages_service)
+            self.ecarts.append(ecart)
+            self.differences.append(nb_voyages_service - nb_ideal[s_idx])
 
         # Minimiser la somme des écarts
-        self.model.Minimize(sum(ecarts))
+        self.model.Minimize(sum(self.ecarts))
 
-    def resoudre(self, max_solutions=10, timeout_seconds=60):
+    def _figer_ecarts(self):
         """
-        Résout le problème et retourne les solutions.
+        ecart == |d| pour l'énumération sans objectif : avec ecart >= |d|
+        seulement, un écart gonflé jusqu'à optimum + ecart_tolere fausserait
+        la valeur relevée par le collecteur (et le tri des solutions), et
+        chaque affectation serait énumérée une fois par valeur d'écart.
+        """
+        for ecart, difference in zip(self.ecarts, self.differences):
+            self.model.AddAbsEquality(ecart, difference)
 
-        Args:
-            max_solutions: Nombre maximum de solutions à collecter
-            timeout_seconds: Temps maximum de résolution en secondes
+    def _briser_symetries(self):
+        """
+        Services interchangeables (mêmes limites, coupure, type et même
+        nombre idéal de voyages) : le premier voyage du service k précède
+        celui du service k+1, pour ne pas énumérer les permutations.
+        """
+        cles = [cle_service(s, self.nb_ideal[s_idx]) for s_idx, s in enumerate(self.services)]
+        for groupe in groupes_services_identiques(cles):
+            colonnes = [[self.x[v_idx].get(s_idx) for v_idx in range(len(self.voyages))] for s_idx in groupe]
+            indice = [[self.affectation_initiale.get(v_idx) == s_idx for v_idx in range(len(self.voyages))]
+                      for s_idx in groupe]
+            ordonner_colonnes(self.model, colonnes, self.graphe.ordre, f'sym_{groupe[0]}', indice)
+
+    def _affectation_couverture(self):
+        """
+        Affectation de départ : les chaînes de la couverture minimale du
+        graphe, dans l'ordre de leur premier voyage, chacune dans le premier
+        service libre qui admet tous ses voyages (ordre compatible avec le
+        bris de symétrie). Une chaîne sans service libre reste non affectée.
 
         Returns:
-            Liste d'objets proposition contenant les solutions
+            {indice voyage: indice service}
         """
+        affectation = {}
+        libres = list(range(len(self.services)))
+        self.chaines_initiales = {}
+        for chaine in self.graphe.couverture_minimale():
+            for s_idx in libres:
+                if all(s_idx in self.x[v_idx] for v_idx in chaine):
+                    libres.remove(s_idx)
+                    self.chaines_initiales[s_idx] = chaine
+                    for v_idx in chaine:
+                        affectation[v_idx] = s_idx
+                    break
+        return affectation
+
+    def _ajouter_indice(self):
+        """Part de l'affectation de départ (AddHint) : voyages, chemins, services vides et écarts."""
+        for v_idx, variables in self.x.items():
+            for s_idx, x in variables.items():
+                self.model.AddHint(x, self.affectation_initiale.get(v_idx) == s_idx)
+
+        # Indice complet (écarts compris) : CP-SAT part directement de cette solution
+        for s_idx, ecart in enumerate(self.ecarts):
+            self.model.AddHint(ecart, abs(len(self.chaines_initiales.get(s_idx, [])) - self.nb_ideal[s_idx]))
+
+        for s_idx, vide in self.vides.items():
+            chaine = self.chaines_initiales.get(s_idx, [])
+            arcs_chaine = set(zip(chaine, chaine[1:]))
+            self.model.AddHint(vide, not chaine)
+            for (v_idx, s), premier in self.premiers.items():
+                if s == s_idx:
+                    self.model.AddHint(premier, bool(chaine) and chaine[0] == v_idx)
+                    self.model.AddHint(self.derniers[v_idx, s], bool(chaine) and chaine[-1] == v_idx)
+            for (v1_idx, v2_idx, s), suit in self.arcs.items():
+                if s == s_idx:
+                    self.model.AddHint(suit, (v1_idx, v2_idx) in arcs_chaine)
+
+    def _construire_modele(self):
+        """Pose les variables, les contraintes et l'objectif."""
         self._creer_variables()
+        self.affectation_initiale = self._affectation_couverture()
         self._contrainte_voyage_unique()
-        self._contrainte_limites_service()
         self._contrainte_temps_minimum()
         self._contrainte_enchainement_arrets()
         self._contrainte_repartition_equitable()
+        self._briser_symetries()
+        self._ajouter_indice()
+
+    def _resoudre_etape_services(self, profil, temps_limite, nb_workers=None, sortie=None):
+        """
+        Première étape de l'objectif lexicographique : minimise le nombre de
+        services utilisés, fige cette valeur puis remet l'objectif d'équité.
+        La solution trouvée devient l'indice complet (AddHint sur toutes les
+        variables) : la seconde étape part d'une solution faisable.
+
+        sortie : flux des messages (None = sys.stdout, voir resoudre_decompose)
+
+        Returns:
+            Statut CP-SAT de l'étape (ni OPTIMAL ni FEASIBLE : pas de solution)
+        """
+        nb_services_utilises = len(self.services) - sum(self.vides.values())
+        self.model.ClearObjective()
+        self.model.Minimize(nb_services_utilises)
+
+        solver = cp_model.CpSolver()
+        configurer_solveur(solver, self.model, profil, temps_limite, nb_workers=nb_workers)
+        status = solver.Solve(self.model)
+        print(f"Étape 1 (services utilisés): {solver.StatusName(status)}", file=sortie)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return status
+
+        meilleur = round(solver.ObjectiveValue())
+        print(f"  {meilleur} service(s) utilisé(s) sur {len(self.services)}", file=sortie)
+
+        self.model.ClearHints()
+        for indice, valeur in enumerate(solver.ResponseProto().solution):
+            self.model.AddHint(self.model.get_int_var_from_proto_index(indice), valeur)
+        self.model.Add(nb_services_utilises <= meilleur)
+        self.model.ClearObjective()
+        self.model.Minimize(sum(self.ecarts))
+        return status
+
+    @staticmethod
+    def voyage_admissible(v, s):
+        """
+        True si le voyage respecte les limites horaires et la coupure du
+        service (même règle que service_agent.ajouter_voyage). Les horaires
+        sont constants : évalué une fois par paire, avant de poser le modèle.
+        """
+        return s.voyage_dans_limites(v)[0]
+
+    def resoudre(self, max_solutions=10, timeout_seconds=60, mouvements_min=1, profil="auto", audit=False,
+                 ecart_tolere=0):
+        """
+        Résout le problème et retourne les solutions.
+
+        Avec plusieurs solutions demandées, l'optimum d'équité est d'abord
+        cherché (recherche parallèle, moitié du temps), puis les solutions
+        sont énumérées sans objectif parmi celles qui font au plus
+        optimum + ecart_tolere : l'indice de départ (couverture par chemins,
+        peu équitable) n'est plus proposé en premier.
+
+        Args:
+            max_solutions: Nombre maximum de solutions à collecter
+            timeout_seconds: Temps maximum de résolution en secondes
+            mouvements_min: Nombre minimal de voyages déplacés entre deux
+                            solutions retournées (1 = solutions distinctes)
+            profil: Profil de paramètres CP-SAT (voir profils_solveur)
+            audit: Afficher l'audit du modèle (voir audit_modele)
+            ecart_tolere: Somme des écarts d'équité tolérée au-delà de
+                          l'optimum pour les solutions alternatives
+
+        Returns:
+            Liste d'objets proposition, de la plus équitable à la moins équitable
+        """
+        self._construire_modele()
+        if audit:
+            print(rapport_audit(self.model, "Audit VoyageSolver"))
+
+        if self.objectif == "lexicographique":
+            # Moitié du temps pour chaque étape ; la seconde reprend le temps non utilisé
+            debut = time.time()
+            status = self._resoudre_etape_services(profil, timeout_seconds / 2)
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                return []
+            timeout_seconds = max(timeout_seconds - (time.time() - debut), 1)
+
+        # Optimum d'abord : recherche parallèle, presolve complet
+        debut = time.time()
+        temps_optimum = timeout_seconds if max_solutions <= 1 else timeout_seconds / 2
+        solver = cp_model.CpSolver()
+        print(configurer_solveur(solver, self.model, profil, temps_optimum))
+        status = solver.Solve(self.model)
+        print(f"Statut: {solver.StatusName(status)}")
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return []
+
+        if max_solutions <= 1:
+            affectations = lire_affectations(self.x, len(self.voyages), len(self.services), solver.Value)
+            return [construire_proposition(1, self.voyages, self.services, affectations)]
+
+        # Énumération sans objectif (avec objectif, CP-SAT ne rappelle que les
+        # solutions améliorantes) parmi les solutions proches de l'optimum
+        optimum = round(solver.ObjectiveValue())
+        print(f"Équité optimale: {optimum} (écart toléré: {ecart_tolere})")
+        self.model.ClearHints()
+        for indice, valeur in enumerate(solver.ResponseProto().solution):
+            self.model.AddHint(self.model.get_int_var_from_proto_index(indice), valeur)
+        self.model.ClearObjective()
+        self._figer_ecarts()
+        self.model.Add(sum(self.ecarts) <= optimum + ecart_tolere)
 
-        # Créer le solveur
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = timeout_seconds
-        solver.parameters.enumerate_all_solutions = True
+        print(configurer_solveur(solver, self.model, profil, max(timeout_seconds - (time.time() - debut), 1),
+                                 enumerer=True))
 
         # Collecter les solutions
-        collector = SolutionCollector(self.x, self.voyages, self.services, max_solutions)
+        # Services interchangeables : même étiquette (indice du premier service de même clé)
+        cles = [cle_service(s, self.nb_ideal[s_idx]) for s_idx, s in enumerate(self.services)]
+        etiquettes = [cles.index(cle) for cle in cles]
+        collector = SolutionCollector(self.x, self.voyages, self.services, max_solutions,
+                                      etiquettes, mouvements_min, objectif=sum(self.ecarts))
 
         status = solver.Solve(self.model, collector)
 
         print(f"Statut: {solver.StatusName(status)}")
         print(f"Nombre de solutions trouvées: {collector.solution_count()}")
+        print(f"Solutions ignorées (doublons ou trop proches): {collector.rejected_count()}")
 
-        return collector.get_solutions()
+        return collector.get_solutions_triees()
+
+    def resoudre_decompose(self, timeout_seconds=60, profil="auto"):
+        """
+        Découpe voyages et services en groupes indépendants (aucun voyage du
+        groupe n'est admissible dans un service d'un autre groupe), résout
+        chaque groupe séparément et en parallèle, puis fusionne les meilleures
+        solutions en une seule proposition.
+
+        La répartition équitable est calculée à l'intérieur de chaque groupe.
+
+        Args:
+            timeout_seconds: Temps maximum de résolution en secondes (global)
+            profil: Profil de paramètres CP-SAT (voir profils_solveur)
+
+        Returns:
+            Une proposition, ou None si un groupe n'a pas de solution
+        """
+        composantes = composantes_independantes(
+            len(self.voyages), len(self.services),
+            lambda v_idx, s_idx: self.voyage_admissible(self.voyages[v_idx], self.services[s_idx])
+        )
+
+        sans_service = [voyages_idx for voyages_idx, services_idx in composantes if not services_idx]
+        if sans_service:
+            print(f"Statut: INFEASIBLE ({sum(map(len, sans_service))} voyage(s) sans service possible)")
+            return None
+
+        nb_cpu = os.cpu_count() or 1
+        nb_paralleles = min(len(composantes), nb_cpu)
+        nb_workers = max(1, nb_cpu // nb_paralleles)
+        temps_groupe = timeout_seconds * nb_paralleles / len(composantes)
+        print(f"Décomposition: {len(composantes)} groupe(s) indépendant(s)")
+
+        def resoudre_groupe(composante, sortie):
+            voyages_idx, services_idx = composante
+            sous_solveur = VoyageSolver(
+                [self.voyages[v_idx] for v_idx in voyages_idx],
+                [self.services[s_idx] for s_idx in services_idx],
+                self.temps_min,
+                objectif=self.objectif
+            )
+            sous_solveur._construire_modele()
+
+            temps_restant = temps_groupe
+            if self.objectif == "lexicographique":
+                debut = time.time()
+                status = sous_solveur._resoudre_etape_services(profil, temps_groupe / 2, nb_workers, sortie)
+                if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                    return status, None
+                temps_restant = max(temps_groupe - (time.time() - debut), 1)
+
+            solver = cp_model.CpSolver()
+            configurer_solveur(solver, sous_solveur.model, profil, temps_restant, nb_workers=nb_workers)
+            status = solver.Solve(sous_solveur.model)
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                return status, None
+
+            affectations_locales = lire_affectations(sous_solveur.x, len(voyages_idx), len(services_idx),
+                                                     solver.Value)
+            affectations = {
+                services_idx[s_local]: [voyages_idx[v_local] for v_local in indices]
+                for s_local, indices in enumerate(affectations_locales)
+            }
+            return status, affectations
+
+        resultats = resoudre_composantes(composantes, resoudre_groupe, max_workers=nb_paralleles)
+
+        affectations = {}
+        for status, affectations_groupe in resultats:
+            if affectations_groupe is None:
+                print(f"Statut: {cp_model.CpSolver().StatusName(status)} (groupe sans solution)")
+                return None
+            affectations.update(affectations_groupe)
+
+        statuts = {status for status, _ in resultats}
+        print(f"Statut: {'OPTIMAL' if statuts == {cp_model.OPTIMAL} else 'FEASIBLE'}")
+
+        return construire_proposition(1, self.voyages, self.services,
+                                      [affectations.get(s_idx, []) for s_idx in range(len(self.services))])
 
 
 def afficher_proposition(prop, numero=1):
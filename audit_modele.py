@@ -0,0 +1,203 @@
+"""
+Audit d'un modèle CP-SAT
+========================
+
+Les variables qu'aucune contrainte ne lit ne changent pas les solutions
+mais alourdissent le modèle : le presolve doit les découvrir et les
+supprimer, la mémoire les garde jusque-là, et enumerate_all_solutions
+(presolve bridé) les énumère. auditer_modele lit le proto du modèle
+contrainte par contrainte, selon son type (LECTEURS_CONTRAINTES : les
+numéros de nœuds d'un circuit ne sont pas des variables), et signale :
+
+- les variables sans contrainte (ni contrainte, ni objectif) ;
+- les réifications inutilisées : littéraux qui n'apparaissent que comme
+  condition (OnlyEnforceIf) et que rien d'autre ne lit — leur valeur est
+  libre, la contrainte qu'ils conditionnent ne sert à rien ;
+- le nombre de contraintes par type et de variables par famille (préfixe
+  du nom, par exemple "x" pour x_3_1).
+
+Utilisation:
+    from audit_modele import auditer_modele, rapport_audit
+
+    print(rapport_audit(model))
+    audit = auditer_modele(model)
+    assert not audit["sans_contrainte"]
+"""
+
+import os
+import tempfile
+from collections import Counter
+from typing import Any, Callable, Dict, List
+
+from ortools.sat import cp_model_pb2
+from ortools.sat.python import cp_model
+
+# Nombre maximum de noms affichés par catégorie dans le rapport
+MAX_NOMS_AFFICHES = 10
+
+
+def _variable(reference: int) -> int:
+    """Indice de variable d'une référence (un littéral négatif désigne la négation)"""
+    return reference if reference >= 0 else -reference - 1
+
+
+def _expressions(*expressions) -> List[int]:
+    """Variables d'expressions linéaires (LinearExpressionProto)"""
+    return [reference for expression in expressions for reference in expression.vars]
+
+
+def _element(corps) -> List[int]:
+    # Ancien format : index, target et vars sont des variables ; sinon expressions
+    if corps.vars:
+        return [corps.index, corps.target, *corps.vars]
+    return _expressions(corps.linear_index, corps.linear_target, *corps.exprs)
+
+
+# Références de variables ou de littéraux lues par le corps de chaque type
+# de contrainte. Les numéros de nœuds (circuit, routes : tails, heads) et les
+# indices de contraintes interval (voir CHAMPS_INTERVALLES) n'en sont pas.
+LECTEURS_CONTRAINTES: Dict[str, Callable[[Any], List[int]]] = {
+    "bool_or": lambda corps: list(corps.literals),
+    "bool_and": lambda corps: list(corps.literals),
+    "at_most_one": lambda corps: list(corps.literals),
+    "exactly_one": lambda corps: list(corps.literals),
+    "bool_xor": lambda corps: list(corps.literals),
+    "int_div": lambda corps: _expressions(corps.target, *corps.exprs),
+    "int_mod": lambda corps: _expressions(corps.target, *corps.exprs),
+    "int_prod": lambda corps: _expressions(corps.target, *corps.exprs),
+    "lin_max": lambda corps: _expressions(corps.target, *corps.exprs),
+    "linear": lambda corps: list(corps.vars),
+    "all_diff": lambda corps: _expressions(*corps.exprs),
+    "element": _element,
+    "circuit": lambda corps: list(corps.literals),
+    "routes": lambda corps: list(corps.literals) + [
+        reference for dimension in corps.dimensions for reference in _expressions(*dimension.exprs)],
+    "table": lambda corps: list(corps.vars) + _expressions(*corps.exprs),
+    "automaton": lambda corps: list(corps.vars) + _expressions(*corps.exprs),
+    "inverse": lambda corps: list(corps.f_direct) + list(corps.f_inverse),
+    "reservoir": lambda corps: (_expressions(*corps.time_exprs, *corps.level_changes)
+                                + list(corps.active_literals)),
+    "interval": lambda corps: _expressions(corps.start, corps.end, corps.size),
+    "no_overlap": lambda corps: [],
+    "no_overlap_2d": lambda corps: [],
+    "cumulative": lambda corps: _expressions(corps.capacity, *corps.demands),
+    "dummy_constraint": lambda corps: list(corps.vars),
+}
+
+# Champs qui désignent des contraintes interval (indices de contraintes) :
+# la présence d'un intervalle optionnel (enforcement_literal) y est lue
+CHAMPS_INTERVALLES = {
+    "no_overlap": ("intervals",),
+    "no_overlap_2d": ("x_intervals", "y_intervals"),
+    "cumulative": ("intervals",),
+}
+
+
+def _references_contrainte(type_contrainte: str, corps) -> List[int]:
+    """Références lues par le corps d'une contrainte, selon son type"""
+    lecteur = LECTEURS_CONTRAINTES.get(type_contrainte)
+    if lecteur is None:
+        raise ValueError(f"Type de contrainte non pris en charge par l'audit : {type_contrainte}")
+    return lecteur(corps)
+
+
+def _proto(model: cp_model.CpModel) -> cp_model_pb2.CpModelProto:
+    """
+    Copie protobuf du modèle : model.Proto() n'expose pas la réflexion
+    protobuf (ListFields, WhichOneof) ; on passe par un export binaire.
+    """
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "modele.pb")
+        model.ExportToFile(chemin)
+        proto = cp_model_pb2.CpModelProto()
+        with open(chemin, "rb") as fichier:
+            proto.ParseFromString(fichier.read())
+    return proto
+
+
+def famille(nom: str) -> str:
+    """Famille d'une variable : son nom jusqu'au premier morceau numéroté (x_v3_s1 -> x)"""
+    morceaux = []
+    for morceau in nom.split("_"):
+        if not morceau or any(c.isdigit() for c in morceau):
+            break
+        morceaux.append(morceau)
+    return "_".join(morceaux) or "(sans nom)"
+
+
+def auditer_modele(model: cp_model.CpModel) -> Dict[str, Any]:
+    """
+    Analyse statique du modèle (sans le résoudre).
+
+    Returns:
+        {
+            'nb_variables', 'nb_contraintes',
+            'contraintes_par_type': {type: nombre},
+            'variables_par_famille': {famille: nombre},
+            'sans_contrainte': [noms],
+            'reifications_inutilisees': [noms],
+        }
+    """
+    proto = _proto(model)
+    nb_variables = len(proto.variables)
+
+    lues = [0] * nb_variables           # occurrences hors conditions
+    conditions = [0] * nb_variables     # occurrences comme enforcement_literal
+    contraintes_par_type = Counter()
+
+    references = []
+    intervalles = []  # contraintes interval lues par no_overlap, cumulative...
+    for contrainte in proto.constraints:
+        type_contrainte = contrainte.WhichOneof("constraint")
+        contraintes_par_type[type_contrainte or "vide"] += 1
+        for reference in contrainte.enforcement_literal:
+            conditions[_variable(reference)] += 1
+        if type_contrainte is not None:
+            corps = getattr(contrainte, type_contrainte)
+            references += _references_contrainte(type_contrainte, corps)
+            for champ in CHAMPS_INTERVALLES.get(type_contrainte, ()):
+                intervalles += getattr(corps, champ)
+
+    # Présence des intervalles optionnels, objectif et stratégie de recherche
+    for indice in set(intervalles):
+        references += proto.constraints[indice].enforcement_literal
+    references += proto.objective.vars
+    references += proto.floating_point_objective.vars
+    for strategie in proto.search_strategy:
+        references += list(strategie.variables) + _expressions(*strategie.exprs)
+    for reference in references:
+        lues[_variable(reference)] += 1
+
+    def nom(indice: int) -> str:
+        return proto.variables[indice].name or f"#{indice}"
+
+    return {
+        "nb_variables": nb_variables,
+        "nb_contraintes": len(proto.constraints),
+        "contraintes_par_type": dict(contraintes_par_type.most_common()),
+        "variables_par_famille": dict(Counter(famille(nom(i)) for i in range(nb_variables)).most_common()),
+        "sans_contrainte": [nom(i) for i in range(nb_variables) if not lues[i] and not conditions[i]],
+        "reifications_inutilisees": [nom(i) for i in range(nb_variables) if conditions[i] and not lues[i]],
+    }
+
+
+def rapport_audit(model: cp_model.CpModel, titre: str = "Audit du modèle") -> str:
+    """Rapport lisible de auditer_modele"""
+    audit = auditer_modele(model)
+    lignes = [
+        f"{titre}: {audit['nb_variables']} variables, {audit['nb_contraintes']} contraintes",
+        "  Contraintes par type:",
+    ]
+    lignes += [f"    {type_contrainte}: {nombre}" for type_contrainte, nombre in audit["contraintes_par_type"].items()]
+    lignes.append("  Variables par famille:")
+    lignes += [f"    {nom_famille}: {nombre}" for nom_famille, nombre in audit["variables_par_famille"].items()]
+
+    for cle, libelle in (("sans_contrainte", "Variables sans contrainte"),
+                         ("reifications_inutilisees", "Réifications inutilisées")):
+        noms = audit[cle]
+        lignes.append(f"  {libelle}: {len(noms)}")
+        if noms:
+            suite = ", ..." if len(noms) > MAX_NOMS_AFFICHES else ""
+            lignes.append(f"    {', '.join(noms[:MAX_NOMS_AFFICHES])}{suite}")
+
+    return "\n".join(lignes)
@@ -0,0 +1,103 @@
+"""
+Décomposition en sous-problèmes indépendants
+============================================
+
+Un voyage et un service sont liés si le voyage est admissible dans le
+service (plage horaire, coupure). Les composantes connexes de ce graphe
+biparti ne partagent ni voyage ni service : les contraintes d'un modèle
+d'affectation (un voyage → un service, compatibilité des voyages d'un même
+service) ne les relient jamais, on peut donc les résoudre séparément et
+fusionner les affectations.
+
+C'est le cas des fichiers matin / après-midi aux plages disjointes, ou
+des lignes dont les services ont leur propre plage horaire. Des services
+sans limite relient tous les voyages : une seule composante.
+
+Utilisation:
+    from decomposition import composantes_independantes, resoudre_composantes
+
+    composantes = composantes_independantes(len(voyages), len(services),
+                                            lambda i, j: admissible(voyages[i], services[j]))
+    resultats = resoudre_composantes(composantes, lambda c, sortie: resoudre(*c, sortie=sortie))
+"""
+
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, TextIO, Tuple, TypeVar
+
+Composante = Tuple[List[int], List[int]]  # (indices voyages, indices services)
+R = TypeVar("R")
+
+
+def composantes_independantes(nb_voyages: int, nb_services: int,
+                              admissible: Callable[[int, int], bool]) -> List[Composante]:
+    """
+    Composantes connexes du graphe voyages–services (union-find).
+
+    Args:
+        nb_voyages: Nombre de voyages
+        nb_services: Nombre de services
+        admissible: admissible(i, j) = le voyage i peut être affecté au service j
+
+    Returns:
+        Liste de (voyages, services), indices croissants, triée par premier
+        voyage. Les voyages sans service admissible forment des composantes
+        sans service ; les services sans voyage admissible sont omis.
+    """
+    parent = list(range(nb_voyages + nb_services))
+
+    def racine(a):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    for j in range(nb_services):
+        noeud_service = nb_voyages + j
+        for i in range(nb_voyages):
+            if admissible(i, j):
+                a, b = racine(i), racine(noeud_service)
+                if a != b:
+                    parent[a] = b
+
+    groupes = {}
+    for i in range(nb_voyages):
+        groupes.setdefault(racine(i), ([], []))[0].append(i)
+    for j in range(nb_services):
+        groupe = groupes.get(racine(nb_voyages + j))
+        if groupe is not None:
+            groupe[1].append(j)
+
+    return sorted(groupes.values(), key=lambda groupe: groupe[0][0])
+
+
+def resoudre_composantes(composantes: List[Composante],
+                         resoudre: Callable[[Composante, TextIO], R],
+                         max_workers: Optional[int] = None) -> List[R]:
+    """
+    Résout chaque composante en parallèle (threads : CP-SAT libère le GIL
+    pendant la résolution) et retourne les résultats dans l'ordre des
+    composantes.
+
+    resoudre(composante, sortie) écrit son journal dans sortie
+    (print(..., file=sortie)) : un tampon propre à la composante, affiché à
+    la fin dans l'ordre des composantes au lieu de s'entremêler. sys.stdout
+    n'est jamais remplacé (appels concurrents, boucle Tk). Une seule
+    composante écrit directement dans sys.stdout. Le journal CP-SAT
+    (log_search_progress) est écrit par le C++ : à désactiver pour les
+    résolutions parallèles.
+    """
+    if len(composantes) <= 1:
+        return [resoudre(composante, sys.stdout) for composante in composantes]
+
+    tampons = [io.StringIO() for _ in composantes]
+    with ThreadPoolExecutor(max_workers=max_workers or len(composantes)) as executeur:
+        resultats = list(executeur.map(resoudre, composantes, tampons))
+
+    for numero, tampon in enumerate(tampons, 1):
+        journal = tampon.getvalue()
+        if journal:
+            print(f"--- Groupe {numero}/{len(composantes)} ---")
+            print(journal, end="")
+    return resultats
@@ -0,0 +1,101 @@
+"""
+Dédoublonnage des solutions
+===========================
+
+Forme canonique d'un planning : tuple trié de (étiquette, voyages triés),
+un élément par service non vide. L'étiquette distingue les services non
+interchangeables (paramètres différents, matin / après-midi...) ; entre
+services de même étiquette, seul le contenu compte. Deux plannings qui ne
+diffèrent que par la numérotation des services ont donc la même signature.
+
+FiltreSolutions garde un ensemble des signatures déjà vues (test en O(1))
+et peut en plus rejeter les solutions trop proches d'une solution retenue :
+distance = nombre minimal de voyages à déplacer pour passer de l'une à
+l'autre.
+
+Utilisation:
+    from dedoublonnage import signature_planning, FiltreSolutions
+
+    filtre = FiltreSolutions(mouvements_min=3)
+    signature = signature_planning((s.type_service, [id(v) for v in s.voyages]) for s in services)
+    if filtre.ajouter(signature):
+        solutions.append(...)
+"""
+
+from typing import Hashable, Iterable, List, Tuple
+
+from ortools.graph.python import linear_sum_assignment
+
+Signature = Tuple[Tuple[Hashable, Tuple[Hashable, ...]], ...]
+
+
+def signature_planning(services: Iterable[Tuple[Hashable, Iterable[Hashable]]]) -> Signature:
+    """
+    Signature canonique d'un planning.
+
+    Args:
+        services: Couples (étiquette du service, identifiants des voyages)
+    """
+    return tuple(sorted(
+        (etiquette, tuple(sorted(voyages)))
+        for etiquette, voyages in services
+        if voyages
+    ))
+
+
+def distance_plannings(a: Signature, b: Signature) -> int:
+    """
+    Nombre minimal de voyages à déplacer (entre services, ou vers / depuis
+    les voyages non affectés) pour transformer le planning a en b.
+
+    = voyages affectés dans a ou b - recouvrement maximal, les services de
+    a étant associés un à un aux services de même étiquette de b
+    (affectation linéaire).
+    """
+    voyages = {v for _, service in a for v in service} | {v for _, service in b for v in service}
+    if not a or not b:
+        return len(voyages)
+
+    ensembles_b = [set(service) for _, service in b]
+    taille = max(len(a), len(b))
+    affectation = linear_sum_assignment.SimpleLinearSumAssignment()
+    for i in range(taille):
+        for j in range(taille):
+            recouvrement = 0
+            if i < len(a) and j < len(b) and a[i][0] == b[j][0]:
+                recouvrement = sum(1 for v in a[i][1] if v in ensembles_b[j])
+            affectation.add_arc_with_cost(i, j, -recouvrement)
+    affectation.solve()
+
+    return len(voyages) + affectation.optimal_cost()
+
+
+class FiltreSolutions:
+    """Retient les solutions nouvelles (et assez différentes) d'un flux de solutions."""
+
+    def __init__(self, mouvements_min: int = 1):
+        """
+        Args:
+            mouvements_min: Distance minimale (en voyages déplacés) avec toute
+                            solution déjà retenue ; 1 = simple dédoublonnage
+        """
+        self.mouvements_min = mouvements_min
+        self.vues = set()
+        self.retenues: List[Signature] = []
+        self.nb_rejetees = 0
+
+    def ajouter(self, signature: Signature) -> bool:
+        """True si la solution est retenue, False si doublon ou trop proche."""
+        if signature in self.vues:
+            self.nb_rejetees += 1
+            return False
+        self.vues.add(signature)
+
+        if self.mouvements_min > 1:
+            for retenue in self.retenues:
+                if distance_plannings(signature, retenue) < self.mouvements_min:
+                    self.nb_rejetees += 1
+                    return False
+
+        self.retenues.append(signature)
+        return True
@@ -1,6 +1,13 @@
 from ortools.sat.python import cp_model
+from ortools.linear_solver import pywraplp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
 import time
 from typing import List, Dict, Any, Tuple
+from graphe_compatibilite import GrapheCompatibilite
+from table_voyages import TripTable
+from dedoublonnage import signature_planning, FiltreSolutions
+from profils_solveur import configurer_solveur
 
 
 def time_to_minutes(time_str):
@@ -14,11 +21,47 @@ def minutes_to_time(minutes: int) -> str:
     return f"{h:02d}h{m:02d}"
 
 
+# Contexte d'un processus de _generate_multiple_solutions : les pools de
+# chaînes, les réglages du solveur et son graphe sont transmis (picklés) une
+# seule fois par processus, à son démarrage, et non à chaque tentative.
+_CONTEXTE_TENTATIVES = {}
+
+
+def _initialiser_tentatives(trips, reglages, cache_graphe, morning_chains, afternoon_chains, nb_matin, nb_aprem):
+    """
+    Initialise un processus de tentatives randomisées (réglages : voir
+    AdvancedODMSolver.reglages ; cache_graphe : graphe du processus parent
+    et réglages qui l'ont produit, reconstruit s'ils ne correspondent plus)
+    """
+    solver = AdvancedODMSolver(trips)
+    for nom, valeur in reglages.items():
+        setattr(solver, nom, valeur)
+    solver._cache_graphe = cache_graphe
+    solver.SEARCH_WORKERS = 1  # Le parallélisme vient des processus
+    _CONTEXTE_TENTATIVES.update(
+        solver=solver,
+        morning_chains=morning_chains,
+        afternoon_chains=afternoon_chains,
+        nb_matin=nb_matin,
+        nb_aprem=nb_aprem,
+    )
+
+
+def _executer_tentative(seed):
+    """Tentative randomisée dans un processus initialisé par _initialiser_tentatives"""
+    contexte = _CONTEXTE_TENTATIVES
+    return contexte['solver']._solve_with_constraints_randomized(
+        contexte['morning_chains'], contexte['afternoon_chains'],
+        contexte['nb_matin'], contexte['nb_aprem'], seed
+    )
+
+
 class AdvancedODMSolver:
     """Solveur ODM avancé avec contraintes de chaînage strictes et gestion HLP"""
 
     def __init__(self, trips_data):
         self.trips = trips_data
+        self.table = TripTable.depuis_trajets(trips_data)
         self.MIN_SERVICE_DURATION = 5.5 * 60  # 3h minimum (plus flexible)
         self.MAX_SERVICE_DURATION = 9 * 60  # 9h maximum
         self.TARGET_SERVICE_DURATION = 7.5 * 60  # 7h30 cible
@@ -31,6 +74,42 @@ class AdvancedODMSolver:
             {"from": "CTSN1", "to": "GYSOD", "duration": 8}  # HLP CTSN1 → GYSOD (8min)
         ]
         self.max_hlp_per_service = 1
+        self.MIN_TRIP_MOVES = 1  # Voyages à déplacer au minimum entre deux solutions proposées
+        self.MAX_PROCESSES = None  # Processus pour les solutions multiples (None = nombre de cœurs)
+        self.SEARCH_WORKERS = 0  # Workers CP-SAT par résolution (0 = nombre de cœurs)
+        self.SOLVER_PROFILE = "auto"  # Profil de paramètres CP-SAT (voir profils_solveur)
+        self._cache_graphe = None  # (réglages du graphe, graphe)
+
+    def _reglages_graphe(self):
+        """Réglages dont dépend le graphe : pauses et HLP"""
+        return (self.MIN_PAUSE, self.MAX_PAUSE,
+                tuple((hlp["from"], hlp["to"], hlp["duration"]) for hlp in self.hlp_connections))
+
+    @property
+    def graphe(self):
+        """
+        Graphe de compatibilité des voyages, construit au premier usage et
+        reconstruit si MIN_PAUSE, MAX_PAUSE ou les HLP ont changé depuis
+        """
+        reglages = self._reglages_graphe()
+        if self._cache_graphe is None or self._cache_graphe[0] != reglages:
+            self._cache_graphe = (reglages, GrapheCompatibilite.depuis_table(
+                self.table,
+                battement_min=self.MIN_PAUSE,
+                battement_max=self.MAX_PAUSE,
+                longueur_prefixe=4,
+                connexions_hlp=self.hlp_connections
+            ))
+        return self._cache_graphe[1]
+
+    def reglages(self) -> Dict[str, Any]:
+        """
+        Paramètres de l'instance (constantes en majuscules, HLP) : les
+        processus de tentatives les réappliquent à leur propre solveur.
+        """
+        reglages = {nom: valeur for nom, valeur in vars(self).items() if nom.isupper()}
+        reglages.update(hlp_connections=self.hlp_connections, max_hlp_per_service=self.max_hlp_per_service)
+        return reglages
 
     def can_chain(self, trip1, trip2):
         """Vérifie si trip2 peut suivre trip1 avec la règle des 4 lettres"""
@@ -49,15 +128,20 @@ class AdvancedODMSolver:
 
         return {"direct": False, "hlp": None}
 
-    def solve_morning_afternoon(self, nb_services_matin, nb_services_aprem):
-        """Résout avec génération de plusieurs solutions alternatives"""
+    def solve_morning_afternoon(self, nb_services_matin, nb_services_aprem, mode="enumeration"):
+        """
+        Résout avec génération de plusieurs solutions alternatives
+
+        mode: "enumeration" (toutes les chaînes valides) ou "column_generation"
+              (chaînes générées à la demande, pour les gros réseaux)
+        """
         print(f"CRÉATION DE SERVICES MATIN/APRÈS-MIDI (SOLUTIONS MULTIPLES)")
         print("=" * 60)
         print(f"Services matin demandés: {nb_services_matin}")
         print(f"Services après-midi demandés: {nb_services_aprem}")
 
-        # Générer toutes les chaînes valides
-        all_chains = self._generate_valid_chains_strict()
+        # Générer les chaînes candidates
+        all_chains = self._generate_chains(nb_services_matin, nb_services_aprem, mode)
 
         if not all_chains:
             print("❌ Aucune chaîne valide trouvée!")
@@ -95,6 +179,7 @@ class AdvancedODMSolver:
         """Génère plusieurs solutions différentes"""
         solutions = []
         max_solutions = 5  # Limiter à 5 solutions pour ne pas surcharger
+        filtre = FiltreSolutions(self.MIN_TRIP_MOVES)
 
         print(f"\n🔄 Recherche de solutions multiples (max {max_solutions})...")
         print(f"Configuration demandée: {nb_matin} matin + {nb_aprem} après-midi")
@@ -103,6 +188,7 @@ class AdvancedODMSolver:
         if nb_matin == 3 and nb_aprem == 1:
             optimal = self._get_optimal_solution()
             if self._validate_optimal_solution(optimal):
+                filtre.ajouter(self._get_solution_signature(optimal))
                 solutions.append({
                     'id': 'OPTIMAL',
                     'name': 'Solution optimale (100% couverture)',
@@ -114,25 +200,56 @@ class AdvancedODMSolver:
                 print("✅ Solution optimale ajoutée")
 
         # Générer des solutions alternatives avec OR-Tools
-        for attempt in range(max_solutions * 3):  # Plus de tentatives pour diversité
-            if len(solutions) >= max_solutions:
-                break
-
-            solution = self._solve_with_constraints_randomized(
-                morning_chains, afternoon_chains, nb_matin, nb_aprem, attempt
-            )
-
-            if solution and not self._is_duplicate_solution(solution, solutions):
+        seeds = range(max_solutions * 3)  # Plus de tentatives pour diversité
+        for solution in self._iter_randomized_solutions(morning_chains, afternoon_chains,
+                                                        nb_matin, nb_aprem, seeds):
+            if solution and filtre.ajouter(self._get_solution_signature(solution)):
                 solution['id'] = f'ALT{len(solutions)}'
                 solution['name'] = f'Alternative {len(solutions)}'
                 solution['score'] = self._calculate_solution_score(solution)
                 solutions.append(solution)
 
+            if len(solutions) >= max_solutions:
+                break
+
         # Trier par score décroissant
         solutions.sort(key=lambda s: s['score'], reverse=True)
 
         return solutions
 
+    def _iter_randomized_solutions(self, morning_chains, afternoon_chains, nb_matin, nb_aprem, seeds):
+        """
+        Résultats des tentatives randomisées (une par seed), dans l'ordre où
+        elles se terminent. Sur plusieurs cœurs les tentatives tournent dans
+        un pool de processus ; arrêter l'itération annule celles qui n'ont
+        pas commencé.
+        """
+        seeds = list(seeds)
+        nb_processus = min(len(seeds), self.MAX_PROCESSES or os.cpu_count() or 1)
+
+        if nb_processus <= 1:
+            for seed in seeds:
+                yield self._solve_with_constraints_randomized(
+                    morning_chains, afternoon_chains, nb_matin, nb_aprem, seed
+                )
+            return
+
+        print(f"   {len(seeds)} tentatives sur {nb_processus} processus")
+        executor = ProcessPoolExecutor(
+            max_workers=nb_processus,
+            initializer=_initialiser_tentatives,
+            # self.graphe : graphe à jour des réglages, construit une fois ici
+            initargs=(self.trips, self.reglages(), (self._reglages_graphe(), self.graphe),
+                      morning_chains, afternoon_chains, nb_matin, nb_aprem)
+        )
+        try:
+            futures = [executor.submit(_executer_tentative, seed) for seed in seeds]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Ne pas attendre les tentatives restantes
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def _get_optimal_solution(self):
         """Retourne la solution optimale prédéfinie"""
         return {
@@ -204,7 +321,7 @@ class AdvancedODMSolver:
 
         # Résoudre
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 5.0
+        configurer_solveur(solver, model, self.SOLVER_PROFILE, 5.0, nb_workers=self.SEARCH_WORKERS)
         solver.parameters.random_seed = seed  # Seed différent pour diversité
 
         status = solver.Solve(model)
@@ -239,24 +356,13 @@ class AdvancedODMSolver:
 
         return total_trips * 10 + coverage_bonus + duration_bonus
 
-    def _is_duplicate_solution(self, new_solution, existing_solutions):
-        """Vérifie si une solution est un doublon"""
-        for existing in existing_solutions:
-            if (set(self._get_solution_signature(new_solution)) ==
-                    set(self._get_solution_signature(existing))):
-                return True
-        return False
-
     def _get_solution_signature(self, solution):
-        """Crée une signature unique pour une solution"""
-        signature = []
-        for service_trips in solution['matin'].values():
-            trip_ids = tuple(sorted(trip_idx for trip_idx, _ in service_trips))
-            signature.append(('M', trip_ids))
-        for service_trips in solution['apres_midi'].values():
-            trip_ids = tuple(sorted(trip_idx for trip_idx, _ in service_trips))
-            signature.append(('A', trip_ids))
-        return tuple(sorted(signature))
+        """Crée une signature unique pour une solution (indépendante de la numérotation des services)"""
+        services = [('M', [trip_idx for trip_idx, _ in service_trips])
+                    for service_trips in solution['matin'].values()]
+        services += [('A', [trip_idx for trip_idx, _ in service_trips])
+                     for service_trips in solution['apres_midi'].values()]
+        return signature_planning(services)
 
     def _display_multiple_solutions(self, solutions):
         """Affiche toutes les solutions trouvées"""
@@ -379,10 +485,10 @@ class AdvancedODMSolver:
 
         return self.MIN_SERVICE_DURATION <= amplitude <= self.MAX_SERVICE_DURATION
 
-    def _solve_generic(self, nb_services_matin, nb_services_aprem):
+    def _solve_generic(self, nb_services_matin, nb_services_aprem, mode="enumeration"):
         """Algorithme générique si la solution optimale ne convient pas"""
-        # Étape 1: Générer toutes les chaînes VALIDES (avec chaînage strict)
-        all_chains = self._generate_valid_chains_strict()
+        # Étape 1: Générer les chaînes VALIDES (avec chaînage strict)
+        all_chains = self._generate_chains(nb_services_matin, nb_services_aprem, mode)
 
         if not all_chains:
             print("❌ Aucune chaîne valide trouvée!")
@@ -431,83 +537,261 @@ class AdvancedODMSolver:
             print("❌ Aucune solution trouvée (conflits de voyages)")
             return {'matin': {}, 'apres_midi': {}, 'orphelins': list(range(len(self.trips)))}
 
+    def _generate_chains(self, nb_matin, nb_aprem, mode):
+        """Chaînes candidates selon le mode de génération"""
+        if mode == "enumeration":
+            return self._generate_valid_chains_strict()
+        if mode == "column_generation":
+            return self._generate_chains_column_generation(nb_matin, nb_aprem)
+        raise ValueError(f"Mode inconnu: {mode} (attendu: 'enumeration' ou 'column_generation')")
+
     def _generate_valid_chains_strict(self):
         """Génère SEULEMENT les chaînes valides avec chaînage strict - SANS LIMITE"""
-        chains = []
-
         print("🔄 Génération de chaînes de toutes tailles...")
 
-        # Approche récursive pour générer des chaînes de toutes tailles possibles
-        for start_trip in range(len(self.trips)):
-            # Démarrer une recherche récursive depuis chaque voyage
-            self._build_chains_recursive([start_trip], chains)
-
-        # Éliminer les doublons (même ensemble de voyages)
+        # Chaque chemin du graphe est un ensemble de voyages distinct : pas de doublons.
+        # Chaînes consommées au fil de l'énumération (pas de liste de suffixes en mémoire)
         unique_chains = []
-        seen_signatures = set()
-
-        for chain in chains:
-            signature = tuple(sorted(chain['trip_indices']))
-            if signature not in seen_signatures:
-                seen_signatures.add(signature)
-                unique_chains.append(chain)
+        longueur_max = 0
+        for chain in self.iter_valid_chains():
+            unique_chains.append(chain)
+            longueur_max = max(longueur_max, len(chain['trip_indices']))
 
         # Trier par heure de début PUIS par nombre de voyages (plus long = priorité)
         unique_chains.sort(key=lambda c: (c['start_time'], -len(c['trip_indices'])))
 
-        print(
-            f"✅ Généré {len(unique_chains)} chaînes uniques (tailles 2 à {max(len(c['trip_indices']) for c in unique_chains) if unique_chains else 0} voyages)")
+        print(f"✅ Généré {len(unique_chains)} chaînes uniques (tailles 2 à {longueur_max} voyages)")
 
         return unique_chains
 
-    def _build_chains_recursive(self, current_chain, chains, max_depth=10):
-        """Construit récursivement des chaînes de voyages"""
+    def iter_valid_chains(self, max_depth=10):
+        """
+        Génère une à une les chaînes valides : chemins du graphe de
+        2 à max_depth voyages, amplitude dans [MIN, MAX]_SERVICE_DURATION et
+        au plus max_hlp_per_service HLP. Parcours en profondeur itératif
+        depuis chaque voyage : seul le chemin courant est en mémoire, plus la
+        fin la plus tardive atteignable par (voyage, profondeur restante, HLP
+        restants), qui élague les branches trop courtes.
+        """
+        fins_max = {}
+        successeurs = self.graphe.successeurs
 
-        # Si la chaîne actuelle a au moins 2 voyages, l'évaluer
-        if len(current_chain) >= 2:
-            chain_data = self._try_build_chain_strict(current_chain)
-            if chain_data:
-                chains.append(chain_data)
+        for start_trip in range(len(self.trips)):
+            start_time = self.trips[start_trip]["start"]
+            if self._latest_end(start_trip, max_depth, self.max_hlp_per_service, fins_max) \
+                    - start_time < self.MIN_SERVICE_DURATION:
+                continue
 
-        # Si on a atteint la profondeur max, arrêter
-        if len(current_chain) >= max_depth:
-            return
+            chemin = [start_trip]
+            pile = [(start_trip, max_depth, self.max_hlp_per_service, iter(successeurs[start_trip]))]
+            while pile:
+                trip_idx, depth, hlp_left, suivants = pile[-1]
+                next_idx = next(suivants, None) if depth > 1 else None
 
-        # Essayer d'ajouter chaque voyage possible
-        last_trip_idx = current_chain[-1]
+                # Successeurs triés par heure de début : les suivants dépassent aussi
+                if next_idx is None or self.trips[next_idx]["start"] - start_time > self.MAX_SERVICE_DURATION:
+                    pile.pop()
+                    chemin.pop()
+                    continue
 
-        for next_trip_idx in range(len(self.trips)):
-            # Éviter les doublons et vérifier la compatibilité de base
-            if (next_trip_idx not in current_chain and
-                    self._can_chain_trips(last_trip_idx, next_trip_idx)):
-                # Ajouter ce voyage et continuer récursivement
-                new_chain = current_chain + [next_trip_idx]
-                self._build_chains_recursive(new_chain, chains, max_depth)
+                uses_hlp = (trip_idx, next_idx) in self.graphe.hlp
+                if uses_hlp and hlp_left == 0:
+                    continue
 
-    def _can_chain_trips(self, trip1_idx, trip2_idx):
-        """Vérification rapide du chaînage entre deux indices (avec ou sans HLP)"""
-        trip1 = self.trips[trip1_idx]
-        trip2 = self.trips[trip2_idx]
+                # Les fins croissent le long d'un chemin : trop long ici, trop long après ;
+                # trop court même au plus loin, inutile de descendre
+                end_time = self.trips[next_idx]["end"]
+                if end_time - start_time > self.MAX_SERVICE_DURATION:
+                    continue
+                if self._latest_end(next_idx, depth - 1, hlp_left - uses_hlp, fins_max) \
+                        - start_time < self.MIN_SERVICE_DURATION:
+                    continue
 
-        # Vérifier chevauchement
-        if trip1["end"] > trip2["start"]:
-            return False
+                chemin.append(next_idx)
+                pile.append((next_idx, depth - 1, hlp_left - uses_hlp, iter(successeurs[next_idx])))
+
+                if end_time - start_time >= self.MIN_SERVICE_DURATION:
+                    yield {
+                        'trip_indices': list(chemin),
+                        'start_time': start_time,
+                        'end_time': end_time,
+                        'amplitude': end_time - start_time
+                    }
+
+    def _latest_end(self, trip_idx, depth, hlp_left, fins_max):
+        """
+        Fin la plus tardive d'un chemin du graphe commençant par trip_idx
+        (profondeur et budget HLP respectés, amplitude maximale ignorée) :
+        borne supérieure de la fin des chaînes qui passent par ce voyage.
+        """
+        key = (trip_idx, depth, hlp_left)
+        if key in fins_max:
+            return fins_max[key]
+
+        latest = self.trips[trip_idx]["end"]
+        if depth > 1:
+            for next_idx in self.graphe.successeurs[trip_idx]:
+                uses_hlp = (trip_idx, next_idx) in self.graphe.hlp
+                if uses_hlp and hlp_left == 0:
+                    continue
+                latest = max(latest, self._latest_end(next_idx, depth - 1, hlp_left - uses_hlp, fins_max))
+
+        fins_max[key] = latest
+        return latest
+
+    def _generate_chains_column_generation(self, nb_matin, nb_aprem, max_iterations=100,
+                                           columns_per_iteration=30, time_limit=60.0):
+        """
+        Génération de colonnes : au lieu d'énumérer toutes les chaînes, résout
+        la relaxation linéaire du problème de sélection sur un pool restreint,
+        puis ajoute les chaînes de coût réduit positif trouvées par un plus
+        court chemin à ressources sur le graphe (amplitude, pauses, HLP).
+        S'arrête quand plus aucune chaîne n'améliore la relaxation ; le pool
+        obtenu sert ensuite à la résolution entière habituelle.
+        """
+        print("🔄 Génération de colonnes (relaxation linéaire + pricing sur le graphe)...")
 
-        pause_without_hlp = trip2["start"] - trip1["end"]
+        noon = 12 * 60
+        pool = []
+        seen = set()
+        start = time.time()
 
-        # Essayer chaînage direct
-        if (self.can_chain(trip1, trip2) and
-                self.MIN_PAUSE <= pause_without_hlp <= self.MAX_PAUSE):
-            return True
+        for iteration in range(max_iterations):
+            lp_value, trip_duals, count_duals = self._solve_master_lp(pool, nb_matin, nb_aprem)
 
-        # Essayer avec HLP
-        chain_result = self.can_chain_with_hlp(trip1, trip2)
-        if chain_result["hlp"] is not None:
-            # Calculer pause avec HLP (8min de trajet HLP)
-            pause_with_hlp = pause_without_hlp + chain_result["hlp"]["duration"]
-            return self.MIN_PAUSE <= pause_with_hlp <= self.MAX_PAUSE
+            new_chains = []
+            for chain, reduced_cost in self._price_chains(trip_duals, count_duals, noon):
+                signature = tuple(chain['trip_indices'])
+                if signature not in seen:
+                    new_chains.append((reduced_cost, chain))
+
+            print(f"   Itération {iteration + 1}: relaxation = {lp_value:.2f}, "
+                  f"{len(pool)} chaînes, {len(new_chains)} nouvelles")
 
-        return False
+            if not new_chains:
+                break
+
+            new_chains.sort(key=lambda item: -item[0])
+            for _, chain in new_chains[:columns_per_iteration]:
+                seen.add(tuple(chain['trip_indices']))
+                pool.append(chain)
+
+            if time.time() - start > time_limit:
+                print(f"   ⏱️ Limite de temps atteinte ({time_limit:.0f}s)")
+                break
+
+        pool.sort(key=lambda c: (c['start_time'], -len(c['trip_indices'])))
+        print(f"✅ {len(pool)} chaînes générées en {time.time() - start:.2f}s")
+
+        return pool
+
+    def _solve_master_lp(self, pool, nb_matin, nb_aprem):
+        """
+        Relaxation linéaire du problème maître sur le pool :
+        max Σ |c|·λc  avec chaque voyage couvert au plus une fois et le nombre
+        de chaînes matin / après-midi fixé. Les écarts sur ces nombres sont
+        pénalisés (grand M) pour que le maître reste réalisable avec un pool
+        vide. Retourne (valeur, duales des voyages, duales matin/après-midi).
+        """
+        noon = 12 * 60
+        big_m = len(self.trips) + 1
+
+        lp = pywraplp.Solver.CreateSolver('GLOP')
+        lambdas = [lp.NumVar(0, 1, f'chain_{k}') for k in range(len(pool))]
+        slack_matin = lp.NumVar(0, lp.infinity(), 'slack_matin')
+        slack_aprem = lp.NumVar(0, lp.infinity(), 'slack_aprem')
+
+        trip_usage = [[] for _ in range(len(self.trips))]
+        morning, afternoon = [], []
+        for k, chain in enumerate(pool):
+            for trip_idx in chain['trip_indices']:
+                trip_usage[trip_idx].append(lambdas[k])
+            (morning if chain['start_time'] < noon else afternoon).append(lambdas[k])
+
+        trip_constraints = [lp.Add(sum(usage) <= 1) for usage in trip_usage]
+        count_matin = lp.Add(sum(morning) + slack_matin == nb_matin)
+        count_aprem = lp.Add(sum(afternoon) + slack_aprem == nb_aprem)
+
+        lp.Maximize(sum(len(chain['trip_indices']) * lambdas[k] for k, chain in enumerate(pool))
+                    - big_m * (slack_matin + slack_aprem))
+        lp.Solve()
+
+        trip_duals = [c.dual_value() for c in trip_constraints]
+        count_duals = {'matin': count_matin.dual_value(), 'apres_midi': count_aprem.dual_value()}
+        return lp.Objective().Value(), trip_duals, count_duals
+
+    def _price_chains(self, trip_duals, count_duals, noon):
+        """
+        Pricing : pour chaque voyage de départ, plus long chemin (gain 1 - dual
+        par voyage) sur le graphe, sous contraintes de ressources amplitude
+        [MIN, MAX]_SERVICE_DURATION et budget HLP. Les pauses sont garanties
+        par les arcs du graphe. Génère (chaîne, coût réduit) si positif.
+        """
+        gain = [1 - dual for dual in trip_duals]
+        graphe = self.graphe
+        position = {trip_idx: pos for pos, trip_idx in enumerate(graphe.ordre)}
+        epsilon = 1e-6
+
+        for start_trip in graphe.ordre:
+            start_time = self.trips[start_trip]["start"]
+            deadline = start_time + self.MAX_SERVICE_DURATION
+            count_dual = count_duals['matin' if start_time < noon else 'apres_midi']
+
+            # labels[voyage][hlp utilisés] = (valeur, (voyage précédent, hlp précédents))
+            labels = {start_trip: {0: (gain[start_trip], None)}}
+            best = None
+
+            for pos in range(position[start_trip], len(graphe.ordre)):
+                trip_idx = graphe.ordre[pos]
+                if self.trips[trip_idx]["start"] > deadline:
+                    break
+                if trip_idx not in labels or self.trips[trip_idx]["end"] > deadline:
+                    continue
+
+                for hlp_used, (value, _) in labels[trip_idx].items():
+                    amplitude = self.trips[trip_idx]["end"] - start_time
+                    if (trip_idx != start_trip and amplitude >= self.MIN_SERVICE_DURATION and
+                            (best is None or value > best[0])):
+                        best = (value, trip_idx, hlp_used)
+
+                    for next_idx in graphe.successeurs[trip_idx]:
+                        if self.trips[next_idx]["start"] > deadline:
+                            break
+                        if self.trips[next_idx]["end"] > deadline:
+                            continue
+
+                        next_hlp = hlp_used + ((trip_idx, next_idx) in graphe.hlp)
+                        if next_hlp > self.max_hlp_per_service:
+                            continue
+
+                        next_value = value + gain[next_idx]
+                        current = labels.setdefault(next_idx, {}).get(next_hlp)
+                        if current is None or next_value > current[0]:
+                            labels[next_idx][next_hlp] = (next_value, (trip_idx, hlp_used))
+
+            if best is None or best[0] - count_dual <= epsilon:
+                continue
+
+            # Reconstruire le chemin depuis le dernier voyage
+            value, trip_idx, hlp_used = best
+            trip_indices = []
+            node = (trip_idx, hlp_used)
+            while node is not None:
+                trip_indices.append(node[0])
+                node = labels[node[0]][node[1]][1]
+            trip_indices.reverse()
+
+            end_time = self.trips[trip_indices[-1]]["end"]
+            yield {
+                'trip_indices': trip_indices,
+                'start_time': start_time,
+                'end_time': end_time,
+                'amplitude': end_time - start_time
+            }, value - count_dual
+
+    def _can_chain_trips(self, trip1_idx, trip2_idx):
+        """Vérification rapide du chaînage entre deux indices (avec ou sans HLP)"""
+        return self.graphe.compatible(trip1_idx, trip2_idx)
 
     def _try_build_chain_strict(self, trip_indices):
         """Construit une chaîne avec vérifications strictes"""
@@ -653,7 +937,7 @@ class AdvancedODMSolver:
 
         # Résoudre
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 10.0
+        configurer_solveur(solver, model, self.SOLVER_PROFILE, 10.0, nb_workers=self.SEARCH_WORKERS)
 
         status = solver.Solve(model)
 
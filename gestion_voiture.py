@@ -13,6 +13,22 @@ import csv
 from timeline import TimelineVisuelle
 
 
+def enchainement_possible(v1, v2, battement_min, battement_max=50, verifier_arrets=True):
+    """
+    True si v2 peut suivre directement v1 dans un service : battement entre
+    battement_min et battement_max, et v1 finit à l'arrêt où v2 commence
+    (codes sur 3 caractères). Règle de voyages_compatibles sans voyage pont :
+    entre deux voisins d'un service trié, aucun voyage du service ne peut
+    servir de pont.
+    """
+    battement = v2.hdebut - v1.hfin
+    if battement < max(battement_min, 0):
+        return False
+    if battement_max is not None and battement > battement_max:
+        return False
+    return not verifier_arrets or v1.arret_fin_id() == v2.arret_debut_id()
+
+
 
 class ServiceCard(ctk.CTkFrame):
     """Widget représentant un service"""
@@ -482,11 +498,22 @@ class Tab5CreationManuelle(ctk.CTkFrame):
                 msgbox.showwarning("Attention", "Aucun voyage sélectionné")
             return
 
-        # Ajouter les voyages au service
-        for v in voyages_a_ajouter:
-            self.service_selectionne.ajout_voyages(v)
+        # Ajouter les voyages au service (ajouter_voyage refuse les voyages hors limites)
+        ajoutes, items_ajoutes, refuses = [], [], []
+        for v, item in zip(voyages_a_ajouter, items_a_desactiver):
+            try:
+                self.service_selectionne.ajouter_voyage(v)
+            except ValueError as e:
+                refuses.append(f"V{v.num_voyage} : {e}")
+                continue
+            ajoutes.append(v)
+            items_ajoutes.append(item)
             # ✅ Marquer comme assigné
             self.voyages_assignes[id(v)] = self.service_selectionne
+        voyages_a_ajouter, items_a_desactiver = ajoutes, items_ajoutes
+
+        if refuses:
+            msgbox.showwarning("Voyages refusés", "Hors des limites du service :\n" + "\n".join(refuses))
 
         # ✅ NOUVEAU : Désactiver les lignes dans le tableau
         for item in items_a_desactiver:
@@ -543,7 +570,7 @@ class Tab5CreationManuelle(ctk.CTkFrame):
             f"Retirer le voyage {voyage_obj.num_voyage} du service {self.service_selectionne.num_service} ?"
         ):
             # Retirer le voyage du service
-            self.service_selectionne.voyages.remove(voyage_obj)
+            self.service_selectionne.retirer_voyage(voyage_obj)
 
             # Libérer le voyage
             voyage_id = id(voyage_obj)
@@ -841,14 +868,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
         print("🤖 COMPLÉTION AUTOMATIQUE")
         print("="*70)
 
-        try:
-            from entrainementsolveria import voyages_compatibles
-        except ImportError:
-            msgbox.showerror("Erreur", "Module entrainementsolveria non trouvé")
-            return
-
         nb_voyages_ajoutes = 0
-        voyages_restants = list(voyages_non_assignes)
+        voyages_restants = sorted(voyages_non_assignes, key=lambda x: x.hdebut)
 
         # Pour chaque service
         for service in self.services:
@@ -860,39 +881,38 @@ class Tab5CreationManuelle(ctk.CTkFrame):
             if h_debut and h_fin:
                 print(f"   ⏰ Contraintes : {voyage.minutes_to_time(h_debut)} - {voyage.minutes_to_time(h_fin)}")
 
-            voyages_service = list(service.voyages)
+            non_ajoutes = []
 
-            for v in sorted(voyages_restants, key=lambda x: x.hdebut):
+            for v in voyages_restants:
                 # Vérifier contraintes horaires
                 if h_debut and h_fin:
                     if v.hdebut < h_debut or v.hfin > h_fin:
+                        non_ajoutes.append(v)
                         continue
 
-                # Vérifier compatibilité
+                # Les voyages du service sont triés : seuls le précédent et le suivant comptent
+                precedent, suivant = service.voisins(v)
                 compatible = True
 
-                for v_exist in voyages_service:
-                    if not (v.hfin <= v_exist.hdebut or v.hdebut >= v_exist.hfin):
+                if precedent is not None:
+                    if not enchainement_possible(precedent, v, battement_min, 50, verifier_arrets):
                         compatible = False
-                        break
-
-                    if v.hfin <= v_exist.hdebut:
-                        if not voyages_compatibles(v, v_exist, voyages_service, battement_min, 50, verifier_arrets):
-                            compatible = False
-                            break
-                    elif v_exist.hfin <= v.hdebut:
-                        if not voyages_compatibles(v_exist, v, voyages_service, battement_min, 50, verifier_arrets):
-                            compatible = False
-                            break
+                if compatible and suivant is not None:
+                    if not enchainement_possible(v, suivant, battement_min, 50, verifier_arrets):
+                        compatible = False
+                if compatible and not service.voyage_dans_limites(v)[0]:
+                    compatible = False
 
                 if compatible:
-                    service.ajout_voyages(v)
+                    service.ajouter_voyage(v)
                     self.voyages_assignes[id(v)] = service
-                    voyages_service.append(v)
-                    voyages_restants.remove(v)
                     nb_voyages_ajoutes += 1
 
                     print(f"   ✅ V{v.num_voyage} ajouté ({voyage.minutes_to_time(v.hdebut)}-{voyage.minutes_to_time(v.hfin)})")
+                else:
+                    non_ajoutes.append(v)
+
+            voyages_restants = non_ajoutes
 
         # Rafraîchir
         self.remplir_liste_voyages()
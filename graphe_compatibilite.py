@@ -0,0 +1,550 @@
+"""
+Graphe de compatibilité des voyages
+===================================
+
+Construit une seule fois, pour un ensemble de voyages, la liste creuse des
+successeurs possibles de chaque voyage. Tous les solveurs du projet
+(OptimisateurServices, VoyageSolver, solvertest, AdvancedODMSolver) lisent ce
+graphe au lieu de recalculer la compatibilité paire par paire.
+
+Un arc i → j existe si :
+- j commence après la fin de i (pas de chevauchement)
+- le battement j.debut - i.fin est compris entre battement_min et battement_max
+- l'arrêt de fin de i correspond à l'arrêt de début de j (codes d'arrêt),
+  ou un HLP / un voyage pont permet de relier les deux
+
+Utilisation:
+    from graphe_compatibilite import GrapheCompatibilite
+
+    graphe = GrapheCompatibilite.depuis_voyages(voyages, battement_min=5, battement_max=50)
+    for j in graphe.successeurs[i]:
+        ...
+
+Sans voyages ponts, les arcs sont calculés d'un bloc par la matrice
+vectorisée TripTable.matrice_successeurs (NumPy).
+
+Les paires (successives, incompatibles) sont extraites de matrices booléennes
+NumPy construites à partir des arcs creux, sans boucle Python sur les paires.
+
+IndexPonts regroupe les voyages par (arrêt de départ, arrêt d'arrivée) pour
+tester en O(log n) l'existence d'un voyage pont entre deux voyages.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import deque
+from typing import List, Dict, Optional, Tuple, Iterator, Iterable
+
+import numpy as np
+
+from table_voyages import TripTable
+
+
+class IndexPonts:
+    """
+    Voyages ponts regroupés par (arrêt de départ, arrêt d'arrivée) et triés
+    par heure de début : l'existence d'un pont entre deux voyages devient une
+    recherche dichotomique au lieu d'un parcours de toute la liste.
+    """
+
+    def __init__(self,
+                 debuts: List[int],
+                 fins: List[int],
+                 arrets_debut: List[str],
+                 arrets_fin: List[str]):
+        self.fins = list(fins)
+        self._positions: Dict[int, int] = {}
+
+        groupes: Dict[Tuple[str, str], List[int]] = {}
+        for k in sorted(range(len(debuts)), key=lambda k: (debuts[k], fins[k])):
+            groupes.setdefault((arrets_debut[k], arrets_fin[k]), []).append(k)
+
+        # Pour chaque groupe : heures de début triées et minimum suffixe des
+        # heures de fin (le pont qui termine le plus tôt parmi ceux qui
+        # partent après un instant donné)
+        self._groupes: Dict[Tuple[str, str], Tuple[List[int], List[int], List[int]]] = {}
+        for cle, indices in groupes.items():
+            fins_min = [0] * len(indices)
+            minimum = None
+            for p in range(len(indices) - 1, -1, -1):
+                k = indices[p]
+                if minimum is None or fins[k] <= self.fins[minimum]:
+                    minimum = k
+                fins_min[p] = minimum
+            self._groupes[cle] = ([debuts[k] for k in indices], fins_min, indices)
+
+    @classmethod
+    def depuis_voyages(cls, voyages):
+        """Construit l'index depuis des objets voyage (arret_debut_id / arret_fin_id)."""
+        index = cls(
+            debuts=[v.hdebut for v in voyages],
+            fins=[v.hfin for v in voyages],
+            arrets_debut=[v.arret_debut_id() for v in voyages],
+            arrets_fin=[v.arret_fin_id() for v in voyages]
+        )
+        index._positions = {id(v): k for k, v in enumerate(voyages)}
+        return index
+
+    def trouver(self, arret_depart: str, arret_arrivee: str, apres: int, avant: int,
+                exclus: Tuple[int, ...] = ()) -> Optional[int]:
+        """
+        Retourne un voyage allant de arret_depart à arret_arrivee, commençant
+        à partir de `apres` et terminé au plus tard à `avant` (None si aucun).
+        """
+        groupe = self._groupes.get((arret_depart, arret_arrivee))
+        if groupe is None:
+            return None
+
+        debuts_tries, fins_min, indices = groupe
+        pos = bisect_left(debuts_tries, apres)
+        if pos == len(indices) or self.fins[fins_min[pos]] > avant:
+            return None
+        if fins_min[pos] not in exclus:
+            return fins_min[pos]
+
+        # Cas rare (voyage de durée nulle exclu) : parcours de la fenêtre
+        for p in range(pos, len(indices)):
+            if debuts_tries[p] > avant:
+                break
+            k = indices[p]
+            if self.fins[k] <= avant and k not in exclus:
+                return k
+        return None
+
+    def pont_entre(self, v1, v2) -> bool:
+        """True si un autre voyage de l'index relie v1 à v2 (index construit par depuis_voyages)."""
+        exclus = (self._positions.get(id(v1)), self._positions.get(id(v2)))
+        return self.trouver(v1.arret_fin_id(), v2.arret_debut_id(), v1.hfin, v2.hdebut, exclus) is not None
+
+
+class GrapheCompatibilite:
+    """Graphe orienté (DAG) des enchaînements possibles entre voyages."""
+
+    def __init__(self,
+                 debuts: List[int],
+                 fins: List[int],
+                 arrets_debut: List[str],
+                 arrets_fin: List[str],
+                 battement_min: int = 0,
+                 battement_max: Optional[int] = None,
+                 verifier_arrets: bool = True,
+                 ponts: bool = False,
+                 connexions_hlp: Optional[List[Dict]] = None,
+                 arcs: Optional[Iterable[Tuple[int, int]]] = None):
+        """
+        Args:
+            debuts: Heure de début de chaque voyage (minutes)
+            fins: Heure de fin de chaque voyage (minutes)
+            arrets_debut: Code de l'arrêt de départ de chaque voyage
+            arrets_fin: Code de l'arrêt d'arrivée de chaque voyage
+            battement_min: Battement minimum en minutes
+            battement_max: Battement maximum en minutes (None ou 0 = pas de
+                           limite, comme l'ancien test "if battement_max and ...")
+            verifier_arrets: Si False, seuls les horaires sont vérifiés
+            ponts: Si True, un autre voyage de la liste peut servir de pont
+                   entre deux arrêts différents (règle de voyages_compatibles)
+            connexions_hlp: HLP autorisés {"from", "to", "duration"}, codes
+                            déjà tronqués comme les arrêts
+            arcs: Arcs déjà calculés (matrice vectorisée), dans l'ordre des
+                  successeurs ; sinon ils sont calculés voyage par voyage
+        """
+        self.n = len(debuts)
+        self.debuts = list(debuts)
+        self.fins = list(fins)
+        self.arrets_debut = list(arrets_debut)
+        self.arrets_fin = list(arrets_fin)
+        self.battement_min = battement_min
+        self.battement_max = battement_max or None
+        self.verifier_arrets = verifier_arrets
+        self.ponts = ponts
+        self.connexions_hlp = connexions_hlp or []
+
+        # Indices triés par heure de début (base de toutes les recherches)
+        self.ordre = sorted(range(self.n), key=lambda i: (self.debuts[i], self.fins[i]))
+        self._debuts_tries = [self.debuts[i] for i in self.ordre]
+
+        self.successeurs: List[List[int]] = [[] for _ in range(self.n)]
+        self.predecesseurs: List[List[int]] = [[] for _ in range(self.n)]
+        self.hlp: Dict[Tuple[int, int], Dict] = {}
+        self._arcs = set()
+        self.index_ponts = IndexPonts(self.debuts, self.fins, self.arrets_debut, self.arrets_fin) if ponts else None
+
+        if arcs is None:
+            self._construire()
+        else:
+            self._ajouter_arcs(arcs)
+
+    # ------------------------------------------------------------------
+    # Constructeurs
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def depuis_voyages(cls, voyages, battement_min: int = 5, battement_max: Optional[int] = None,
+                       verifier_arrets: bool = True, ponts: bool = False):
+        """Construit le graphe depuis des objets voyage (codes d'arrêt sur 3 caractères)."""
+        if ponts:
+            return cls(
+                debuts=[v.hdebut for v in voyages],
+                fins=[v.hfin for v in voyages],
+                arrets_debut=[v.arret_debut_id() for v in voyages],
+                arrets_fin=[v.arret_fin_id() for v in voyages],
+                battement_min=battement_min,
+                battement_max=battement_max,
+                verifier_arrets=verifier_arrets,
+                ponts=ponts
+            )
+        return cls.depuis_table(TripTable.depuis_voyages(voyages), battement_min, battement_max,
+                                longueur_prefixe=3, verifier_arrets=verifier_arrets)
+
+    @classmethod
+    def depuis_trajets(cls, trips: List[Dict], battement_min: int = 5, battement_max: Optional[int] = None,
+                       longueur_prefixe: int = 4, connexions_hlp: Optional[List[Dict]] = None):
+        """
+        Construit le graphe depuis des trajets sous forme de dictionnaires
+        {"start", "end", "from", "to"} (format AdvancedODMSolver / ia_contrainte).
+        """
+        return cls.depuis_table(TripTable.depuis_trajets(trips), battement_min, battement_max,
+                                longueur_prefixe=longueur_prefixe, connexions_hlp=connexions_hlp)
+
+    @classmethod
+    def depuis_table(cls, table, battement_min: int = 5, battement_max: Optional[int] = None,
+                     longueur_prefixe: int = 3, verifier_arrets: bool = True, ponts: bool = False,
+                     connexions_hlp: Optional[List[Dict]] = None):
+        """
+        Construit le graphe depuis une TripTable : les arrêts sont comparés
+        par identifiants de code internés (entiers) au lieu de chaînes, et
+        les arcs viennent de la matrice vectorisée (sauf avec ponts).
+        """
+        hlp_internes = [
+            {**hlp,
+             "from": table.id_code(hlp["from"], longueur_prefixe),
+             "to": table.id_code(hlp["to"], longueur_prefixe)}
+            for hlp in (connexions_hlp or [])
+        ]
+        arcs = None
+        if not ponts:
+            matrice = table.matrice_successeurs(battement_min, battement_max, longueur_prefixe,
+                                                verifier_arrets, connexions_hlp)
+            # Colonnes dans l'ordre chronologique : successeurs triés comme _construire
+            ordre = table.ordre_chronologique()
+            lignes, positions = matrice[:, ordre].nonzero()
+            arcs = zip(lignes.tolist(), ordre[positions].tolist())
+
+        return cls(
+            debuts=table.debuts.tolist(),
+            fins=table.fins.tolist(),
+            arrets_debut=table.codes_debut(longueur_prefixe).tolist(),
+            arrets_fin=table.codes_fin(longueur_prefixe).tolist(),
+            battement_min=battement_min,
+            battement_max=battement_max,
+            verifier_arrets=verifier_arrets,
+            ponts=ponts,
+            connexions_hlp=hlp_internes,
+            arcs=arcs
+        )
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def _construire(self):
+        """Calcule les arcs en ne parcourant que la fenêtre de battement de chaque voyage."""
+        duree_hlp_max = max((h["duration"] for h in self.connexions_hlp), default=0)
+
+        for i in range(self.n):
+            fin_i = self.fins[i]
+
+            # Un HLP allonge le battement : la fenêtre commence plus tôt
+            borne_basse = max(fin_i, fin_i + self.battement_min - duree_hlp_max)
+            debut_fenetre = bisect_left(self._debuts_tries, borne_basse)
+            if self.battement_max is None:
+                fin_fenetre = self.n
+            else:
+                fin_fenetre = bisect_right(self._debuts_tries, fin_i + self.battement_max)
+
+            for pos in range(debut_fenetre, fin_fenetre):
+                j = self.ordre[pos]
+                if j == i:
+                    continue
+
+                enchainement = self._enchainement(i, j)
+                if enchainement is False:
+                    continue
+
+                self._arcs.add((i, j))
+                self.successeurs[i].append(j)
+                self.predecesseurs[j].append(i)
+                if enchainement is not True:
+                    self.hlp[i, j] = enchainement
+
+    def _ajouter_arcs(self, arcs: Iterable[Tuple[int, int]]):
+        """Enregistre des arcs déjà calculés (le HLP utilisé est retrouvé si les arrêts diffèrent)."""
+        for i, j in arcs:
+            self._arcs.add((i, j))
+            self.successeurs[i].append(j)
+            self.predecesseurs[j].append(i)
+            if self.verifier_arrets and self.arrets_fin[i] != self.arrets_debut[j]:
+                self.hlp[i, j] = self._enchainement(i, j)
+
+    def _battement_dans_limites(self, battement):
+        """Règle unique des limites de battement, pour un entier ou une matrice NumPy."""
+        valide = battement >= self.battement_min
+        if self.battement_max is not None:
+            valide = valide & (battement <= self.battement_max)
+        return valide
+
+    def _enchainement(self, i: int, j: int):
+        """
+        Retourne True (enchaînement direct), le HLP utilisé, ou False.
+        """
+        battement = self.debuts[j] - self.fins[i]
+        arrets_identiques = self.arrets_fin[i] == self.arrets_debut[j]
+
+        if not self.verifier_arrets or arrets_identiques:
+            return self._battement_dans_limites(battement)
+
+        # HLP explicite : le temps de trajet HLP s'ajoute au battement
+        for hlp in self.connexions_hlp:
+            if hlp["from"] == self.arrets_fin[i] and hlp["to"] == self.arrets_debut[j]:
+                return hlp if self._battement_dans_limites(battement + hlp["duration"]) else False
+
+        if self.ponts and self._battement_dans_limites(battement) and self._pont_existe(i, j):
+            return True
+
+        return False
+
+    def _pont_existe(self, i: int, j: int) -> bool:
+        """Un voyage k relie l'arrêt de fin de i à l'arrêt de début de j entre les deux."""
+        return self.index_ponts.trouver(
+            self.arrets_fin[i], self.arrets_debut[j], self.fins[i], self.debuts[j], (i, j)
+        ) is not None
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def compatible(self, i: int, j: int) -> bool:
+        """True si j peut suivre directement i dans un même service."""
+        return (i, j) in self._arcs
+
+    def chevauchent(self, i: int, j: int) -> bool:
+        """True si les deux voyages se recouvrent dans le temps."""
+        return self.debuts[i] < self.fins[j] and self.debuts[j] < self.fins[i]
+
+    def battement_valide(self, i: int, j: int) -> bool:
+        """True si j commence après i avec un battement dans les limites (arrêts ignorés)."""
+        return self.fins[i] <= self.debuts[j] and self._battement_dans_limites(self.debuts[j] - self.fins[i])
+
+    def nb_arcs(self) -> int:
+        return len(self._arcs)
+
+    def arcs(self) -> Iterator[Tuple[int, int]]:
+        for i in range(self.n):
+            for j in self.successeurs[i]:
+                yield i, j
+
+    def paires_chevauchantes(self, marge: int = 0) -> Iterator[Tuple[int, int]]:
+        """
+        Paires (i, j) de voyages qui se chevauchent, ou qui sont séparés de
+        moins de `marge` minutes. Balayage sur les débuts triés : seules les
+        paires en conflit sont parcourues.
+        """
+        for pos_i, i in enumerate(self.ordre):
+            limite = self.fins[i] + marge
+            fin_fenetre = bisect_left(self._debuts_tries, limite, lo=pos_i + 1)
+            for pos_j in range(pos_i + 1, fin_fenetre):
+                j = self.ordre[pos_j]
+                yield (i, j) if i < j else (j, i)
+
+    def cliques_chevauchement(self) -> Iterator[List[int]]:
+        """
+        Cliques maximales de voyages roulant simultanément (au moins deux).
+
+        Balayage des événements début/fin triés par heure ; à une même minute
+        les fins passent avant les débuts des autres voyages (un voyage qui
+        finit à 7h00 ne chevauche pas celui qui part à 7h00). Un voyage de
+        durée nulle commence et finit entre les deux : il n'est actif qu'avec
+        les voyages qui l'encadrent strictement, comme dans chevauchent().
+        Un graphe d'intervalles a au plus n cliques maximales.
+        """
+        # Rang à heure égale : 0 fin, 1 début de durée nulle, 2 sa fin, 3 début
+        evenements = []
+        for i in range(self.n):
+            if self.debuts[i] == self.fins[i]:
+                evenements.append((self.debuts[i], 1, i))
+                evenements.append((self.fins[i], 2, i))
+            else:
+                evenements.append((self.debuts[i], 3, i))
+                evenements.append((self.fins[i], 0, i))
+        evenements.sort()
+
+        actifs = {}
+        a_grandi = False
+        for _, rang, i in evenements:
+            if rang in (1, 3):
+                actifs[i] = None
+                a_grandi = True
+            else:
+                if a_grandi and len(actifs) >= 2:
+                    yield list(actifs)
+                a_grandi = False
+                actifs.pop(i, None)
+
+    def _matrice_successives(self) -> np.ndarray:
+        """Matrice booléenne M[i, j] : j commence après la fin de i (j != i)."""
+        debuts = np.asarray(self.debuts)
+        fins = np.asarray(self.fins)
+        matrice = debuts[None, :] >= fins[:, None]
+        np.fill_diagonal(matrice, False)
+        return matrice
+
+    def _matrice_arcs(self) -> np.ndarray:
+        """Matrice booléenne d'adjacence du graphe (remplie depuis les arcs creux)."""
+        matrice = np.zeros((self.n, self.n), dtype=bool)
+        if self._arcs:
+            lignes, colonnes = zip(*self._arcs)
+            matrice[list(lignes), list(colonnes)] = True
+        return matrice
+
+    def _matrice_battement_valide(self) -> np.ndarray:
+        """Matrice booléenne de battement_valide (arrêts ignorés)."""
+        battements = np.asarray(self.debuts)[None, :] - np.asarray(self.fins)[:, None]
+        return (battements >= 0) & self._battement_dans_limites(battements)
+
+    def _paires(self, matrice: np.ndarray) -> Iterator[Tuple[int, int]]:
+        """Paires non nulles de la matrice, lignes par indice et colonnes dans l'ordre chronologique."""
+        ordre = np.asarray(self.ordre, dtype=np.int64)
+        lignes, positions = matrice[:, ordre].nonzero()
+        return zip(lignes.tolist(), ordre[positions].tolist())
+
+    def paires_successives(self) -> Iterator[Tuple[int, int]]:
+        """Paires ordonnées (i, j) où j commence après la fin de i."""
+        if self.n == 0:
+            return iter(())
+        return self._paires(self._matrice_successives())
+
+    def paires_battement_invalide(self) -> Iterator[Tuple[int, int]]:
+        """Paires successives (i, j) dont le battement sort des limites."""
+        if self.n == 0:
+            return iter(())
+        return self._paires(self._matrice_successives() & ~self._matrice_battement_valide())
+
+    def paires_arrets_incompatibles(self) -> Iterator[Tuple[int, int]]:
+        """Paires successives (i, j) au battement valide mais sans arc (arrêts incompatibles)."""
+        if self.n == 0:
+            return iter(())
+        return self._paires(self._matrice_successives() & self._matrice_battement_valide()
+                            & ~self._matrice_arcs())
+
+    def matrice_incompatibles(self) -> np.ndarray:
+        """
+        Matrice booléenne symétrique M[i, j] : aucun arc entre i et j dans un
+        sens ou dans l'autre (diagonale à False). Une sous-matrice
+        M[np.ix_(indices, indices)] donne les incompatibilités d'un sous-ensemble.
+        """
+        arcs = self._matrice_arcs()
+        matrice = ~(arcs | arcs.T)
+        np.fill_diagonal(matrice, False)
+        return matrice
+
+    def paires_incompatibles(self) -> Iterator[Tuple[int, int]]:
+        """Paires (i, j), i < j, reliées par aucun arc dans un sens ou dans l'autre."""
+        if self.n == 0:
+            return iter(())
+        lignes, colonnes = np.triu(self.matrice_incompatibles(), 1).nonzero()
+        return zip(lignes.tolist(), colonnes.tolist())
+
+    # ------------------------------------------------------------------
+    # Couverture minimale par chemins
+    # ------------------------------------------------------------------
+
+    def couverture_minimale(self) -> List[List[int]]:
+        """
+        Nombre minimum de chaînes de voyages couvrant tous les voyages.
+
+        Couverture minimale par chemins disjoints du DAG = n - couplage maximum
+        du graphe biparti (voyage → successeur), calculé par Hopcroft-Karp en
+        O(arcs · √n). Sans limite d'amplitude ni de coupure, c'est le nombre
+        minimum de services : une borne inférieure pour tous les solveurs.
+
+        Returns:
+            Liste de chaînes (indices de voyages dans l'ordre chronologique)
+        """
+        succ_couple = [-1] * self.n  # succ_couple[i] = j : j suit i
+        pred_couple = [-1] * self.n  # pred_couple[j] = i
+
+        while True:
+            # BFS : couches de voyages depuis les voyages sans successeur couplé
+            distance = [-1] * self.n
+            file = deque()
+            for i in range(self.n):
+                if succ_couple[i] == -1:
+                    distance[i] = 0
+                    file.append(i)
+
+            # Arrêt à la première couche qui atteint un successeur libre :
+            # chaque phase n'augmente que par des plus courts chemins
+            longueur = None
+            while file:
+                i = file.popleft()
+                if longueur is not None and distance[i] > longueur:
+                    break
+                for j in self.successeurs[i]:
+                    k = pred_couple[j]
+                    if k == -1:
+                        longueur = distance[i]
+                    elif distance[k] == -1 and longueur is None:
+                        distance[k] = distance[i] + 1
+                        file.append(k)
+
+            if longueur is None:
+                break
+
+            # DFS itératif le long des couches (pas de récursion sur des milliers de voyages)
+            position = [0] * self.n
+            for racine in range(self.n):
+                if succ_couple[racine] != -1:
+                    continue
+
+                pile = [racine]
+                choix = []
+                while pile:
+                    i = pile[-1]
+                    successeurs = self.successeurs[i]
+
+                    if position[i] >= len(successeurs):
+                        distance[i] = -1  # impasse pour cette phase
+                        pile.pop()
+                        if choix:
+                            choix.pop()
+                        continue
+
+                    j = successeurs[position[i]]
+                    position[i] += 1
+                    k = pred_couple[j]
+
+                    if k == -1 and distance[i] == longueur:
+                        # Chemin augmentant trouvé : inverser les couplages
+                        choix.append(j)
+                        for gauche, droite in zip(pile, choix):
+                            succ_couple[gauche] = droite
+                            pred_couple[droite] = gauche
+                        break
+
+                    if k != -1 and distance[i] < longueur and distance[k] == distance[i] + 1:
+                        pile.append(k)
+                        choix.append(j)
+
+        chaines = []
+        for i in self.ordre:
+            if pred_couple[i] != -1:
+                continue
+            chaine = [i]
+            while succ_couple[chaine[-1]] != -1:
+                chaine.append(succ_couple[chaine[-1]])
+            chaines.append(chaine)
+
+        return chaines
+
+    def borne_inferieure_services(self) -> int:
+        """Nombre minimum de services nécessaires pour couvrir tous les voyages."""
+        return len(self.couverture_minimale())
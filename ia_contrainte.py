@@ -2,6 +2,8 @@ from ortools.sat.python import cp_model
 import sqlite3
 import re
 from typing import List, Dict, Any
+from graphe_compatibilite import GrapheCompatibilite
+from profils_solveur import configurer_solveur
 
 # ===== CONSTANTES =====
 # Rend le code plus lisible et maintenable
@@ -30,15 +32,14 @@ def minutes_to_time(minutes: int) -> str:
 class BusSchedulePrinter(cp_model.CpSolverSolutionCallback):
     """
     Classe pour afficher les solutions trouvées de manière claire.
-    Amélioration : ajout de type hints et documentation.
+    Les services sont reconstruits en suivant les arcs actifs depuis le dépôt.
     """
 
-    def __init__(self, assignments: List, trips: List[Dict[str, Any]],
-                 order: List = None, max_solutions: int = 5):
+    def __init__(self, arcs: Dict[tuple, Any], trips: List[Dict[str, Any]],
+                 max_solutions: int = 5):
         super().__init__()  # Plus pythonique que l'ancienne syntaxe
-        self.assignments = assignments
+        self.arcs = arcs
         self.trips = trips
-        self.order = order
         self.solution_count = 0
         self.max_solutions = max_solutions
 
@@ -59,16 +60,22 @@ class BusSchedulePrinter(cp_model.CpSolverSolutionCallback):
 
     def _group_trips_by_service(self) -> Dict[int, List[tuple]]:
         """
-        Regroupe les trajets par service.
-        Amélioration : extraction en méthode séparée pour plus de clarté.
+        Regroupe les trajets par service en suivant les successeurs.
+        Le nœud 0 est le dépôt, le trajet i est le nœud i + 1.
         """
+        successor = {}
+        for (tail, head), literal in self.arcs.items():
+            if tail != head and self.Value(literal):
+                successor.setdefault(tail, []).append(head)
+
         service_trips = {}
-        for i in range(len(self.trips)):
-            service = self.Value(self.assignments[i])
-            if service not in service_trips:
-                service_trips[service] = []
-            order_val = self.Value(self.order[i]) if self.order else i
-            service_trips[service].append((order_val, i))
+        for service, first in enumerate(sorted(successor.get(0, []), key=lambda n: self.trips[n - 1]["start"])):
+            service_trips[service] = []
+            node, order_val = first, 0
+            while node != 0:
+                service_trips[service].append((order_val, node - 1))
+                node = successor[node][0]
+                order_val += 1
         return service_trips
 
     def _display_solution(self, service_trips: Dict[int, List[tuple]]):
@@ -95,322 +102,102 @@ class BusSchedulePrinter(cp_model.CpSolverSolutionCallback):
                       f"({start}–{end}, {duration}min){internal_marker}")
 
 
-def create_model_variables(model: cp_model.CpModel, num_trips: int,
-                           num_services_max: int) -> tuple:
-    """
-    Crée les variables du modèle.
-    Amélioration : extraction de la logique de création des variables.
-    """
-    assignments = [
-        model.NewIntVar(0, num_services_max - 1, f"service_{i}")
-        for i in range(num_trips)
-    ]
-    order = [
-        model.NewIntVar(0, num_trips - 1, f"order_{i}")
-        for i in range(num_trips)
-    ]
-    model.AddAllDifferent(order)
-
-    return assignments, order
-
-
-def add_first_trip_constraints(model: cp_model.CpModel, assignments: List,
-                               order: List, num_trips: int) -> List:
-    """
-    Ajoute les contraintes pour identifier les premiers trajets.
-    Amélioration : extraction en fonction séparée + commentaires explicatifs.
-    """
-    is_first = [model.NewBoolVar(f"is_first_{j}") for j in range(num_trips)]
-
-    for j in range(num_trips):
-        blockers = []  # Trajets qui peuvent "bloquer" j d'être premier
-
-        for i in range(num_trips):
-            if i != j:
-                # i et j sont-ils sur le même service ?
-                same_service = model.NewBoolVar(f"same_service_{i}_{j}_first")
-                model.Add(assignments[i] == assignments[j]).OnlyEnforceIf(same_service)
-                model.Add(assignments[i] != assignments[j]).OnlyEnforceIf(same_service.Not())
-
-                # i vient-il avant j dans l'ordre ?
-                i_before_j = model.NewBoolVar(f"order_{i}_before_{j}_first")
-                model.Add(order[i] < order[j]).OnlyEnforceIf(i_before_j)
-                model.Add(order[i] >= order[j]).OnlyEnforceIf(i_before_j.Not())
-
-                # i bloque j s'ils sont sur le même service ET i vient avant j
-                blocker = model.NewBoolVar(f"blocker_{i}_{j}")
-                model.AddBoolAnd([same_service, i_before_j]).OnlyEnforceIf(blocker)
-                model.AddBoolOr([same_service.Not(), i_before_j.Not()]).OnlyEnforceIf(blocker.Not())
-
-                blockers.append(blocker)
-
-        # j est premier ssi aucun autre trajet ne le bloque
-        if blockers:
-            model.AddBoolOr(blockers).OnlyEnforceIf(is_first[j].Not())
-            model.AddBoolAnd([b.Not() for b in blockers]).OnlyEnforceIf(is_first[j])
-
-    return is_first
-
-
-def add_chaining_constraints(model: cp_model.CpModel, assignments: List,
-                             order: List, trips: List[Dict], is_first: List):
+def build_chaining_graph(trips: List[Dict]) -> GrapheCompatibilite:
     """
-    Ajoute les contraintes de chaînage (un trajet peut suivre un autre).
-    AJUSTEMENT : Traitement spécial des trajets internes A → A.
+    Graphe des enchaînements possibles : destination de i = origine de j
+    (trajets internes A → A compris), j commence après la fin de i et la
+    pause ne dépasse pas MAX_PAUSE_MINUTES.
     """
-    num_trips = len(trips)
-
-    for j in range(num_trips):
-        valid_predecessors = []
-
-        # Pour chaque trajet j, trouvons tous ses prédécesseurs possibles
-        for i in range(num_trips):
-            if i != j:
-                # AJUSTEMENT : Gestion spéciale des trajets internes
-                if trips[i]["from"] == trips[i]["to"]:
-                    # Un trajet interne peut être suivi par n'importe quel trajet partant du même arrêt
-                    can_chain = (trips[i]["to"] == trips[j]["from"] and
-                                 trips[i]["end"] <= trips[j]["start"])
-                elif trips[j]["from"] == trips[j]["to"]:
-                    # Un trajet interne peut suivre n'importe quel trajet arrivant au même arrêt
-                    can_chain = (trips[i]["to"] == trips[j]["from"] and
-                                 trips[i]["end"] <= trips[j]["start"])
-                else:
-                    # Cas normal : destination i = origine j
-                    can_chain = (trips[i]["to"] == trips[j]["from"] and
-                                 trips[i]["end"] <= trips[j]["start"])
-
-                if can_chain:
-                    # Contraintes pour le chaînage valide
-                    same_service = model.NewBoolVar(f"chain_same_service_{i}_{j}")
-                    model.Add(assignments[i] == assignments[j]).OnlyEnforceIf(same_service)
-                    model.Add(assignments[i] != assignments[j]).OnlyEnforceIf(same_service.Not())
-
-                    # i doit venir juste avant j dans l'ordre
-                    consecutive_order = model.NewBoolVar(f"consecutive_{i}_{j}")
-                    model.Add(order[i] == order[j] - 1).OnlyEnforceIf(consecutive_order)
-                    model.Add(order[i] != order[j] - 1).OnlyEnforceIf(consecutive_order.Not())
-
-                    # Chaînage valide = même service ET ordre consécutif
-                    valid_chain = model.NewBoolVar(f"valid_chain_{i}_{j}")
-                    model.AddBoolAnd([same_service, consecutive_order]).OnlyEnforceIf(valid_chain)
-                    model.AddBoolOr([same_service.Not(), consecutive_order.Not()]).OnlyEnforceIf(valid_chain.Not())
-
-                    valid_predecessors.append(valid_chain)
-
-        # Si j n'est pas premier, il DOIT avoir exactement un prédécesseur valide
-        if valid_predecessors:
-            has_predecessor = model.NewBoolVar(f"has_predecessor_{j}")
-            model.AddBoolOr(valid_predecessors).OnlyEnforceIf(has_predecessor)
-            model.AddBoolAnd([pred.Not() for pred in valid_predecessors]).OnlyEnforceIf(has_predecessor.Not())
-
-            # j n'est pas premier SI ET SEULEMENT SI il a un prédécesseur
-            model.Add(has_predecessor == is_first[j].Not())
-        else:
-            # Si j n'a aucun prédécesseur possible, il doit être premier
-            model.Add(is_first[j] == 1)
-
-
-def add_overlap_constraints(model: cp_model.CpModel, assignments: List,
-                            trips: List[Dict]):
+    return GrapheCompatibilite(
+        debuts=[t["start"] for t in trips],
+        fins=[t["end"] for t in trips],
+        arrets_debut=[t["from"] for t in trips],
+        arrets_fin=[t["to"] for t in trips],
+        battement_min=0,
+        battement_max=MAX_PAUSE_MINUTES
+    )
+
+
+def create_successor_variables(model: cp_model.CpModel, graphe: GrapheCompatibilite,
+                               num_services_max: int) -> Dict[tuple, Any]:
     """
-    Empêche les chevauchements temporels sur le même service ET
-    les pauses excessives entre trajets consécutifs.
+    Crée un littéral par arc possible et la contrainte AddMultipleCircuit.
+    Nœud 0 = dépôt (début / fin de service), trajet i = nœud i + 1.
+    Chaque trajet a exactement un prédécesseur et un successeur : les
+    services sont les chemins dépôt → ... → dépôt.
     """
-    num_trips = len(trips)
+    arcs = {}
+    for i in range(graphe.n):
+        arcs[0, i + 1] = model.NewBoolVar(f"first_{i}")
+        arcs[i + 1, 0] = model.NewBoolVar(f"last_{i}")
+        for j in graphe.successeurs[i]:
+            arcs[i + 1, j + 1] = model.NewBoolVar(f"next_{i}_{j}")
 
-    for i in range(num_trips):
-        for j in range(i + 1, num_trips):
-            # Vérifie s'il y a chevauchement temporel
-            overlap_exists = (trips[i]["start"] < trips[j]["end"] and
-                              trips[j]["start"] < trips[i]["end"])
+    model.AddMultipleCircuit([(tail, head, literal) for (tail, head), literal in arcs.items()])
 
-            if overlap_exists:
-                # Force les trajets qui se chevauchent sur des services différents
-                model.Add(assignments[i] != assignments[j])
+    # Nombre de services = nombre de départs du dépôt
+    model.Add(sum(arcs[0, i + 1] for i in range(graphe.n)) <= num_services_max)
 
-    # NOUVELLE CONTRAINTE : Empêche les pauses excessives (> 55min) sur TOUS les services
-    for i in range(num_trips):
-        for j in range(num_trips):
-            if i != j and trips[i]["end"] <= trips[j]["start"]:
-                pause_duration = trips[j]["start"] - trips[i]["end"]
+    return arcs
 
-                # Si pause > 55min, alors les trajets ne peuvent pas être sur le même service
-                if pause_duration > MAX_PAUSE_MINUTES:
-                    model.Add(assignments[i] != assignments[j])
 
-
-def add_service_constraints(model: cp_model.CpModel, assignments: List,
-                            trips: List[Dict], num_services_max: int):
+def add_service_constraints(model: cp_model.CpModel, arcs: Dict[tuple, Any],
+                            trips: List[Dict], graphe: GrapheCompatibilite):
     """
-    Ajoute les contraintes par service (durées, pauses, etc.).
-    NOUVEAU : Contraintes de pause seulement pour services >= 6h de prestation continue.
+    Ajoute les contraintes par service (durées, pauses, etc.) en propageant
+    le long du chemin : début du service, travail cumulé, présence d'une
+    pause trop courte. Évaluées sur le dernier trajet du service.
+    Contraintes de pause seulement pour services >= 6h de prestation continue.
     """
     num_trips = len(trips)
 
-    for service_id in range(num_services_max):
-        # Détermine quels trajets sont assignés à ce service
-        trip_assignments = []
-        for i in range(num_trips):
-            is_on_service = model.NewBoolVar(f"trip_{i}_on_service_{service_id}")
-            model.Add(assignments[i] == service_id).OnlyEnforceIf(is_on_service)
-            model.Add(assignments[i] != service_id).OnlyEnforceIf(is_on_service.Not())
-            trip_assignments.append(is_on_service)
-
-        # Compte le nombre de trajets sur ce service
-        nb_trips_on_service = model.NewIntVar(0, num_trips, f"nb_trips_service_{service_id}")
-        model.Add(nb_trips_on_service == sum(trip_assignments))
+    service_start = [model.NewIntVar(0, trips[i]["start"], f"service_start_{i}") for i in range(num_trips)]
+    work = [model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"work_{i}") for i in range(num_trips)]
+    short_pause = [model.NewBoolVar(f"short_pause_{i}") for i in range(num_trips)]
 
-        # Calcule la durée totale de prestation continue (du premier au dernier trajet)
-        service_duration = _calculate_service_duration(model, trips, trip_assignments, service_id)
-
-        # Calcule le temps total de travail effectif
-        total_work = _calculate_total_work_time(model, trips, trip_assignments, service_id)
+    for j in range(num_trips):
+        duration = trips[j]["end"] - trips[j]["start"]
+
+        # Premier trajet du service
+        first = arcs[0, j + 1]
+        model.Add(service_start[j] == trips[j]["start"]).OnlyEnforceIf(first)
+        model.Add(work[j] == duration).OnlyEnforceIf(first)
+        model.Add(short_pause[j] == 0).OnlyEnforceIf(first)
+
+        # Trajet suivant i dans le service
+        for i in graphe.predecesseurs[j]:
+            arc = arcs[i + 1, j + 1]
+            pause_duration = trips[j]["start"] - trips[i]["end"]
+            model.Add(service_start[j] == service_start[i]).OnlyEnforceIf(arc)
+            model.Add(work[j] == work[i] + duration).OnlyEnforceIf(arc)
+            if pause_duration < MIN_PAUSE_MINUTES:
+                model.Add(short_pause[j] == 1).OnlyEnforceIf(arc)
+            else:
+                model.Add(short_pause[j] == short_pause[i]).OnlyEnforceIf(arc)
 
-        # Calcule le temps total de pause
-        total_pause = _calculate_total_pause_time(model, trips, trip_assignments, service_id)
+    for j in range(num_trips):
+        last = arcs[j + 1, 0]
 
-        # NOUVELLE LOGIQUE : Contraintes seulement pour services longs
-        # 1. Service doit avoir 2+ trajets ET 6+ heures de prestation
-        needs_pause_rules = model.NewBoolVar(f"needs_pause_rules_service_{service_id}")
-        has_multiple_trips = model.NewBoolVar(f"multiple_trips_service_{service_id}")
-        is_long_service = model.NewBoolVar(f"long_service_{service_id}")
+        # Service d'un seul trajet : aucune règle de pause
+        has_multiple_trips = arcs[0, j + 1].Not()
 
-        # Conditions
-        model.Add(nb_trips_on_service >= 2).OnlyEnforceIf(has_multiple_trips)
-        model.Add(nb_trips_on_service <= 1).OnlyEnforceIf(has_multiple_trips.Not())
+        # Durée de prestation continue (du premier au dernier trajet)
+        service_duration = model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"duration_{j}")
+        model.Add(service_duration == trips[j]["end"] - service_start[j])
 
+        is_long_service = model.NewBoolVar(f"long_service_{j}")
         model.Add(service_duration >= MIN_SERVICE_DURATION_FOR_PAUSE_RULES).OnlyEnforceIf(is_long_service)
         model.Add(service_duration < MIN_SERVICE_DURATION_FOR_PAUSE_RULES).OnlyEnforceIf(is_long_service.Not())
 
-        # Les règles s'appliquent SI (2+ trajets) ET (6+ heures)
-        model.AddBoolAnd([has_multiple_trips, is_long_service]).OnlyEnforceIf(needs_pause_rules)
-        model.AddBoolOr([has_multiple_trips.Not(), is_long_service.Not()]).OnlyEnforceIf(needs_pause_rules.Not())
-
-        # Contraintes de pause seulement pour les services qui en ont besoin
-        # 1. Pause minimale de 5min entre trajets
-        _add_minimum_pause_constraints(model, trips, trip_assignments, service_id, needs_pause_rules)
-
-        # 2. Contrainte 20% temps travail/pause
-        model.Add(total_pause * RATIO_MULTIPLIER >= total_work * PAUSE_WORK_RATIO_PERCENT).OnlyEnforceIf(
-            needs_pause_rules)
-
-
-def _calculate_service_duration(model: cp_model.CpModel, trips: List[Dict],
-                                trip_assignments: List, service_id: int):
-    """
-    Calcule la durée totale de prestation continue pour un service.
-    = temps écoulé du début du premier trajet à la fin du dernier trajet.
-    """
-    num_trips = len(trips)
-
-    # Variables pour le premier et dernier trajet du service
-    first_trip_start = model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"first_start_s{service_id}")
-    last_trip_end = model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"last_end_s{service_id}")
-
-    # Trouve le début du premier trajet
-    min_starts = []
-    for i in range(num_trips):
-        conditional_start = model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"cond_start_{i}_s{service_id}")
-        model.Add(conditional_start == trips[i]["start"]).OnlyEnforceIf(trip_assignments[i])
-        model.Add(conditional_start == MAX_MINUTES_PER_DAY).OnlyEnforceIf(trip_assignments[i].Not())
-        min_starts.append(conditional_start)
-
-    model.AddMinEquality(first_trip_start, min_starts)
-
-    # Trouve la fin du dernier trajet
-    max_ends = []
-    for i in range(num_trips):
-        conditional_end = model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"cond_end_{i}_s{service_id}")
-        model.Add(conditional_end == trips[i]["end"]).OnlyEnforceIf(trip_assignments[i])
-        model.Add(conditional_end == 0).OnlyEnforceIf(trip_assignments[i].Not())
-        max_ends.append(conditional_end)
-
-    model.AddMaxEquality(last_trip_end, max_ends)
-
-    # Durée de service = fin du dernier - début du premier
-    service_duration = model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"duration_s{service_id}")
-    model.Add(service_duration == last_trip_end - first_trip_start)
-
-    return service_duration
-
-
-def _add_minimum_pause_constraints(model: cp_model.CpModel, trips: List[Dict],
-                                   trip_assignments: List, service_id: int,
-                                   needs_pause_rules):
-    """
-    Ajoute les contraintes de pause minimale entre trajets consécutifs.
-    """
-    num_trips = len(trips)
-
-    for i in range(num_trips):
-        for j in range(num_trips):
-            if i != j and trips[i]["end"] <= trips[j]["start"]:
-                # Si les deux trajets sont sur ce service
-                both_assigned = model.NewBoolVar(f"both_assigned_{i}_{j}_s{service_id}")
-                model.AddBoolAnd([trip_assignments[i], trip_assignments[j]]).OnlyEnforceIf(both_assigned)
-                model.AddBoolOr([trip_assignments[i].Not(), trip_assignments[j].Not()]).OnlyEnforceIf(
-                    both_assigned.Not())
-
-                # Pause entre les trajets
-                pause_duration = trips[j]["start"] - trips[i]["end"]
-
-                # Contrainte pause minimale seulement si service a besoin des règles
-                constraint_applies = model.NewBoolVar(f"pause_constraint_{i}_{j}_s{service_id}")
-                model.AddBoolAnd([both_assigned, needs_pause_rules]).OnlyEnforceIf(constraint_applies)
-                model.AddBoolOr([both_assigned.Not(), needs_pause_rules.Not()]).OnlyEnforceIf(constraint_applies.Not())
-
-                # Si la contrainte s'applique, pause doit être >= 5min
-                model.Add(pause_duration >= MIN_PAUSE_MINUTES).OnlyEnforceIf(constraint_applies)
-
-
-def _calculate_total_work_time(model: cp_model.CpModel, trips: List[Dict],
-                               trip_assignments: List, service_id: int):
-    """Calcule le temps total de travail pour un service."""
-    work_durations = []
-
-    for i, is_assigned in enumerate(trip_assignments):
-        duration = trips[i]["end"] - trips[i]["start"]
-        work_duration = model.NewIntVar(0, duration, f"work_{i}_s{service_id}")
-        model.Add(work_duration == duration).OnlyEnforceIf(is_assigned)
-        model.Add(work_duration == 0).OnlyEnforceIf(is_assigned.Not())
-        work_durations.append(work_duration)
-
-    total_work = model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"total_work_s{service_id}")
-    model.Add(total_work == sum(work_durations))
-    return total_work
-
-
-def _calculate_total_pause_time(model: cp_model.CpModel, trips: List[Dict],
-                                trip_assignments: List, service_id: int):
-    """Calcule le temps total de pause pour un service."""
-    pause_durations = []
-    num_trips = len(trips)
-
-    for i in range(num_trips):
-        for j in range(num_trips):
-            if i != j and trips[i]["end"] <= trips[j]["start"]:
-                pause_duration = model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"pause_{i}_{j}_s{service_id}")
-
-                # Si les deux trajets sont sur ce service
-                both_assigned = model.NewBoolVar(f"both_assigned_{i}_{j}_s{service_id}")
-                model.AddBoolAnd([trip_assignments[i], trip_assignments[j]]).OnlyEnforceIf(both_assigned)
-                model.AddBoolOr([trip_assignments[i].Not(), trip_assignments[j].Not()]).OnlyEnforceIf(
-                    both_assigned.Not())
-
-                # Calcule la pause et applique la contrainte minimum
-                model.Add(pause_duration == trips[j]["start"] - trips[i]["end"]).OnlyEnforceIf(both_assigned)
-                model.Add(pause_duration == 0).OnlyEnforceIf(both_assigned.Not())
-
-                pause_durations.append(pause_duration)
+        # Les règles s'appliquent SI (fin de service) ET (2+ trajets) ET (6+ heures)
+        rules = [last, has_multiple_trips, is_long_service]
 
-    total_pause = model.NewIntVar(0, MAX_MINUTES_PER_DAY, f"total_pause_s{service_id}")
-    if pause_durations:
-        model.Add(total_pause == sum(pause_durations))
-    else:
-        model.Add(total_pause == 0)
+        # 1. Pause minimale de 5min entre trajets consécutifs
+        model.Add(short_pause[j] == 0).OnlyEnforceIf(rules)
 
-    return total_pause
+        # 2. Contrainte 25% temps travail/pause (pause = prestation - travail)
+        total_pause = service_duration - work[j]
+        model.Add(total_pause * RATIO_MULTIPLIER >= work[j] * PAUSE_WORK_RATIO_PERCENT).OnlyEnforceIf(rules)
 
 
 def voiturage_ia():
@@ -496,24 +283,23 @@ def voiturage_ia():
     # AJUSTEMENT : Réduction du nombre de services maximum pour forcer plus de regroupements
     num_services_max = 10  # au lieu de 15
 
-    # Création du modèle et des variables
+    # Création du modèle et des variables (un littéral par enchaînement possible)
     model = cp_model.CpModel()
-    assignments, order = create_model_variables(model, num_trips, num_services_max)
+    graphe = build_chaining_graph(trips)
+    arcs = create_successor_variables(model, graphe, num_services_max)
 
     # Ajout des contraintes par étapes
     print("📝 Ajout des contraintes...")
-    is_first = add_first_trip_constraints(model, assignments, order, num_trips)
-    add_chaining_constraints(model, assignments, order, trips, is_first)
-    add_overlap_constraints(model, assignments, trips)
-    add_service_constraints(model, assignments, trips, num_services_max)
+    add_service_constraints(model, arcs, trips, graphe)
+    print(f"   {len(arcs)} arcs, au moins {graphe.borne_inferieure_services()} services nécessaires "
+          f"(maximum autorisé : {num_services_max})")
 
     # Configuration et résolution
     print("🔍 Recherche des solutions...")
     solver = cp_model.CpSolver()
-    solver.parameters.enumerate_all_solutions = True
-    solver.parameters.max_time_in_seconds = MAX_SOLVER_TIME_SECONDS
+    print(f"   {configurer_solveur(solver, model, 'auto', MAX_SOLVER_TIME_SECONDS, enumerer=True)}")
 
-    printer = BusSchedulePrinter(assignments, trips, order=order, max_solutions=5)
+    printer = BusSchedulePrinter(arcs, trips, max_solutions=5)
     status = solver.Solve(model, printer)
 
     # Résultats
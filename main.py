@@ -1,11 +1,23 @@
 
+import importlib.util
+import os
 from tkinter import messagebox as msgbox, ttk
 import customtkinter as ctk
 from customtkinter import CTkTabview
 from objet import voyage, service_agent
 from sqlite import add_line, get_lignes_from_db, add_lieux, get_lieux_from_db, add_trajet, charger_csv
 from tabelauCSV import window_tableau_csv
-from entrainementsolveria import solvertest
+from taches_solveur import TacheSolveur, suivre_dans_tk
+from profils_solveur import NOMS_PROFILS
+
+# solvertest (profils, suivi) est dans test/entrainementsolveria3.py : le paquet
+# test de la bibliothèque standard masque ce dossier, chargement par son chemin
+_spec = importlib.util.spec_from_file_location(
+    "entrainementsolveria3",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "test", "entrainementsolveria3.py"))
+_entrainement = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_entrainement)
+solvertest = _entrainement.solvertest
 
 class TimelineCanvas:
 
@@ -375,7 +387,14 @@ def main():
     entry_max_sol.insert(0, "10")
     entry_max_sol.grid(row=3, column=1, pady=10, sticky="w", padx=10)
 
+    label_profil = ctk.CTkLabel(master=config_frame, text="Profil du solveur:")
+    label_profil.grid(row=9, column=0, pady=10, sticky="e", padx=10)
+    combo_profil = ctk.CTkComboBox(master=config_frame, values=NOMS_PROFILS, width=100)
+    combo_profil.set("auto")
+    combo_profil.grid(row=9, column=1, pady=10, sticky="w", padx=10)
+
     donnees_chargees = {'voyages': None, 'matrice': None}
+    resolution = {'tache': None}  # résolution en arrière-plan (l'interface reste utilisable)
 
     def remplir_tableau_matrice(tableau, matrice_donnees):
         for item in tableau.get_children():
@@ -397,6 +416,10 @@ def main():
         window_tableau_csv(callback=traiter_voyages)
 
     def solve():
+        if resolution['tache'] is not None:
+            msgbox.showwarning("Attention", "Une résolution est déjà en cours")
+            return
+
         try:
             if donnees_chargees['voyages'] is None:
                 msgbox.showerror("Erreur","Il n'y a aucun voyage selectionné")
@@ -406,35 +429,7 @@ def main():
             nb_aprem = int(entry_aprem.get())
             battement_minimum = int(entry_battement.get())
             max_solutions = int(entry_max_sol.get())
-
-            voyages_objets = donnees_chargees['voyages']
-
-            solutions = solvertest(
-                voyages_objets,
-                battement_minimum=battement_minimum,
-                verifier_arrets=True,
-                battement_maximum=50,
-                max_solutions=max_solutions,
-                max_services_matin=nb_matin,
-                max_services_apres_midi=nb_aprem,
-                heure_debut_apres_midi=660,
-                heure_fin_matin=1080,
-                duree_max_service=540
-            )
-
-            if solutions:
-                error_label.configure(
-                    text=f"{len(solutions)} solution(s) trouvée(s)",
-                    text_color="green"
-                )
-                afficher_resultats(solutions)
-
-            else:
-                error_label.configure(
-                    text="Aucune solution trouvée",
-                    text_color="orange"
-                )
-                msgbox.showwarning("Résultat", "Aucune solution trouvée")
+            profil = combo_profil.get()
 
         except ValueError as ve:
             error_label.configure(
@@ -442,12 +437,86 @@ def main():
                 text_color="red"
             )
             msgbox.showerror("Erreur", f"Erreur de saisie: {ve}")
-        except Exception as e:
+            return
+
+        voyages_objets = donnees_chargees['voyages']
+
+        # suivi : progression à chaque solution, "Annuler" arrête la recherche (StopSearch)
+        resolution['tache'] = TacheSolveur(lambda suivi: solvertest(
+            voyages_objets,
+            battement_minimum=battement_minimum,
+            verifier_arrets=True,
+            battement_maximum=50,
+            max_solutions=max_solutions,
+            max_services_matin=nb_matin,
+            max_services_apres_midi=nb_aprem,
+            heure_debut_apres_midi=660,
+            heure_fin_matin=1080,
+            duree_max_service=540,
+            profil=profil,
+            suivi=suivi
+        )).demarrer()
+
+        button_solve.configure(state="disabled")
+        error_label.configure(text="Résolution en cours...", text_color="grey")
+        progress_solve.grid()
+        progress_solve.start()
+        button_annuler.configure(state="normal")
+        button_annuler.grid()
+
+        suivre_dans_tk(tab4, resolution['tache'], fin_resolution, progression_resolution)
+
+    def progression_resolution(tache, progression):
+        if progression is not None and not tache.annulee:
             error_label.configure(
-                text=f"Erreur: {str(e)}",
+                text=f"Résolution en cours... {progression['nb_solutions']} solution(s)",
+                text_color="grey"
+            )
+
+    def annuler_resolution():
+        tache = resolution['tache']
+        if tache is not None:
+            # La recherche s'arrête au prochain point de contrôle de CP-SAT :
+            # "Résoudre" reste désactivé jusqu'à la fin du thread (fin_resolution)
+            tache.annuler()
+            button_annuler.configure(state="disabled")
+            error_label.configure(text="Annulation en cours...", text_color="orange")
+
+    def fin_resolution(tache):
+        resolution['tache'] = None
+
+        progress_solve.stop()
+        progress_solve.grid_remove()
+        button_annuler.grid_remove()
+        button_solve.configure(state="normal")
+
+        if tache.annulee:
+            error_label.configure(text="Résolution annulée", text_color="orange")
+            return
+
+        if tache.erreur is not None:
+            error_label.configure(
+                text=f"Erreur: {str(tache.erreur)}",
                 text_color="red"
             )
-            msgbox.showerror("Erreur", f"Erreur lors de la résolution: {e}")
+            msgbox.showerror("Erreur", f"Erreur lors de la résolution: {tache.erreur}")
+            return
+
+        solutions = tache.resultat
+
+        if solutions:
+            error_label.configure(
+                text=f"{len(solutions)} solution(s) trouvée(s)",
+                text_color="green"
+            )
+            afficher_resultats(solutions)
+
+        else:
+            error_label.configure(
+                text="Aucune solution trouvée",
+                text_color="orange"
+            )
+            msgbox.showwarning("Résultat", "Aucune solution trouvée")
 
     def afficher_resultats(solutions):
 
@@ -509,6 +578,22 @@ def main():
     )
     button_charge_csv.grid(row=5, column=0, columnspan=2, pady=10)
 
+    progress_solve = ctk.CTkProgressBar(master=config_frame, mode="indeterminate", width=200)
+    progress_solve.grid(row=7, column=0, columnspan=2, pady=5)
+    progress_solve.grid_remove()
+
+    button_annuler = ctk.CTkButton(
+        master=config_frame,
+        text="⏹️ Annuler",
+        command=annuler_resolution,
+        width=200,
+        height=30,
+        fg_color="#F44336",
+        hover_color="#D32F2F"
+    )
+    button_annuler.grid(row=8, column=0, columnspan=2, pady=5)
+    button_annuler.grid_remove()
+
     error_label = ctk.CTkLabel(master=config_frame, text="", text_color="gray")  # ✅ CORRIGÉ
     error_label.grid(row=6, column=0, columnspan=2, pady=10)
 
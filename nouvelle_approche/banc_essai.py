@@ -0,0 +1,552 @@
+"""
+BANC D'ESSAI DES MOTEURS D'AFFECTATION
+Compare tous les moteurs sur les mêmes journées de voyages et écrit un
+rapport JSON / CSV pour suivre les régressions d'une version à l'autre.
+
+Moteurs:
+- glouton        : algorithme_glouton (exemple_comparaison)
+- ortools        : OptimisateurServices (gestion_voiture), mode "paires"
+- ortools_arcs   : OptimisateurServices, mode "arcs" (AddCircuit)
+- voyage_solver  : VoyageSolver (TAB5/solverortool.py)
+- solvertest     : solvertest (test/entrainementsolveria3.py)
+- odm            : AdvancedODMSolver (gestion_contrainte)
+- ia_contrainte  : modèle de voiturage_ia (ia_contrainte), appliqué aux
+                   voyages du jeu avec le nombre de services minimisé
+
+Jeux de données:
+- aeroport.csv et "échantillon voyage BS.csv" (racine du projet)
+- journées synthétiques reproductibles (graine fixe) de 100 à 5 000 voyages
+
+Chaque essai (moteur × jeu) tourne dans un processus séparé : la mémoire
+de pointe mesurée est la sienne (CP-SAT compris, pas seulement Python), un
+moteur qui dépasse son temps est arrêté sans bloquer le banc, et une
+erreur n'interrompt pas les essais suivants. Les moteurs dont le modèle
+grossit trop vite (TAILLE_MAX) sont ignorés au-delà de leur taille.
+
+Mesures: temps de construction, temps de résolution, mémoire de pointe,
+services utilisés, voyages non couverts, objectif.
+
+Utilisation (depuis la racine du projet : objet, graphe_compatibilite...
+sont à la racine, gestion_voiture et exemple_comparaison dans ce dossier) :
+    PYTHONPATH=. python nouvelle_approche/banc_essai.py     # tout, rapport dans banc_essai_resultats.json/.csv
+    PYTHONPATH=. python nouvelle_approche/banc_essai.py --moteurs glouton ortools --tailles 100 500 --temps 30
+
+    # nouvelle_approche en tête du chemin de recherche, racine ensuite
+    from banc_essai import lancer_banc, ecrire_rapport
+    resultats = lancer_banc(moteurs=["glouton", "ortools"], tailles=[100, 500])
+    ecrire_rapport(resultats, "banc_essai_resultats")
+"""
+
+import argparse
+import contextlib
+import csv
+import importlib.util
+import io
+import json
+import math
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from objet import voyage, service_agent
+from graphe_compatibilite import GrapheCompatibilite
+
+try:
+    import resource  # Mémoire de pointe du processus (Unix)
+except ImportError:
+    resource = None
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FICHIERS_REELS = {
+    "aeroport": os.path.join(RACINE, "aeroport.csv"),
+    "echantillon_bs": os.path.join(RACINE, "échantillon voyage BS.csv"),
+}
+
+TAILLES_SYNTHETIQUES = [100, 500, 1000, 2000, 5000]
+
+# Taille maximale (nombre de voyages) par moteur : au-delà le modèle ne
+# tient plus en mémoire ou ne se construit pas dans le temps imparti
+TAILLE_MAX = {
+    "glouton": None,
+    "ortools": 2000,
+    "ortools_arcs": 5000,
+    "voyage_solver": 1000,
+    "solvertest": 300,
+    "odm": 300,
+    "ia_contrainte": 2000,
+}
+
+BATTEMENT_MIN = 5
+BATTEMENT_MAX = 50
+MARGE_SERVICES = 0.2  # Services proposés = borne inférieure + 20 % (+ 1)
+
+COLONNES_RAPPORT = [
+    "moteur", "jeu", "nb_voyages", "statut",
+    "temps_construction", "temps_resolution", "temps_total", "memoire_pic_mo",
+    "services_utilises", "voyages_non_couverts", "objectif", "message",
+]
+
+
+# ----------------------------------------------------------------------
+# Jeux de données
+# ----------------------------------------------------------------------
+
+def lire_voyages_csv(chemin_fichier: str) -> List[voyage]:
+    """Voyages d'un CSV (colonnes Ligne, Voy., Début, Fin, De, À, Js srv) ; lignes invalides ignorées"""
+    voyages = []
+    with open(chemin_fichier, 'r', encoding='utf-8-sig') as fichier:
+        premiere_ligne = fichier.readline()
+        fichier.seek(0)
+        delimiter = ';' if ';' in premiere_ligne else ','
+        for ligne in csv.DictReader(fichier, delimiter=delimiter):
+            try:
+                voyages.append(voyage(
+                    num_ligne=ligne.get('Ligne', '').strip(),
+                    num_voyage=ligne.get('Voy.', '').strip(),
+                    arret_debut=ligne.get('De', '').strip(),
+                    arret_fin=ligne.get('À', '').strip(),
+                    heure_debut=ligne.get('Début', '').strip(),
+                    heure_fin=ligne.get('Fin', '').strip(),
+                    js_srv=ligne.get('Js srv', '').strip()
+                ))
+            except (ValueError, AttributeError):
+                continue
+    return voyages
+
+
+def _heure(minutes: int) -> str:
+    """Minutes depuis minuit au format HH:MM du CSV"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def journee_synthetique(nb_voyages: int, graine: int = 0) -> List[voyage]:
+    """
+    Journée de dépôt synthétique et reproductible : chaque véhicule fait la
+    navette sur une ligne, entre le terminus de la ligne et un pôle
+    d'échange partagé, pendant 4 à 9 heures entre 5h00 et 23h00, avec 5 à
+    20 minutes de battement entre deux voyages.
+    """
+    aleatoire = random.Random(graine)
+    nb_lignes = max(1, nb_voyages // 40)
+    nb_poles = max(1, nb_lignes // 4)
+    # Terminus propre ("012T1") et pôle partagé ("P03S1") : 3 premiers caractères distincts
+    lignes = [(f"{num_ligne:03d}T1", f"P{num_ligne % nb_poles:02d}S1", aleatoire.randint(20, 60))
+              for num_ligne in range(nb_lignes)]
+    numeros = [0] * nb_lignes
+    voyages = []
+
+    vehicule = 0
+    while len(voyages) < nb_voyages:
+        num_ligne = vehicule % nb_lignes
+        terminus, pole, duree = lignes[num_ligne]
+        heure = 5 * 60 + aleatoire.randint(0, 12 * 60)
+        fin_service = min(heure + aleatoire.randint(4 * 60, 9 * 60), 23 * 60)
+        depart, arrivee = (terminus, pole) if vehicule % 2 == 0 else (pole, terminus)
+
+        while heure + duree <= fin_service and len(voyages) < nb_voyages:
+            numeros[num_ligne] += 1
+            voyages.append(voyage(f"S{num_ligne:03d}", numeros[num_ligne], depart, arrivee,
+                                  _heure(heure), _heure(heure + duree)))
+            heure += duree + aleatoire.randint(5, 20)
+            depart, arrivee = arrivee, depart
+        vehicule += 1
+
+    return sorted(voyages, key=lambda v: v.hdebut)
+
+
+def jeux_de_donnees(tailles: List[int], fichiers: Optional[Dict[str, str]] = None,
+                    graine: int = 0) -> Dict[str, List[voyage]]:
+    """Fichiers réels présents + journées synthétiques des tailles demandées"""
+    jeux = {}
+    for nom, chemin in (FICHIERS_REELS if fichiers is None else fichiers).items():
+        if os.path.exists(chemin):
+            jeux[nom] = lire_voyages_csv(chemin)
+        else:
+            print(f"⚠️ Fichier absent, jeu ignoré : {chemin}")
+    for taille in tailles:
+        jeux[f"synthetique_{taille}"] = journee_synthetique(taille, graine)
+    return jeux
+
+
+def nombre_services(voyages: List[voyage]) -> int:
+    """Services proposés aux moteurs : borne inférieure prouvée plus une marge"""
+    graphe = GrapheCompatibilite.depuis_voyages(voyages, battement_min=BATTEMENT_MIN,
+                                                battement_max=BATTEMENT_MAX)
+    return math.ceil(graphe.borne_inferieure_services() * (1 + MARGE_SERVICES)) + 1
+
+
+def creer_services(nb_services: int) -> List[service_agent]:
+    """Services vides ouverts toute la journée (mêmes services pour tous les moteurs)"""
+    services = []
+    for num in range(1, nb_services + 1):
+        service = service_agent(num_service=num, type_service="matin" if num % 2 else "apres-midi")
+        service.heure_debut = service.heure_debut_max = 0
+        service.heure_fin = service.heure_fin_max = 24 * 60 - 1
+        services.append(service)
+    return services
+
+
+# ----------------------------------------------------------------------
+# Moteurs : chacun retourne ses mesures (temps, services, couverture, objectif)
+# ----------------------------------------------------------------------
+
+def _importer(nom_module: str, chemin_fichier: str):
+    """Importe un module hors du chemin de recherche (TAB5, test)"""
+    spec = importlib.util.spec_from_file_location(nom_module, chemin_fichier)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _trajets(voyages: List[voyage]) -> List[Dict[str, Any]]:
+    """Voyages au format trajets {"start", "end", "from", "to"} (AdvancedODMSolver, ia_contrainte)"""
+    return [{"start": v.hdebut, "end": v.hfin, "from": v.arret_debut, "to": v.arret_fin,
+             "num_ligne": v.num_ligne, "num_trajet": v.num_voyage} for v in voyages]
+
+
+def _moteur_glouton(voyages, nb_services, temps_limite, nb_workers):
+    from exemple_comparaison import algorithme_glouton
+
+    services = creer_services(nb_services)
+    nb_affectes, temps = algorithme_glouton(voyages, services, BATTEMENT_MIN, BATTEMENT_MAX)
+    return {
+        "statut": "OK",
+        "temps_construction": 0.0,
+        "temps_resolution": temps,
+        "services_utilises": sum(1 for s in services if s.voyages),
+        "voyages_non_couverts": len(voyages) - nb_affectes,
+        "objectif": nb_affectes,
+    }
+
+
+def _moteur_ortools(voyages, nb_services, temps_limite, nb_workers, mode="paires"):
+    from gestion_voiture import OptimisateurServices
+    from ortools.sat.python import cp_model
+
+    optimiseur = OptimisateurServices(voyages, creer_services(nb_services), BATTEMENT_MIN, BATTEMENT_MAX,
+                                      temps_limite=temps_limite, mode=mode, nb_workers=nb_workers,
+                                      journal=False)
+    debut = time.time()
+    succes, resultats = optimiseur.resoudre()
+    temps_total = time.time() - debut
+    temps_resolution = optimiseur.solver.WallTime()
+
+    return {
+        "statut": optimiseur.solver.StatusName(resultats['status']) if succes else "ECHEC",
+        "temps_construction": temps_total - temps_resolution,
+        "temps_resolution": temps_resolution,
+        "services_utilises": sum(1 for indices in resultats['affectations'].values() if indices),
+        "voyages_non_couverts": len(voyages) - resultats['nb_affectes'],
+        "objectif": resultats['objectif'] if resultats['status'] != cp_model.UNKNOWN else None,
+    }
+
+
+def _moteur_ortools_arcs(voyages, nb_services, temps_limite, nb_workers):
+    return _moteur_ortools(voyages, nb_services, temps_limite, nb_workers, mode="arcs")
+
+
+def _moteur_voyage_solver(voyages, nb_services, temps_limite, nb_workers):
+    from ortools.sat.python import cp_model
+    from profils_solveur import configurer_solveur
+
+    solverortool = _importer("solverortool", os.path.join(RACINE, "TAB5", "solverortool.py"))
+
+    debut = time.time()
+    solveur_voyages = solverortool.VoyageSolver(voyages, creer_services(nb_services), BATTEMENT_MIN)
+    solveur_voyages._construire_modele()
+    temps_construction = time.time() - debut
+
+    # Même chemin que VoyageSolver.resoudre(max_solutions=1), temps de construction à part
+    solver = cp_model.CpSolver()
+    configurer_solveur(solver, solveur_voyages.model, "auto", temps_limite, nb_workers=nb_workers)
+    status = solver.Solve(solveur_voyages.model)
+    mesures = {
+        "statut": solver.StatusName(status),
+        "temps_construction": temps_construction,
+        "temps_resolution": solver.WallTime(),
+        "services_utilises": None,
+        "voyages_non_couverts": len(voyages),
+        "objectif": None,
+    }
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        affectations = solverortool.lire_affectations(solveur_voyages.x, len(voyages), nb_services, solver.Value)
+        mesures["services_utilises"] = sum(1 for indices in affectations if indices)
+        mesures["voyages_non_couverts"] = len(voyages) - sum(map(len, affectations))
+        mesures["objectif"] = solver.ObjectiveValue()
+    return mesures
+
+
+def _moteur_solvertest(voyages, nb_services, temps_limite, nb_workers):
+    entrainement = _importer("entrainementsolveria3", os.path.join(RACINE, "test", "entrainementsolveria3.py"))
+
+    # Construction et résolution ne sont pas séparables (temps limite interne : 30 s)
+    debut = time.time()
+    solutions = entrainement.solvertest(voyages, BATTEMENT_MIN, BATTEMENT_MAX, max_solutions=1,
+                                        max_services_matin=nb_services, max_services_apres_midi=nb_services)
+    temps = time.time() - debut
+
+    services = solutions[0] if solutions else []
+    return {
+        "statut": "OK" if solutions else "ECHEC",
+        "temps_construction": None,
+        "temps_resolution": temps,
+        "services_utilises": len(services) if solutions else None,
+        "voyages_non_couverts": len(voyages) - sum(len(s.voyages) for s in services),
+        "objectif": None,
+    }
+
+
+def _moteur_odm(voyages, nb_services, temps_limite, nb_workers):
+    from gestion_contrainte import AdvancedODMSolver
+
+    debut = time.time()
+    solveur = AdvancedODMSolver(_trajets(voyages))
+    # Services matin / après-midi : chaînes de la couverture minimale de son graphe
+    chaines = solveur.graphe.couverture_minimale()
+    nb_matin = sum(1 for chaine in chaines if voyages[chaine[0]].hdebut < 12 * 60)
+    temps_construction = time.time() - debut
+
+    debut = time.time()
+    solution = solveur._solve_generic(nb_matin, len(chaines) - nb_matin, mode="column_generation")
+    temps_resolution = time.time() - debut
+
+    services = list(solution['matin'].values()) + list(solution['apres_midi'].values())
+    couverts = {indice for service in services for indice, _ in service}
+    return {
+        "statut": "OK" if services else "ECHEC",
+        "message": None if services else "aucune chaîne valide (amplitude, chaînage sur 4 caractères)",
+        "temps_construction": temps_construction,
+        "temps_resolution": temps_resolution,
+        "services_utilises": len(services),
+        "voyages_non_couverts": len(voyages) - len(couverts),
+        "objectif": None,
+    }
+
+
+def _moteur_ia_contrainte(voyages, nb_services, temps_limite, nb_workers):
+    from ortools.sat.python import cp_model
+    from profils_solveur import configurer_solveur
+    from ia_contrainte import build_chaining_graph, create_successor_variables, add_service_constraints
+
+    debut = time.time()
+    trajets = _trajets(voyages)
+    model = cp_model.CpModel()
+    graphe = build_chaining_graph(trajets)
+    # Pas de plafond sur le nombre de services : il est minimisé
+    arcs = create_successor_variables(model, graphe, len(trajets))
+    add_service_constraints(model, arcs, trajets, graphe)
+    departs = [arcs[0, i + 1] for i in range(len(trajets))]
+    model.Minimize(sum(departs))
+    temps_construction = time.time() - debut
+
+    solver = cp_model.CpSolver()
+    configurer_solveur(solver, model, "auto", temps_limite, nb_workers=nb_workers)
+    status = solver.Solve(model)
+    trouve = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        "statut": solver.StatusName(status),
+        "temps_construction": temps_construction,
+        "temps_resolution": solver.WallTime(),
+        "services_utilises": sum(solver.Value(depart) for depart in departs) if trouve else None,
+        # Modèle de couverture totale : tous les voyages ou aucune solution
+        "voyages_non_couverts": 0 if trouve else len(voyages),
+        "objectif": solver.ObjectiveValue() if trouve else None,
+    }
+
+
+MOTEURS: Dict[str, Callable] = {
+    "glouton": _moteur_glouton,
+    "ortools": _moteur_ortools,
+    "ortools_arcs": _moteur_ortools_arcs,
+    "voyage_solver": _moteur_voyage_solver,
+    "solvertest": _moteur_solvertest,
+    "odm": _moteur_odm,
+    "ia_contrainte": _moteur_ia_contrainte,
+}
+
+
+# ----------------------------------------------------------------------
+# Exécution
+# ----------------------------------------------------------------------
+
+def memoire_pic_mo() -> Optional[float]:
+    """Mémoire résidente de pointe du processus en Mo (None hors Unix)"""
+    if resource is None:
+        return None
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kio sous Linux, octets sous macOS
+    return round(pic / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+def _executer_essai(nom_moteur, voyages, nb_services, temps_limite, nb_workers, verbeux, file):
+    """Corps du processus d'un essai : mesures dans la file"""
+    debut = time.time()
+    try:
+        sortie = contextlib.nullcontext() if verbeux else contextlib.redirect_stdout(io.StringIO())
+        with sortie:
+            mesures = MOTEURS[nom_moteur](voyages, nb_services, temps_limite, nb_workers)
+    except Exception as e:
+        mesures = {"statut": "ERREUR", "message": f"{type(e).__name__}: {e}"}
+    mesures["temps_total"] = time.time() - debut
+    mesures["memoire_pic_mo"] = memoire_pic_mo()
+    file.put(mesures)
+
+
+def executer_essai(nom_moteur: str, nom_jeu: str, voyages: List[voyage],
+                   temps_limite: float = 60, nb_workers: Optional[int] = None,
+                   verbeux: bool = False) -> Dict[str, Any]:
+    """
+    Un essai moteur × jeu dans un processus séparé.
+
+    Le processus est arrêté s'il dépasse 3 × temps_limite + 60 s (certains
+    moteurs ont leur propre limite interne ou construisent longuement).
+    """
+    ligne = {colonne: None for colonne in COLONNES_RAPPORT}
+    ligne.update({"moteur": nom_moteur, "jeu": nom_jeu, "nb_voyages": len(voyages)})
+
+    taille_max = TAILLE_MAX.get(nom_moteur)
+    if taille_max is not None and len(voyages) > taille_max:
+        ligne.update({"statut": "IGNORE", "message": f"plus de {taille_max} voyages"})
+        return ligne
+
+    nb_services = nombre_services(voyages)
+    contexte = multiprocessing.get_context("spawn")  # Processus neuf : mémoire de pointe propre à l'essai
+    file = contexte.Queue()
+    processus = contexte.Process(target=_executer_essai,
+                                 args=(nom_moteur, voyages, nb_services, temps_limite, nb_workers, verbeux, file))
+    debut = time.time()
+    limite = debut + 3 * temps_limite + 60
+    processus.start()
+    # Relève la file jusqu'au résultat, à la fin du processus (plantage) ou au temps dépassé
+    while True:
+        try:
+            ligne.update(file.get(timeout=1))
+            break
+        except queue.Empty:
+            if not processus.is_alive():
+                break
+            if time.time() > limite:
+                processus.terminate()
+                ligne.update({"statut": "INTERROMPU", "temps_total": time.time() - debut,
+                              "message": "temps dépassé"})
+                break
+    processus.join()
+
+    if ligne["statut"] is None:
+        ligne.update({"statut": "ERREUR", "message": f"processus terminé (code {processus.exitcode})"})
+    return ligne
+
+
+def lancer_banc(moteurs: Optional[List[str]] = None,
+                tailles: Optional[List[int]] = None,
+                temps_limite: float = 60,
+                nb_workers: Optional[int] = None,
+                graine: int = 0,
+                fichiers: Optional[Dict[str, str]] = None,
+                verbeux: bool = False) -> List[Dict[str, Any]]:
+    """
+    Exécute chaque moteur sur chaque jeu de données.
+
+    Args:
+        moteurs: Noms des moteurs (None = tous, voir MOTEURS)
+        tailles: Tailles des journées synthétiques (None = TAILLES_SYNTHETIQUES)
+        temps_limite: Temps limite de résolution par essai en secondes
+        nb_workers: Workers CP-SAT (None = nombre de cœurs ; 1 = résultats reproductibles)
+        graine: Graine des journées synthétiques
+        fichiers: {nom: chemin CSV} (None = FICHIERS_REELS)
+        verbeux: Afficher la sortie des moteurs
+
+    Returns:
+        Une ligne de mesures par essai (colonnes COLONNES_RAPPORT)
+    """
+    moteurs = list(MOTEURS) if moteurs is None else moteurs
+    inconnus = [nom for nom in moteurs if nom not in MOTEURS]
+    if inconnus:
+        raise ValueError(f"Moteur(s) inconnu(s) : {', '.join(inconnus)} (attendu : {', '.join(MOTEURS)})")
+
+    jeux = jeux_de_donnees(TAILLES_SYNTHETIQUES if tailles is None else tailles, fichiers, graine)
+    resultats = []
+
+    print("=" * 70)
+    print(f"🏁 BANC D'ESSAI : {len(moteurs)} moteur(s) × {len(jeux)} jeu(x)")
+    print("=" * 70)
+    for nom_jeu, voyages in jeux.items():
+        print(f"\n📂 {nom_jeu} ({len(voyages)} voyages)")
+        for nom_moteur in moteurs:
+            ligne = executer_essai(nom_moteur, nom_jeu, voyages, temps_limite, nb_workers, verbeux)
+            resultats.append(ligne)
+            print(f"   {nom_moteur:<14} {ligne['statut']:<11} "
+                  f"{_format(ligne['temps_total'], 's')} "
+                  f"services={_format(ligne['services_utilises'])} "
+                  f"non couverts={_format(ligne['voyages_non_couverts'])} "
+                  f"mémoire={_format(ligne['memoire_pic_mo'], ' Mo')}"
+                  f"{'  (' + ligne['message'] + ')' if ligne['message'] else ''}")
+
+    return resultats
+
+
+def _format(valeur, unite: str = "") -> str:
+    if valeur is None:
+        return "-"
+    if isinstance(valeur, float):
+        return f"{valeur:.2f}{unite}"
+    return f"{valeur}{unite}"
+
+
+def ecrire_rapport(resultats: List[Dict[str, Any]], chemin_base: str,
+                   parametres: Optional[Dict[str, Any]] = None):
+    """
+    Écrit chemin_base.json (contexte d'exécution + résultats) et
+    chemin_base.csv (une ligne par essai).
+    """
+    from ortools import __version__ as version_ortools
+
+    rapport = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "systeme": platform.platform(),
+            "python": platform.python_version(),
+            "ortools": version_ortools,
+            "nb_coeurs": os.cpu_count(),
+        },
+        "parametres": parametres or {},
+        "resultats": resultats,
+    }
+    with open(f"{chemin_base}.json", "w", encoding="utf-8") as fichier:
+        json.dump(rapport, fichier, ensure_ascii=False, indent=2)
+
+    with open(f"{chemin_base}.csv", "w", encoding="utf-8", newline="") as fichier:
+        writer = csv.DictWriter(fichier, fieldnames=COLONNES_RAPPORT, delimiter=";")
+        writer.writeheader()
+        writer.writerows(resultats)
+
+    print(f"\n💾 Rapport écrit : {chemin_base}.json, {chemin_base}.csv")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banc d'essai des moteurs d'affectation")
+    parser.add_argument("--moteurs", nargs="+", choices=list(MOTEURS), help="moteurs à comparer (défaut : tous)")
+    parser.add_argument("--tailles", nargs="*", type=int, help="tailles des journées synthétiques")
+    parser.add_argument("--temps", type=float, default=60, help="temps limite par essai (s)")
+    parser.add_argument("--workers", type=int, help="workers CP-SAT (1 = reproductible)")
+    parser.add_argument("--graine", type=int, default=0, help="graine des journées synthétiques")
+    parser.add_argument("--sortie", default="banc_essai_resultats", help="chemin des rapports (sans extension)")
+    parser.add_argument("--verbeux", action="store_true", help="afficher la sortie des moteurs")
+    arguments = parser.parse_args()
+
+    parametres = {
+        "moteurs": arguments.moteurs or list(MOTEURS),
+        "tailles": TAILLES_SYNTHETIQUES if arguments.tailles is None else arguments.tailles,
+        "temps_limite": arguments.temps,
+        "nb_workers": arguments.workers,
+        "graine": arguments.graine,
+    }
+    resultats = lancer_banc(parametres["moteurs"], parametres["tailles"], arguments.temps,
+                            arguments.workers, arguments.graine, verbeux=arguments.verbeux)
+    ecrire_rapport(resultats, arguments.sortie, parametres)
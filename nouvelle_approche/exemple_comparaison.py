@@ -5,6 +5,7 @@ Démontre la différence de performance entre les deux approches
 
 from objet import voyage, service_agent
 from gestion_voiture import optimiser_affectation
+from graphe_compatibilite import GrapheCompatibilite
 import time
 
 
@@ -92,40 +93,32 @@ def algorithme_glouton(voyages, services, battement_min=5, battement_max=50, ver
                 if v.hdebut < h_debut or v.hfin > h_fin:
                     continue
             
-            # Vérifier compatibilité avec voyages existants
+            # Voyages du service triés : seuls le précédent et le suivant comptent
+            precedent, suivant = service.voisins(v)
             compatible = True
             
-            for v_exist in service.voyages:
+            for v1, v2 in ((precedent, v), (v, suivant)):
+                if v1 is None or v2 is None:
+                    continue
+                
                 # Chevauchement temporel
-                if not (v.hfin <= v_exist.hdebut or v.hdebut >= v_exist.hfin):
+                if v1.hfin > v2.hdebut:
                     compatible = False
                     break
                 
                 # Vérifier battement
-                if v.hfin <= v_exist.hdebut:
-                    battement = v_exist.hdebut - v.hfin
-                    if battement < battement_min or (battement_max and battement > battement_max):
-                        compatible = False
-                        break
-                    
-                    # Vérifier arrêts
-                    if verifier_arrets and v.arret_fin_id() != v_exist.arret_debut_id():
-                        compatible = False
-                        break
-                        
-                elif v_exist.hfin <= v.hdebut:
-                    battement = v.hdebut - v_exist.hfin
-                    if battement < battement_min or (battement_max and battement > battement_max):
-                        compatible = False
-                        break
-                    
-                    # Vérifier arrêts
-                    if verifier_arrets and v_exist.arret_fin_id() != v.arret_debut_id():
-                        compatible = False
-                        break
+                battement = v2.hdebut - v1.hfin
+                if battement < battement_min or (battement_max and battement > battement_max):
+                    compatible = False
+                    break
+                
+                # Vérifier arrêts
+                if verifier_arrets and v1.arret_fin_id() != v2.arret_debut_id():
+                    compatible = False
+                    break
             
             if compatible:
-                service.ajout_voyages(v)
+                service.ajouter_voyage(v)
                 nb_affectes += 1
                 affecte = True
                 print(f"  ✓ V{v.num_voyage} → Service {service.num_service}")
@@ -174,6 +167,39 @@ def algorithme_ortools(voyages, services, battement_min=5, battement_max=50, ver
         return 0, 0
 
 
+def algorithme_couverture_minimale(voyages, battement_min=5, battement_max=50, verifier_arrets=True):
+    """
+    Nombre minimum de services couvrant tous les voyages
+    (couverture minimale par chemins, couplage Hopcroft-Karp)
+    Ignore les contraintes horaires des services : borne inférieure prouvée
+    """
+    print("\n" + "="*70)
+    print("📐 COUVERTURE MINIMALE (HOPCROFT-KARP)")
+    print("="*70)
+    
+    debut = time.time()
+    graphe = GrapheCompatibilite.depuis_voyages(
+        voyages,
+        battement_min=battement_min,
+        battement_max=battement_max,
+        verifier_arrets=verifier_arrets
+    )
+    chaines = graphe.couverture_minimale()
+    temps = time.time() - debut
+    
+    for num, chaine in enumerate(chaines, 1):
+        noms = " → ".join(f"V{voyages[i].num_voyage}" for i in chaine)
+        print(f"  Service {num} : {noms}")
+    
+    print(f"\n📊 RÉSULTATS COUVERTURE MINIMALE:")
+    print(f"  Services nécessaires (minimum) : {len(chaines)}")
+    print(f"  Enchaînements possibles : {graphe.nb_arcs()}")
+    print(f"  Temps : {temps:.4f}s")
+    print("="*70)
+    
+    return len(chaines), temps
+
+
 def afficher_services(services, titre):
     """Affiche le contenu des services"""
     print(f"\n{titre}")
@@ -227,6 +253,16 @@ def comparaison_complete():
     
     afficher_services(services_ortools, "📋 SERVICES APRÈS OR-TOOLS")
     
+    # Test 3 : Borne inférieure
+    print("\n" + "="*70)
+    print("TEST 3 : COUVERTURE MINIMALE")
+    print("="*70)
+    
+    nb_services_min, temps_couverture = algorithme_couverture_minimale(
+        voyages,
+        battement_min=5, battement_max=50, verifier_arrets=True
+    )
+    
     # Comparaison finale
     print("\n" + "="*70)
     print("🏆 COMPARAISON FINALE")
@@ -238,6 +274,7 @@ def comparaison_complete():
     print(f"{'Taux de réussite':<25} {nb_glouton/len(voyages)*100:.1f}%{'':<14} {nb_ortools/len(voyages)*100:.1f}%")
     print(f"{'Temps de calcul':<25} {temps_glouton:.4f}s{'':<12} {temps_ortools:.4f}s")
     print(f"{'Vitesse relative':<25} {temps_ortools/temps_glouton:.1f}x plus lent{'':<6} 1.0x")
+    print(f"\n📐 Services nécessaires pour tout couvrir (minimum) : {nb_services_min} ({temps_couverture:.4f}s)")
     
     if nb_ortools > nb_glouton:
         amelioration = ((nb_ortools - nb_glouton) / nb_glouton * 100)
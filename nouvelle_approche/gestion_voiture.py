@@ -5,8 +5,17 @@ Optimise l'affectation des voyages aux services d'agents
 
 from ortools.sat.python import cp_model
 from objet import voyage, service_agent
-from typing import List, Tuple, Optional, Dict
+from graphe_compatibilite import GrapheCompatibilite
+from symetries import cle_service, groupes_services_identiques, ordonner_colonnes
+from decomposition import composantes_independantes, resoudre_composantes
+from profils_solveur import configurer_solveur
+from taches_solveur import SuiviComposante
+from audit_modele import rapport_audit
+from typing import List, Tuple, Optional, Dict, TextIO
+import os
 import time
+from bisect import bisect_left
+import numpy as np
 
 
 class SolutionPrinter(cp_model.CpSolverSolutionCallback):
@@ -73,6 +82,20 @@ def verifier_compatibilite_arrets(v1: voyage, v2: voyage) -> bool:
     return arret_fin_v1 == arret_debut_v2
 
 
+def dans_plage_horaire(v: voyage, service: service_agent) -> bool:
+    """
+    True si le voyage respecte la plage horaire éditable du service
+    (heure_debut_max / heure_fin_max, seulement si les deux sont définies)
+    et ses limites propres (heure_debut / heure_fin, coupure : voir
+    service_agent.voyage_dans_limites, sinon ajouter_voyage le refuserait)
+    """
+    h_debut = getattr(service, 'heure_debut_max', None)
+    h_fin = getattr(service, 'heure_fin_max', None)
+    if h_debut is not None and h_fin is not None and not (h_debut <= v.hdebut and v.hfin <= h_fin):
+        return False
+    return service.voyage_dans_limites(v)[0]
+
+
 class OptimisateurServices:
     """
     Classe pour optimiser l'affectation des voyages aux services avec OR-Tools
@@ -84,7 +107,16 @@ class OptimisateurServices:
                  battement_min: int = 5,
                  battement_max: Optional[int] = 50,
                  verifier_arrets: bool = True,
-                 temps_limite: int = 60):
+                 temps_limite: int = 60,
+                 graphe: Optional[GrapheCompatibilite] = None,
+                 mode: str = "paires",
+                 indice_glouton: bool = True,
+                 borne_gloutonne: bool = False,
+                 nb_workers: Optional[int] = None,
+                 profil: str = "auto",
+                 journal: bool = True,
+                 audit: bool = False,
+                 sortie: Optional[TextIO] = None):
         """
         Initialise l'optimisateur
         
@@ -95,143 +127,229 @@ class OptimisateurServices:
             battement_max: Battement maximum en minutes (None = pas de limite)
             verifier_arrets: Si True, vérifie la compatibilité des arrêts
             temps_limite: Temps limite de résolution en secondes
+            graphe: Graphe de compatibilité déjà construit pour ces voyages (optionnel)
+            mode: "paires" (interdictions deux à deux) ou "arcs" (chaque service
+                  est un chemin sur les enchaînements possibles, AddCircuit)
+            indice_glouton: Si True, l'affectation gloutonne sert de point de
+                            départ à la recherche (AddHint)
+            borne_gloutonne: Si True, l'objectif doit au moins égaler le glouton
+            nb_workers: Nombre de threads de recherche CP-SAT (None = nombre de cœurs)
+            profil: Profil de paramètres CP-SAT (voir profils_solveur)
+            journal: Afficher le journal de recherche CP-SAT
+            audit: Afficher l'audit du modèle avant la résolution (variables
+                   sans contrainte, contraintes par type, voir audit_modele)
+            sortie: Flux des messages (None = sys.stdout ; tampon d'un groupe,
+                    voir decomposition.resoudre_composantes)
         """
+        if mode not in ("paires", "arcs"):
+            raise ValueError(f"Mode inconnu : {mode} (attendu 'paires' ou 'arcs')")
+
         self.voyages = voyages
         self.services = services
         self.battement_min = battement_min
         self.battement_max = battement_max
         self.verifier_arrets = verifier_arrets
         self.temps_limite = temps_limite
+        self.graphe = graphe
+        self.mode = mode
+        self.indice_glouton = indice_glouton
+        self.borne_gloutonne = borne_gloutonne
+        self.nb_workers = nb_workers
+        self.profil = profil
+        self.journal = journal
+        self.audit = audit
+        self.sortie = sortie
+        self.affectation_initiale: Optional[Dict[int, int]] = None
         
         self.model = cp_model.CpModel()
         self.solver = cp_model.CpSolver()
         self.variables = {}
         
+    def construire_graphe(self):
+        """Construit (une seule fois) le graphe de compatibilité des voyages"""
+        if self.graphe is None:
+            print("🕸️ Construction du graphe de compatibilité...", file=self.sortie)
+            self.graphe = GrapheCompatibilite.depuis_voyages(
+                self.voyages,
+                battement_min=self.battement_min,
+                battement_max=self.battement_max,
+                verifier_arrets=self.verifier_arrets
+            )
+            print(f"   ✓ {self.graphe.nb_arcs()} enchaînements possibles", file=self.sortie)
+        
+    def calculer_admissibles(self):
+        """
+        Voyages admissibles par service : dans sa plage horaire, ou déjà dans
+        le service (verrouillé). Un voyage verrouillé n'est admissible que
+        dans son ou ses services.
+        """
+        index = {id(v): i for i, v in enumerate(self.voyages)}
+        verrous: Dict[int, List[int]] = {}
+        for j, service in enumerate(self.services):
+            for v in service.voyages:
+                i = index.get(id(v))
+                if i is not None and j not in verrous.get(i, []):
+                    verrous.setdefault(i, []).append(j)
+        
+        self.admissibles: List[List[int]] = [[] for _ in self.services]
+        self.services_admissibles: List[List[int]] = [[] for _ in self.voyages]
+        for i, v in enumerate(self.voyages):
+            if i in verrous:
+                candidats = verrous[i]
+            else:
+                candidats = [j for j, service in enumerate(self.services) if dans_plage_horaire(v, service)]
+            for j in candidats:
+                self.admissibles[j].append(i)
+                self.services_admissibles[i].append(j)
+        
+        self.rapporter_exclusions_horaires(verrous)
+        
+    def rapporter_exclusions_horaires(self, verrous: Dict[int, List[int]]):
+        """
+        Affiche les paires (voyage, service) écartées par calculer_admissibles :
+        les plages horaires ne sont pas des contraintes du modèle, ces paires
+        n'ont simplement pas de variable.
+        """
+        nb_verrouilles = sum(len(self.services) - len(verrous[i]) for i in verrous)
+        nb_horaires = sum(len(self.services) - len(self.services_admissibles[i])
+                          for i in range(len(self.voyages)) if i not in verrous)
+        print(f"   ✓ {nb_horaires} exclusions horaires, {nb_verrouilles} par verrou "
+              f"(paires sans variable)", file=self.sortie)
+        
     def creer_variables(self):
-        """Crée les variables de décision pour le modèle"""
-        print("📊 Création des variables...")
+        """Crée les variables de décision pour le modèle (paires admissibles seulement)"""
+        print("📊 Création des variables...", file=self.sortie)
+        
+        self.calculer_admissibles()
         
-        # Variable x[v][s] = 1 si voyage v est affecté au service s
+        # Variable x[i, j] = 1 si voyage i est affecté au service j ; absente si
+        # le voyage ne peut pas aller dans ce service (plage horaire, verrou)
         self.x = {}
-        for i, v in enumerate(self.voyages):
-            for j, s in enumerate(self.services):
+        for j, indices in enumerate(self.admissibles):
+            for i in indices:
                 self.x[i, j] = self.model.NewBoolVar(f'x_v{i}_s{j}')
         
-        print(f"   ✓ {len(self.voyages)} voyages × {len(self.services)} services")
+        nb_paires = len(self.voyages) * len(self.services)
+        print(f"   ✓ {len(self.x)} affectations possibles sur {nb_paires} "
+              f"({len(self.voyages)} voyages × {len(self.services)} services)", file=self.sortie)
         
     def ajouter_contraintes_base(self):
         """Ajoute les contraintes de base"""
-        print("🔧 Ajout des contraintes de base...")
+        print("🔧 Ajout des contraintes de base...", file=self.sortie)
         
         # Contrainte 1: Chaque voyage est affecté à AU PLUS un service
-        for i in range(len(self.voyages)):
-            self.model.Add(sum(self.x[i, j] for j in range(len(self.services))) <= 1)
+        for i, services_voyage in enumerate(self.services_admissibles):
+            if len(services_voyage) > 1:
+                self.model.AddAtMostOne(self.x[i, j] for j in services_voyage)
         
-        print("   ✓ Un voyage → Un service maximum")
+        print("   ✓ Un voyage → Un service maximum", file=self.sortie)
         
     def ajouter_contraintes_temporelles(self):
         """Ajoute les contraintes de chevauchement temporel"""
-        print("⏰ Ajout des contraintes temporelles...")
+        print("⏰ Ajout des contraintes temporelles...", file=self.sortie)
         
         nb_contraintes = 0
         
-        # Deux voyages du même service ne peuvent pas se chevaucher
-        for i in range(len(self.voyages)):
-            for k in range(i + 1, len(self.voyages)):
-                v1 = self.voyages[i]
-                v2 = self.voyages[k]
-                
-                # Vérifier s'ils se chevauchent
-                if not (v1.hfin <= v2.hdebut or v2.hfin <= v1.hdebut):
-                    # Ils se chevauchent, ils ne peuvent pas être dans le même service
-                    for j in range(len(self.services)):
-                        self.model.Add(self.x[i, j] + self.x[k, j] <= 1)
-                    nb_contraintes += 1
+        # Deux voyages du même service ne peuvent pas se chevaucher :
+        # une contrainte AddAtMostOne par groupe maximal de voyages simultanés
+        for clique in self.graphe.cliques_chevauchement():
+            for j in range(len(self.services)):
+                variables = [self.x[i, j] for i in clique if (i, j) in self.x]
+                if len(variables) > 1:
+                    self.model.AddAtMostOne(variables)
+            nb_contraintes += 1
         
-        print(f"   ✓ {nb_contraintes} paires incompatibles identifiées")
+        print(f"   ✓ {nb_contraintes} groupes de voyages simultanés identifiés", file=self.sortie)
         
     def ajouter_contraintes_battement(self):
         """Ajoute les contraintes de battement entre voyages"""
-        print("🚗 Ajout des contraintes de battement...")
+        print("🚗 Ajout des contraintes de battement...", file=self.sortie)
         
         nb_contraintes = 0
         
-        for i in range(len(self.voyages)):
-            for k in range(len(self.voyages)):
-                if i == k:
-                    continue
-                
-                v1 = self.voyages[i]
-                v2 = self.voyages[k]
-                
-                # Si v1 finit avant v2, vérifier le battement
-                if v1.hfin <= v2.hdebut:
-                    battement = v2.hdebut - v1.hfin
-                    
-                    # Battement trop court ou trop long
-                    if battement < self.battement_min or (self.battement_max and battement > self.battement_max):
-                        for j in range(len(self.services)):
-                            # Si v1 est dans le service j, alors v2 ne peut pas y être
-                            self.model.AddImplication(self.x[i, j], self.x[k, j].Not())
-                        nb_contraintes += 1
-        
-        print(f"   ✓ {nb_contraintes} incompatibilités de battement")
+        # Battement trop court ou trop long
+        for i, k in self.graphe.paires_battement_invalide():
+            for j in range(len(self.services)):
+                # Si v1 est dans le service j, alors v2 ne peut pas y être
+                if (i, j) in self.x and (k, j) in self.x:
+                    self.model.AddImplication(self.x[i, j], self.x[k, j].Not())
+            nb_contraintes += 1
+        
+        print(f"   ✓ {nb_contraintes} incompatibilités de battement", file=self.sortie)
         
     def ajouter_contraintes_arrets(self):
         """Ajoute les contraintes de compatibilité des arrêts"""
         if not self.verifier_arrets:
             return
         
-        print("🚏 Ajout des contraintes d'arrêts...")
+        print("🚏 Ajout des contraintes d'arrêts...", file=self.sortie)
         
         nb_contraintes = 0
         
-        for i in range(len(self.voyages)):
-            for k in range(len(self.voyages)):
-                if i == k:
-                    continue
-                
-                v1 = self.voyages[i]
-                v2 = self.voyages[k]
-                
-                # Si v1 finit avant v2
-                if v1.hfin <= v2.hdebut:
-                    # Vérifier si les arrêts sont incompatibles
-                    if not verifier_compatibilite_arrets(v1, v2):
-                        for j in range(len(self.services)):
-                            self.model.AddImplication(self.x[i, j], self.x[k, j].Not())
-                        nb_contraintes += 1
+        # Battement correct mais arrêts incompatibles (pas d'arc dans le graphe)
+        for i, k in self.graphe.paires_arrets_incompatibles():
+            for j in range(len(self.services)):
+                if (i, j) in self.x and (k, j) in self.x:
+                    self.model.AddImplication(self.x[i, j], self.x[k, j].Not())
+            nb_contraintes += 1
         
-        print(f"   ✓ {nb_contraintes} incompatibilités d'arrêts")
+        print(f"   ✓ {nb_contraintes} incompatibilités d'arrêts", file=self.sortie)
         
-    def ajouter_contraintes_horaires_services(self):
-        """Ajoute les contraintes horaires des services"""
-        print("📅 Ajout des contraintes horaires des services...")
+    def ajouter_contraintes_circuit(self):
+        """
+        Mode "arcs" : chaque service est un chemin dans le graphe des enchaînements.
+
+        Nœud 0 = dépôt, puis un nœud par voyage admissible dans le service.
+        Pour chaque service, un littéral par arc possible (dépôt → voyage,
+        voyage → dépôt, arcs du graphe entre voyages admissibles) et une
+        boucle sur chaque voyage non affecté. Seuls les voyages consécutifs
+        doivent être compatibles : deux voyages incompatibles peuvent partager
+        un service si un voyage valide s'intercale entre eux.
+        """
+        print("🔗 Ajout des contraintes de circuit (arcs)...", file=self.sortie)
         
-        nb_contraintes = 0
+        self.arcs = {}
+        self.vides = {}
+        self.premiers = {}
+        self.derniers = {}
+        nb_arcs = 0
         
-        for j, service in enumerate(self.services):
-            h_debut = getattr(service, 'heure_debut_max', None)
-            h_fin = getattr(service, 'heure_fin_max', None)
+        for j in range(len(self.services)):
+            arcs_circuit = []
             
-            if h_debut is None or h_fin is None:
-                continue
+            # Service vide : boucle sur le dépôt
+            service_vide = self.model.NewBoolVar(f'vide_s{j}')
+            self.vides[j] = service_vide
+            arcs_circuit.append((0, 0, service_vide))
+            self.model.Add(sum(self.x[i, j] for i in self.admissibles[j]) == 0).OnlyEnforceIf(service_vide)
             
-            for i, v in enumerate(self.voyages):
-                # Si le voyage est en dehors des contraintes horaires du service
-                if v.hdebut < h_debut or v.hfin > h_fin:
-                    # Il ne peut pas être affecté à ce service
-                    self.model.Add(self.x[i, j] == 0)
-                    nb_contraintes += 1
-        
-        if nb_contraintes > 0:
-            print(f"   ✓ {nb_contraintes} exclusions horaires")
-        else:
-            print("   ⚠ Aucune contrainte horaire définie")
+            noeuds = {i: pos + 1 for pos, i in enumerate(self.admissibles[j])}
+            for i, n in noeuds.items():
+                # Voyage hors du service : boucle sur son nœud
+                arcs_circuit.append((n, n, self.x[i, j].Not()))
+                
+                premier = self.model.NewBoolVar(f'premier_v{i}_s{j}')
+                dernier = self.model.NewBoolVar(f'dernier_v{i}_s{j}')
+                arcs_circuit.append((0, n, premier))
+                arcs_circuit.append((n, 0, dernier))
+                self.premiers[i, j] = premier
+                self.derniers[i, j] = dernier
+                
+                for k in self.graphe.successeurs[i]:
+                    if k in noeuds:
+                        lit = self.model.NewBoolVar(f'arc_v{i}_v{k}_s{j}')
+                        arcs_circuit.append((n, noeuds[k], lit))
+                        self.arcs[i, k, j] = lit
+                        nb_arcs += 1
             
+            self.model.AddCircuit(arcs_circuit)
+        
+        print(f"   ✓ {nb_arcs} littéraux d'enchaînement ({self.graphe.nb_arcs()} arcs, "
+              f"{len(self.services)} services, voyages admissibles seulement)", file=self.sortie)
+        
     def ajouter_contraintes_voyages_existants(self):
         """Empêche de réaffecter les voyages déjà dans les services"""
-        print("🔒 Verrouillage des voyages existants...")
+        print("🔒 Verrouillage des voyages existants...", file=self.sortie)
         
         nb_verrous = 0
         
@@ -245,23 +363,127 @@ class OptimisateurServices:
                         nb_verrous += 1
                         break
         
-        print(f"   ✓ {nb_verrous} voyages déjà affectés verrouillés")
+        print(f"   ✓ {nb_verrous} voyages déjà affectés verrouillés", file=self.sortie)
+        
+    def ajouter_bris_symetrie(self):
+        """Ordonne les services vides de mêmes paramètres (interchangeables)"""
+        print("🪞 Bris de symétrie entre services identiques...", file=self.sortie)
+        
+        voyages_modele = {id(v) for v in self.voyages}
+        cles = [
+            None if any(id(v) in voyages_modele for v in service.voyages) else cle_service(service)
+            for service in self.services
+        ]
+        
+        nb_contraintes = 0
+        groupes = groupes_services_identiques(cles)
+        for groupe in groupes:
+            colonnes = [[self.x.get((i, j)) for i in range(len(self.voyages))] for j in groupe]
+            indice = None
+            if self.affectation_initiale is not None:
+                # Le glouton respecte l'ordre : indice complet sur les variables d'ordre
+                indice = [[self.affectation_initiale.get(i) == j for i in range(len(self.voyages))]
+                          for j in groupe]
+            nb_contraintes += ordonner_colonnes(self.model, colonnes, self.graphe.ordre,
+                                                f"sym_g{groupe[0]}", indice)
+        
+        print(f"   ✓ {len(groupes)} groupe(s) de services identiques, {nb_contraintes} contraintes d'ordre", file=self.sortie)
         
     def definir_objectif(self):
         """Définit la fonction objectif à maximiser"""
-        print("🎯 Définition de l'objectif...")
+        print("🎯 Définition de l'objectif...", file=self.sortie)
         
         # Objectif: maximiser le nombre de voyages affectés
-        self.model.Maximize(
-            sum(self.x[i, j] for i in range(len(self.voyages)) for j in range(len(self.services)))
-        )
+        self.model.Maximize(sum(self.x.values()))
+        
+        print("   ✓ Maximisation du nombre de voyages affectés", file=self.sortie)
+        
+    def affectation_gloutonne(self) -> Dict[int, int]:
+        """
+        Affectation gloutonne compatible avec le modèle : voyages pris dans
+        l'ordre chronologique, chacun placé dans le premier service qui
+        l'accepte (plage horaire, puis tous les voyages du service reliés par
+        un arc en mode "paires", précédent et suivant en mode "arcs").
         
-        print("   ✓ Maximisation du nombre de voyages affectés")
+        Les services étant essayés dans l'ordre, un service d'un groupe de
+        services identiques n'est ouvert que si les précédents sont occupés :
+        le bris de symétrie est respecté.
         
-    def resoudre(self) -> Tuple[bool, Dict]:
+        Returns:
+            {indice voyage: indice service}
+        """
+        affectation = {}
+        chaines = [[] for _ in self.services]  # indices triés par début
+        debuts = self.graphe.debuts
+        
+        # Voyages verrouillés d'abord
+        index = {id(v): i for i, v in enumerate(self.voyages)}
+        for j, service in enumerate(self.services):
+            for v in service.voyages:
+                i = index.get(id(v))
+                if i is not None and i not in affectation:
+                    affectation[i] = j
+                    chaines[j].insert(bisect_left(chaines[j], debuts[i], key=lambda k: debuts[k]), i)
+        
+        for i in self.graphe.ordre:
+            if i in affectation:
+                continue
+            v = self.voyages[i]
+            
+            for j, service in enumerate(self.services):
+                if not dans_plage_horaire(v, service):
+                    continue
+                
+                chaine = chaines[j]
+                pos = bisect_left(chaine, debuts[i], key=lambda k: debuts[k])
+                if self.mode == "arcs":
+                    compatible = ((pos == 0 or self.graphe.compatible(chaine[pos - 1], i))
+                                  and (pos == len(chaine) or self.graphe.compatible(i, chaine[pos])))
+                else:
+                    compatible = all(self.graphe.compatible(t, i) or self.graphe.compatible(i, t) for t in chaine)
+                
+                if compatible:
+                    affectation[i] = j
+                    chaine.insert(pos, i)
+                    break
+        
+        self.chaines_gloutonnes = chaines
+        return affectation
+        
+    def ajouter_indice_glouton(self):
+        """Part de l'affectation gloutonne (AddHint) et, en option, en fait une borne inférieure"""
+        print("💡 Indice glouton...", file=self.sortie)
+        
+        affectation = self.affectation_gloutonne()
+        self.affectation_initiale = affectation
+        for (i, j), var in self.x.items():
+            self.model.AddHint(var, affectation.get(i) == j)
+        
+        if self.mode == "arcs":
+            # Indice complet : chemin de chaque service dans le circuit
+            for j, chaine in enumerate(self.chaines_gloutonnes):
+                arcs_chemin = set(zip(chaine, chaine[1:]))
+                self.model.AddHint(self.vides[j], not chaine)
+                for i in self.admissibles[j]:
+                    self.model.AddHint(self.premiers[i, j], bool(chaine) and chaine[0] == i)
+                    self.model.AddHint(self.derniers[i, j], bool(chaine) and chaine[-1] == i)
+                for (i, k, jj), lit in self.arcs.items():
+                    if jj == j:
+                        self.model.AddHint(lit, (i, k) in arcs_chemin)
+        
+        if self.borne_gloutonne:
+            self.model.Add(sum(self.x.values()) >= len(affectation))
+        
+        print(f"   ✓ {len(affectation)} voyage(s) affecté(s) par le glouton", file=self.sortie)
+        
+    def resoudre(self, suivi=None) -> Tuple[bool, Dict]:
         """
         Résout le problème d'optimisation
         
+        Args:
+            suivi: SuiviResolution optionnel (taches_solveur) pour publier la
+                   progression et pouvoir interrompre la recherche
+        
         Returns:
             (success, resultats) où resultats contient:
                 - status: Statut de la résolution
@@ -269,34 +491,45 @@ class OptimisateurServices:
                 - nb_affectes: Nombre de voyages affectés
                 - temps: Temps de résolution
         """
-        print("\n" + "="*70)
-        print("🚀 LANCEMENT DE L'OPTIMISATION OR-TOOLS")
-        print("="*70)
+        print("\n" + "="*70, file=self.sortie)
+        print("🚀 LANCEMENT DE L'OPTIMISATION OR-TOOLS", file=self.sortie)
+        print("="*70, file=self.sortie)
         
         debut = time.time()
         
         # Construction du modèle
+        self.construire_graphe()
         self.creer_variables()
         self.ajouter_contraintes_base()
-        self.ajouter_contraintes_temporelles()
-        self.ajouter_contraintes_battement()
-        self.ajouter_contraintes_arrets()
-        self.ajouter_contraintes_horaires_services()
+        if self.mode == "arcs":
+            self.ajouter_contraintes_circuit()
+        else:
+            self.ajouter_contraintes_temporelles()
+            self.ajouter_contraintes_battement()
+            self.ajouter_contraintes_arrets()
         self.ajouter_contraintes_voyages_existants()
         self.definir_objectif()
+        if self.indice_glouton:
+            self.ajouter_indice_glouton()
+        self.ajouter_bris_symetrie()
+        if self.audit:
+            print(rapport_audit(self.model, "Audit OptimisateurServices"), file=self.sortie)
         
         # Configuration du solver
-        self.solver.parameters.max_time_in_seconds = self.temps_limite
-        self.solver.parameters.log_search_progress = True
-        self.solver.parameters.num_search_workers = 4  # Parallélisation
+        reglages = configurer_solveur(self.solver, self.model, self.profil, self.temps_limite,
+                                      nb_workers=self.nb_workers, journal=self.journal)
         
-        print(f"\n⚙️ Paramètres du solver:")
-        print(f"   Temps limite: {self.temps_limite}s")
-        print(f"   Workers: 4")
+        print(f"\n⚙️ Paramètres du solver:", file=self.sortie)
+        print(f"   Mode: {self.mode}", file=self.sortie)
+        print(f"   Temps limite: {self.temps_limite}s", file=self.sortie)
+        print(f"   Réglages: {reglages}", file=self.sortie)
         
         # Résolution
-        print("\n🔍 Résolution en cours...\n")
-        status = self.solver.Solve(self.model)
+        print("\n🔍 Résolution en cours...\n", file=self.sortie)
+        if suivi is not None:
+            status = suivi.resoudre(self.solver, self.model)
+        else:
+            status = self.solver.Solve(self.model)
         
         temps_resolution = time.time() - debut
         
@@ -310,42 +543,58 @@ class OptimisateurServices:
         }
         
         if status in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
-            print("\n✅ SOLUTION TROUVÉE !")
-            print("="*70)
+            print("\n✅ SOLUTION TROUVÉE !", file=self.sortie)
+            print("="*70, file=self.sortie)
             
             # Extraire les affectations
             for j in range(len(self.services)):
                 resultats['affectations'][j] = []
                 
-            for i in range(len(self.voyages)):
-                for j in range(len(self.services)):
-                    if self.solver.Value(self.x[i, j]) == 1:
-                        resultats['affectations'][j].append(i)
-                        resultats['nb_affectes'] += 1
+            for (i, j), var in sorted(self.x.items()):
+                if self.solver.Value(var) == 1:
+                    resultats['affectations'][j].append(i)
+                    resultats['nb_affectes'] += 1
             
             resultats['objectif'] = self.solver.ObjectiveValue()
             
-            print(f"\n📊 STATISTIQUES:")
-            print(f"   Voyages affectés: {resultats['nb_affectes']} / {len(self.voyages)}")
-            print(f"   Objectif: {resultats['objectif']}")
-            print(f"   Temps: {temps_resolution:.2f}s")
-            print(f"   Status: {'OPTIMAL' if status == cp_model.OPTIMAL else 'FEASIBLE'}")
+            print(f"\n📊 STATISTIQUES:", file=self.sortie)
+            print(f"   Voyages affectés: {resultats['nb_affectes']} / {len(self.voyages)}", file=self.sortie)
+            print(f"   Objectif: {resultats['objectif']}", file=self.sortie)
+            print(f"   Temps: {temps_resolution:.2f}s", file=self.sortie)
+            print(f"   Status: {'OPTIMAL' if status == cp_model.OPTIMAL else 'FEASIBLE'}", file=self.sortie)
             
             # Détails par service
-            print(f"\n📋 AFFECTATIONS PAR SERVICE:")
+            print(f"\n📋 AFFECTATIONS PAR SERVICE:", file=self.sortie)
             for j, service in enumerate(self.services):
                 nb = len(resultats['affectations'][j])
-                print(f"   Service {service.num_service}: {nb} voyage(s)")
+                print(f"   Service {service.num_service}: {nb} voyage(s)", file=self.sortie)
             
-            print("="*70)
+            print("="*70, file=self.sortie)
+            return True, resultats
+            
+        elif status == cp_model.UNKNOWN and self.affectation_initiale:
+            # Temps écoulé avant la première solution : le glouton reste valide
+            print("\n⚠️ AUCUNE SOLUTION CP-SAT DANS LE TEMPS LIMITE - solution gloutonne conservée", file=self.sortie)
+            print("="*70, file=self.sortie)
+            
+            for j in range(len(self.services)):
+                resultats['affectations'][j] = []
+            for i, j in sorted(self.affectation_initiale.items()):
+                resultats['affectations'][j].append(i)
+            resultats['nb_affectes'] = len(self.affectation_initiale)
+            resultats['objectif'] = resultats['nb_affectes']
+            
+            print(f"   Voyages affectés: {resultats['nb_affectes']} / {len(self.voyages)}", file=self.sortie)
+            print(f"   Temps: {temps_resolution:.2f}s", file=self.sortie)
+            print("="*70, file=self.sortie)
             return True, resultats
             
         else:
-            print("\n❌ AUCUNE SOLUTION TROUVÉE")
-            print("="*70)
-            print(f"   Status: {self.solver.StatusName(status)}")
-            print(f"   Temps: {temps_resolution:.2f}s")
-            print("="*70)
+            print("\n❌ AUCUNE SOLUTION TROUVÉE", file=self.sortie)
+            print("="*70, file=self.sortie)
+            print(f"   Status: {self.solver.StatusName(status)}", file=self.sortie)
+            print(f"   Temps: {temps_resolution:.2f}s", file=self.sortie)
+            print("="*70, file=self.sortie)
             return False, resultats
     
     def appliquer_solution(self, resultats: Dict):
@@ -355,7 +604,7 @@ class OptimisateurServices:
         Args:
             resultats: Dictionnaire retourné par resoudre()
         """
-        print("\n📝 Application de la solution...")
+        print("\n📝 Application de la solution...", file=self.sortie)
         
         for j, service in enumerate(self.services):
             voyages_a_ajouter = []
@@ -368,7 +617,437 @@ class OptimisateurServices:
             
             # Ajouter les nouveaux voyages
             for v in voyages_a_ajouter:
-                service.ajout_voyages(v)
+                service.ajouter_voyage(v)
+                print(f"   ✓ V{v.num_voyage} → Service {service.num_service}", file=self.sortie)
+
+
+
+class SessionOptimisation:
+    """
+    Session de résolution incrémentale pour l'édition interactive d'un planning.
+    
+    Construite une fois pour tous les voyages de la journée et tous les
+    services, elle garde en mémoire le graphe de compatibilité, les voyages
+    verrouillés dans chaque service, les voyages admissibles par service et
+    la dernière solution. Les modifications de l'utilisateur sont appliquées
+    comme des deltas (verrouiller, liberer, modifier_limites) qui n'invalident
+    que le service concerné.
+    
+    À chaque résolution, seul un petit modèle CP-SAT est posé : les voyages
+    libres, sur les services où ils sont admissibles. Les voyages verrouillés
+    n'y figurent que comme constantes (filtre d'admissibilité en mode
+    "paires", nœuds imposés du circuit en mode "arcs"), et la solution
+    précédente sert d'indice (AddHint).
+    
+    Un changement de voyages, de services ou de paramètres de battement
+    impose une nouvelle session : voir est_valide().
+    """
+    
+    def __init__(self,
+                 voyages: List[voyage],
+                 services: List[service_agent],
+                 battement_min: int = 5,
+                 battement_max: Optional[int] = 50,
+                 verifier_arrets: bool = True,
+                 mode: str = "paires"):
+        """
+        Args:
+            voyages: Tous les voyages de la journée (affectés ou non)
+            services: Liste des services
+            battement_min: Battement minimum en minutes
+            battement_max: Battement maximum (None = pas de limite)
+            verifier_arrets: Vérifier la compatibilité des arrêts
+            mode: "paires" ou "arcs" (voir OptimisateurServices)
+        """
+        if mode not in ("paires", "arcs"):
+            raise ValueError(f"Mode inconnu : {mode} (attendu 'paires' ou 'arcs')")
+        
+        self.voyages = list(voyages)
+        self.services = list(services)
+        self.mode = mode
+        self.parametres = (battement_min, battement_max, verifier_arrets, mode)
+        
+        self.graphe = GrapheCompatibilite.depuis_voyages(
+            self.voyages,
+            battement_min=battement_min,
+            battement_max=battement_max,
+            verifier_arrets=verifier_arrets
+        )
+        
+        self.index_voyages = {id(v): i for i, v in enumerate(self.voyages)}
+        self.index_services = {id(s): j for j, s in enumerate(self.services)}
+        
+        # État : voyage verrouillé → service, service → voyages verrouillés (triés par début)
+        self.verrous: Dict[int, int] = {}
+        self.verrous_service: List[List[int]] = [[] for _ in self.services]
+        self.derniere_solution: Dict[int, int] = {}
+        
+        # Voyages admissibles par service (None = à recalculer après un delta)
+        self._admissibles: List[Optional[List[int]]] = [None] * len(self.services)
+        self._incompatibles = None
+        
+        for service in self.services:
+            for v in service.voyages:
+                self.verrouiller(v, service)
+    
+    def est_valide(self, voyages: List[voyage], services: List[service_agent],
+                   battement_min: int, battement_max: Optional[int],
+                   verifier_arrets: bool, mode: str = "paires") -> bool:
+        """True si la session correspond encore à ces voyages, services et paramètres"""
+        return (
+            self.parametres == (battement_min, battement_max, verifier_arrets, mode)
+            and len(voyages) == len(self.voyages)
+            and len(services) == len(self.services)
+            and all(a is b for a, b in zip(voyages, self.voyages))
+            and all(a is b for a, b in zip(services, self.services))
+        )
+    
+    # ---------- Deltas ----------
+    
+    def verrouiller(self, v: voyage, service: service_agent) -> bool:
+        """Le voyage v est fixé dans ce service (ajout manuel ou solution appliquée)"""
+        i = self.index_voyages.get(id(v))
+        j = self.index_services.get(id(service))
+        if i is None or j is None:
+            return False
+        
+        self.liberer(v)
+        self.verrous[i] = j
+        verrous = self.verrous_service[j]
+        verrous.insert(bisect_left(verrous, self.graphe.debuts[i], key=lambda k: self.graphe.debuts[k]), i)
+        self._admissibles[j] = None
+        return True
+    
+    def liberer(self, v: voyage) -> bool:
+        """Le voyage v est retiré de son service et redevient affectable"""
+        i = self.index_voyages.get(id(v))
+        if i is None or i not in self.verrous:
+            return False
+        
+        j = self.verrous.pop(i)
+        self.verrous_service[j].remove(i)
+        self._admissibles[j] = None
+        return True
+    
+    def modifier_limites(self, service: service_agent) -> bool:
+        """Les contraintes horaires du service ont changé"""
+        j = self.index_services.get(id(service))
+        if j is None:
+            return False
+        self._admissibles[j] = None
+        return True
+    
+    # ---------- Admissibilité ----------
+    
+    def _dans_plage(self, service: service_agent, i: int) -> bool:
+        """Plage horaire éditable et limites propres du service (voir dans_plage_horaire)"""
+        return dans_plage_horaire(self.voyages[i], service)
+    
+    def _dans_un_creneau(self, i: int, verrous: List[int]) -> bool:
+        """
+        True si le voyage i tient entre deux voyages verrouillés consécutifs
+        (triés par début), battement minimum compris de chaque côté
+        """
+        debuts, fins = self.graphe.debuts, self.graphe.fins
+        marge = self.graphe.battement_min
+        pos = bisect_left(verrous, debuts[i], key=lambda k: debuts[k])
+        if pos > 0 and debuts[i] < fins[verrous[pos - 1]] + marge:
+            return False
+        return pos == len(verrous) or fins[i] + marge <= debuts[verrous[pos]]
+    
+    def _calculer_admissibles(self, j: int) -> List[int]:
+        """Voyages qui peuvent rejoindre le service j compte tenu de ses verrous"""
+        service = self.services[j]
+        verrous = self.verrous_service[j]
+        
+        if self.mode == "paires" and verrous:
+            # Deux voyages d'un même service doivent être reliés par un arc :
+            # les candidats sont les voisins du premier voyage verrouillé
+            t0 = verrous[0]
+            candidats = set(self.graphe.successeurs[t0]) | set(self.graphe.predecesseurs[t0])
+            return sorted(
+                i for i in candidats
+                if self._dans_plage(service, i)
+                and all(self.graphe.compatible(t, i) or self.graphe.compatible(i, t) for t in verrous)
+            )
+        
+        return [
+            i for i in self.graphe.ordre
+            if self._dans_plage(service, i) and (not verrous or self._dans_un_creneau(i, verrous))
+        ]
+    
+    def admissibles(self, j: int) -> List[int]:
+        """Voyages libres admissibles pour le service j (recalculés seulement après un delta)"""
+        if self._admissibles[j] is None:
+            self._admissibles[j] = self._calculer_admissibles(j)
+        return [i for i in self._admissibles[j] if i not in self.verrous]
+    
+    def matrice_incompatibles(self):
+        """Incompatibilités entre voyages (matrice NumPy du graphe, calculée une fois par session)"""
+        if self._incompatibles is None:
+            self._incompatibles = self.graphe.matrice_incompatibles()
+        return self._incompatibles
+    
+    def ruptures(self, j: int) -> List[Tuple[int, int]]:
+        """
+        Mode "arcs" : voyages verrouillés consécutifs du service j sans arc
+        direct dans le graphe. Un arc "manuel" les relie toujours dans le
+        circuit : un chemin par des voyages libres peut rester impossible
+        (voyages libres déjà pris par un autre service), le circuit ne doit
+        pas devenir infaisable pour autant.
+        """
+        verrous = self.verrous_service[j]
+        return [(a, b) for a, b in zip(verrous, verrous[1:]) if not self.graphe.compatible(a, b)]
+    
+    def affectation_gloutonne(self) -> Dict[int, int]:
+        """
+        Affectation gloutonne des voyages libres, comme
+        OptimisateurServices.affectation_gloutonne mais autour des voyages
+        verrouillés : point de départ (AddHint) de la première résolution.
+        
+        Returns:
+            {indice voyage: indice service} (voyages verrouillés compris)
+        """
+        debuts = self.graphe.debuts
+        chaines = [list(verrous) for verrous in self.verrous_service]
+        admissibles = [set(self.admissibles(j)) for j in range(len(self.services))]
+        affectation = dict(self.verrous)
+        
+        for i in self.graphe.ordre:
+            if i in affectation:
+                continue
+            for j, chaine in enumerate(chaines):
+                if i not in admissibles[j]:
+                    continue
+                pos = bisect_left(chaine, debuts[i], key=lambda k: debuts[k])
+                if self.mode == "arcs":
+                    compatible = ((pos == 0 or self.graphe.compatible(chaine[pos - 1], i))
+                                  and (pos == len(chaine) or self.graphe.compatible(i, chaine[pos])))
+                else:
+                    compatible = all(self.graphe.compatible(t, i) or self.graphe.compatible(i, t) for t in chaine)
+                if compatible:
+                    affectation[i] = j
+                    chaine.insert(pos, i)
+                    break
+        
+        return affectation
+    
+    # ---------- Résolution ----------
+    
+    def _construire_modele(self, services: List[int], indice: Dict[int, int]):
+        """
+        Modèle réduit aux voyages libres et à ces services (où ils sont admissibles)
+        
+        Returns:
+            (model, x, manuels) ; manuels = {(verrou, verrou, service): littéral de
+            l'arc manuel}, voir ruptures()
+        """
+        model = cp_model.CpModel()
+        x = {}
+        candidats = {}
+        manuels = {}
+        
+        for j in services:
+            candidats[j] = self.admissibles(j)
+            for i in candidats[j]:
+                x[i, j] = model.NewBoolVar(f'x_v{i}_s{j}')
+        
+        # Un voyage → un service maximum
+        par_voyage = {}
+        for (i, j), var in x.items():
+            par_voyage.setdefault(i, []).append(var)
+        for variables in par_voyage.values():
+            if len(variables) > 1:
+                model.AddAtMostOne(variables)
+        
+        for j, libres in candidats.items():
+            if self.mode == "paires":
+                if len(libres) < 2:
+                    continue
+                # Deux voyages libres du même service doivent être reliés par un arc :
+                # paires lues dans la matrice des incompatibilités (sous-matrice des libres)
+                indices = np.asarray(libres)
+                lignes, colonnes = np.triu(self.matrice_incompatibles()[np.ix_(indices, indices)], 1).nonzero()
+                exclus = {}
+                for a_pos, b_pos in zip(lignes.tolist(), colonnes.tolist()):
+                    exclus.setdefault(libres[a_pos], []).append(x[libres[b_pos], j])
+                for a, variables in exclus.items():
+                    model.Add(sum(variables) == 0).OnlyEnforceIf(x[a, j])
+            else:
+                manuels.update(self._ajouter_circuit(model, x, j, libres, indice))
+        
+        model.Maximize(sum(x.values()))
+        
+        # Indice : dernière solution (ou affectation gloutonne)
+        for (i, j), var in x.items():
+            model.AddHint(var, indice.get(i) == j)
+        
+        return model, x, manuels
+    
+    def _ajouter_circuit(self, model, x, j: int, libres: List[int],
+                         indice: Dict[int, int]) -> Dict[Tuple[int, int, int], cp_model.IntVar]:
+        """
+        Mode "arcs" : chemin dépôt → voyages du service → dépôt, voyages
+        verrouillés imposés. Les arcs de l'indice servent de point de départ ;
+        les ruptures (verrous consécutifs sans arc direct) ont un arc manuel.
+        
+        Returns:
+            {(verrou, verrou, j): littéral de l'arc manuel}
+        """
+        verrous = self.verrous_service[j]
+        noeuds = {i: pos + 1 for pos, i in enumerate(verrous + libres)}
+        
+        # Chemin de l'indice restreint aux nœuds du modèle
+        chemin = sorted(
+            (i for i in noeuds if i in self.verrous or indice.get(i) == j),
+            key=lambda i: self.graphe.debuts[i]
+        )
+        arcs_indices = set(zip([None] + chemin, chemin + [None]))
+        
+        def litteral(nom, depuis, vers):
+            lit = model.NewBoolVar(nom)
+            model.AddHint(lit, (depuis, vers) in arcs_indices)
+            return lit
+        
+        arcs_circuit = []
+        if not verrous:
+            arcs_circuit.append((0, 0, litteral(f'vide_s{j}', None, None)))
+        for i in libres:
+            arcs_circuit.append((noeuds[i], noeuds[i], x[i, j].Not()))
+        
+        for i, n in noeuds.items():
+            arcs_circuit.append((0, n, litteral(f'premier_v{i}_s{j}', None, i)))
+            arcs_circuit.append((n, 0, litteral(f'dernier_v{i}_s{j}', i, None)))
+            for k in self.graphe.successeurs[i]:
+                if k in noeuds:
+                    arcs_circuit.append((n, noeuds[k], litteral(f'arc_v{i}_v{k}_s{j}', i, k)))
+        
+        manuels = {}
+        for a, b in self.ruptures(j):
+            manuels[a, b, j] = litteral(f'manuel_v{a}_v{b}_s{j}', a, b)
+            arcs_circuit.append((noeuds[a], noeuds[b], manuels[a, b, j]))
+        
+        model.AddCircuit(arcs_circuit)
+        return manuels
+    
+    def composantes(self) -> List[Tuple[List[int], List[int]]]:
+        """Groupes indépendants de voyages libres et de services (voir decomposition)"""
+        admissibles = [set(self.admissibles(j)) for j in range(len(self.services))]
+        return [
+            (indices_voyages, indices_services)
+            for indices_voyages, indices_services in composantes_independantes(
+                len(self.voyages), len(self.services), lambda i, j: i in admissibles[j]
+            )
+            if indices_services
+        ]
+    
+    def resoudre(self, temps_limite: int = 60, suivi=None, profil: str = "auto",
+                 decomposer: bool = True) -> Tuple[bool, Dict]:
+        """
+        Affecte au mieux les voyages libres en gardant les voyages verrouillés
+        (suivi, profil : voir OptimisateurServices)
+        
+        La première résolution part de l'affectation gloutonne, les suivantes
+        de la dernière solution. Avec decomposer, les groupes indépendants de
+        voyages et de services sont résolus séparément, en parallèle.
+        
+        Returns:
+            (success, resultats) comme OptimisateurServices.resoudre ; les
+            affectations ne contiennent que les nouveaux voyages, indices dans
+            self.voyages ; resultats['ruptures'] liste, par service, les
+            voyages verrouillés consécutifs que la solution relie par l'arc
+            manuel, hors du graphe (mode "arcs")
+        """
+        debut = time.time()
+        
+        indice = self.derniere_solution or self.affectation_gloutonne()
+        composantes = self.composantes() if decomposer else []
+        if len(composantes) <= 1:
+            groupes = [list(range(len(self.services)))]
+        else:
+            groupes = [indices_services for _, indices_services in composantes]
+        
+        # Même répartition du temps et des threads que optimiser_affectation
+        nb_paralleles = min(len(groupes), os.cpu_count() or 1)
+        nb_workers = max(1, (os.cpu_count() or 4) // nb_paralleles) if len(groupes) > 1 else None
+        temps_groupe = max(1, temps_limite * nb_paralleles // len(groupes))
+        
+        modeles = [self._construire_modele(services, indice) for services in groupes]
+        objectifs = [0.0] * len(modeles)
+        bornes = [float(len({i for i, _ in x})) for _, x, _ in modeles]  # voyages libres du groupe
+        
+        def resoudre_groupe(k, sortie):
+            model, x, manuels = modeles[k]
+            solver = cp_model.CpSolver()
+            configurer_solveur(solver, model, profil, temps_groupe, nb_workers=nb_workers)
+            if profil == "auto":
+                solver.parameters.cp_model_probing_level = 0  # Le probing coûte plus que la recherche sur un modèle réduit
+            if suivi is None:
+                status = solver.Solve(model)
+            elif len(modeles) == 1:
+                status = suivi.resoudre(solver, model)
+            else:
+                status = SuiviComposante(suivi, objectifs, bornes, k).resoudre(solver, model)
+            if status not in [cp_model.OPTIMAL, cp_model.FEASIBLE]:
+                return status, None, 0, []
+            return (status, [(i, j) for (i, j), var in x.items() if solver.Value(var)],
+                    solver.ObjectiveValue(), [cle for cle, lit in manuels.items() if solver.Value(lit)])
+        
+        nb_variables = sum(len(x) for _, x, _ in modeles)
+        print(f"\n🔁 Re-résolution incrémentale : {len(self.verrous)} voyages verrouillés, "
+              f"{nb_variables} affectations possibles"
+              + (f", {len(modeles)} groupes indépendants" if len(modeles) > 1 else ""))
+        
+        sous_resultats = resoudre_composantes(list(range(len(modeles))), resoudre_groupe,
+                                              max_workers=nb_paralleles)
+        
+        resultats = {
+            'status': cp_model.OPTIMAL,
+            'affectations': {j: [] for j in range(len(self.services))},
+            'nb_affectes': 0,
+            'temps': time.time() - debut,
+            'objectif': 0,
+            'ruptures': {}
+        }
+        
+        statuts = [status for status, _, _, _ in sous_resultats]
+        success = any(affectations is not None for _, affectations, _, _ in sous_resultats)
+        if any(status != cp_model.OPTIMAL for status in statuts):
+            resultats['status'] = cp_model.FEASIBLE if success else statuts[0]
+        
+        if not success:
+            print(f"   ❌ {cp_model.CpSolver().StatusName(resultats['status'])} ({resultats['temps']:.2f}s)")
+            return False, resultats
+        
+        for _, affectations, objectif, manuels in sous_resultats:
+            if affectations is None:
+                continue
+            for i, j in affectations:
+                resultats['affectations'][j].append(i)
+                resultats['nb_affectes'] += 1
+            resultats['objectif'] += objectif
+            for a, b, j in manuels:
+                resultats['ruptures'].setdefault(j, []).append((a, b))
+                print(f"   ⚠️ Service {self.services[j].num_service} : V{self.voyages[a].num_voyage} → "
+                      f"V{self.voyages[b].num_voyage} verrouillés sans enchaînement, conservés tels quels")
+        
+        self.derniere_solution = dict(self.verrous)
+        for j, indices in resultats['affectations'].items():
+            for i in indices:
+                self.derniere_solution[i] = j
+        
+        print(f"   ✓ {resultats['nb_affectes']} voyage(s) ajouté(s) en {resultats['temps']:.2f}s "
+              f"({cp_model.CpSolver().StatusName(resultats['status'])})")
+        return True, resultats
+    
+    def appliquer_solution(self, resultats: Dict):
+        """Ajoute les nouveaux voyages aux services et les verrouille"""
+        for j, indices in resultats['affectations'].items():
+            service = self.services[j]
+            for i in indices:
+                v = self.voyages[i]
+                service.ajouter_voyage(v)
+                self.verrouiller(v, service)
                 print(f"   ✓ V{v.num_voyage} → Service {service.num_service}")
 
 
@@ -377,7 +1056,12 @@ def optimiser_affectation(voyages: List[voyage],
                          battement_min: int = 5,
                          battement_max: Optional[int] = 50,
                          verifier_arrets: bool = True,
-                         temps_limite: int = 60) -> Tuple[bool, Dict]:
+                         temps_limite: int = 60,
+                         mode: str = "paires",
+                         indice_glouton: bool = True,
+                         borne_gloutonne: bool = False,
+                         decomposer: bool = True,
+                         profil: str = "auto") -> Tuple[bool, Dict]:
     """
     Fonction principale d'optimisation (interface simplifiée)
     
@@ -388,24 +1072,104 @@ def optimiser_affectation(voyages: List[voyage],
         battement_max: Battement maximum (None = pas de limite)
         verifier_arrets: Vérifier la compatibilité des arrêts
         temps_limite: Temps limite en secondes
+        mode: "paires" ou "arcs" (voir OptimisateurServices)
+        indice_glouton: Démarrer la recherche depuis l'affectation gloutonne
+        borne_gloutonne: Imposer au moins autant de voyages que le glouton
+        decomposer: Résoudre séparément (et en parallèle) les groupes de
+                    voyages et de services indépendants (plages horaires)
+        profil: Profil de paramètres CP-SAT (voir profils_solveur)
     
     Returns:
         (success, resultats)
     """
-    optimiseur = OptimisateurServices(
-        voyages=voyages,
-        services=services,
+    parametres = dict(
         battement_min=battement_min,
         battement_max=battement_max,
         verifier_arrets=verifier_arrets,
-        temps_limite=temps_limite
+        temps_limite=temps_limite,
+        mode=mode,
+        indice_glouton=indice_glouton,
+        borne_gloutonne=borne_gloutonne,
+        profil=profil
     )
     
-    success, resultats = optimiseur.resoudre()
+    composantes = []
+    if decomposer:
+        # Même admissibilité que calculer_admissibles : un voyage déjà placé
+        # reste lié à son service même hors de sa plage horaire, sinon il
+        # tomberait dans un autre groupe et serait réaffecté
+        index = {id(v): i for i, v in enumerate(voyages)}
+        verrous = {(index[id(v)], j) for j, service in enumerate(services)
+                   for v in service.voyages if id(v) in index}
+        voyages_verrouilles = {i for i, _ in verrous}
+        composantes = [
+            (indices_voyages, indices_services)
+            for indices_voyages, indices_services in composantes_independantes(
+                len(voyages), len(services),
+                lambda i, j: (i, j) in verrous if i in voyages_verrouilles
+                else dans_plage_horaire(voyages[i], services[j])
+            )
+            if indices_services
+        ]
     
-    if success:
-        optimiseur.appliquer_solution(resultats)
+    if len(composantes) <= 1:
+        optimiseur = OptimisateurServices(voyages=voyages, services=services, **parametres)
+        success, resultats = optimiseur.resoudre()
+        if success:
+            optimiseur.appliquer_solution(resultats)
+        return success, resultats
+    
+    # Les threads de recherche sont répartis entre les groupes résolus en même temps
+    nb_paralleles = min(len(composantes), os.cpu_count() or 1)
+    nb_workers = max(1, (os.cpu_count() or 4) // nb_paralleles)
+    # Groupes résolus par vagues : le temps limite global est partagé
+    parametres['temps_limite'] = max(1, temps_limite * nb_paralleles // len(composantes))
+    print(f"\n🧩 Décomposition : {len(composantes)} groupes indépendants de voyages et de services "
+          f"({nb_paralleles} en parallèle, {nb_workers} worker(s) chacun)")
+    debut = time.time()
+    
+    def resoudre_composante(composante, sortie):
+        indices_voyages, indices_services = composante
+        optimiseur = OptimisateurServices(
+            voyages=[voyages[i] for i in indices_voyages],
+            services=[services[j] for j in indices_services],
+            nb_workers=nb_workers,
+            journal=False,  # journal CP-SAT écrit hors de sys.stdout : illisible en parallèle
+            sortie=sortie,
+            **parametres
+        )
+        return optimiseur, optimiseur.resoudre()
+    
+    sous_resultats = resoudre_composantes(composantes, resoudre_composante, max_workers=nb_paralleles)
+    
+    # Fusion : indices locaux → indices globaux
+    resultats = {
+        'status': cp_model.OPTIMAL,
+        'affectations': {j: [] for j in range(len(services))},
+        'nb_affectes': 0,
+        'temps': 0,
+        'objectif': 0,
+        'composantes': len(composantes)
+    }
+    statuts = [sous['status'] for _, (_, sous) in sous_resultats]
+    success = any(ok for _, (ok, _) in sous_resultats)
+    if any(statut != cp_model.OPTIMAL for statut in statuts):
+        resultats['status'] = cp_model.FEASIBLE if success else statuts[0]
+    
+    for (indices_voyages, indices_services), (optimiseur, (ok, sous)) in zip(composantes, sous_resultats):
+        if not ok:
+            continue
+        
+        optimiseur.appliquer_solution(sous)
+        for j_local, indices in sous['affectations'].items():
+            resultats['affectations'][indices_services[j_local]].extend(indices_voyages[i] for i in indices)
+        resultats['nb_affectes'] += sous['nb_affectes']
+        resultats['objectif'] += sous['objectif']
+    
+    resultats['temps'] = time.time() - debut
     
+    print(f"\n🧩 {resultats['nb_affectes']} voyage(s) affecté(s) sur {len(composantes)} groupes "
+          f"en {resultats['temps']:.2f}s")
     return success, resultats
 
 
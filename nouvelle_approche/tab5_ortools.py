@@ -10,7 +10,9 @@ import customtkinter as ctk
 from tkinter import ttk, messagebox as msgbox, Canvas, filedialog
 from tabelauCSV import window_tableau_csv
 from objet import voyage, service_agent
-from gestion_voiture import optimiser_affectation  # ✅ NOUVEAU : Import du vrai solveur
+from gestion_voiture import SessionOptimisation  # ✅ Solveur OR-Tools incrémental
+from taches_solveur import TacheSolveur, suivre_dans_tk
+from profils_solveur import NOMS_PROFILS
 import csv
 
 
@@ -265,6 +267,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
         self.service_selectionne = None
         self.compteur_services = 0
         self.voyages_assignes = {}
+        self.session = None  # Session OR-Tools gardée entre deux optimisations (re-résolution incrémentale)
+        self.tache_ortools = None  # Optimisation en arrière-plan (planning en lecture seule pendant ce temps)
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=0)
@@ -428,10 +432,24 @@ class Tab5CreationManuelle(ctk.CTkFrame):
         )
         btn_valider.pack(fill="x", pady=5)
 
+    def _optimisation_en_cours(self):
+        """True (avec un avertissement) si une optimisation tourne en arrière-plan"""
+        if self.tache_ortools is not None:
+            msgbox.showwarning(
+                "Optimisation en cours",
+                "Attendez la fin de l'optimisation (ou annulez-la) avant de modifier le planning"
+            )
+            return True
+        return False
+
     def charger_voyages_csv(self):
+        if self._optimisation_en_cours():
+            return
+
         def callback_chargement(objets_voyages, matrice_donnees):
             self.voyages_disponibles = objets_voyages
             self.voyages_assignes.clear()
+            self.session = None
             self.remplir_liste_voyages()
             msgbox.showinfo("Succès", f"{len(objets_voyages)} voyage(s) chargé(s)")
 
@@ -490,6 +508,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
 
     def creer_nouveau_service(self):
         """Crée un service avec contraintes horaires"""
+        if self._optimisation_en_cours():
+            return
         dialog = ctk.CTkToplevel(self)
         dialog.title("Nouveau Service")
         dialog.geometry("450x500")
@@ -573,6 +593,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
 
     def ajouter_voyages_au_service(self):
         """Ajoute les voyages sélectionnés au service actif"""
+        if self._optimisation_en_cours():
+            return
         if not self.service_selectionne:
             msgbox.showwarning("Attention", "Veuillez sélectionner un service d'abord")
             return
@@ -617,8 +639,10 @@ class Tab5CreationManuelle(ctk.CTkFrame):
             return
 
         for v in voyages_a_ajouter:
-            self.service_selectionne.ajout_voyages(v)
+            self.service_selectionne.ajouter_voyage(v)
             self.voyages_assignes[id(v)] = self.service_selectionne
+            if self.session:
+                self.session.verrouiller(v, self.service_selectionne)
 
         for item in items_a_desactiver:
             values = list(self.tree_voyages.item(item, 'values'))
@@ -640,6 +664,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
 
     def supprimer_service(self, service):
         """Supprime un service et libère ses voyages"""
+        if self._optimisation_en_cours():
+            return
         if msgbox.askyesno("Confirmation", f"Supprimer le service {service.num_service} ?"):
             for v in service.voyages:
                 voyage_id = id(v)
@@ -658,6 +684,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
 
     def supprimer_voyage_du_service(self, voyage_obj):
         """Supprime un voyage du service sélectionné"""
+        if self._optimisation_en_cours():
+            return
         if not self.service_selectionne:
             return
 
@@ -666,6 +694,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
             f"Retirer le voyage {voyage_obj.num_voyage} du service {self.service_selectionne.num_service} ?"
         ):
             self.service_selectionne.voyages.remove(voyage_obj)
+            if self.session:
+                self.session.liberer(voyage_obj)
 
             voyage_id = id(voyage_obj)
             if voyage_id in self.voyages_assignes:
@@ -742,6 +772,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
         entry_fin.pack(side="left", padx=5)
 
         def sauvegarder_contraintes():
+            if self._optimisation_en_cours():
+                return
             try:
                 if entry_debut.get():
                     parts = entry_debut.get().replace('h', ':').split(':')
@@ -755,6 +787,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
                 else:
                     service.heure_fin_max = None
 
+                if self.session:
+                    self.session.modifier_limites(service)
                 self.rafraichir_services()
                 msgbox.showinfo("✅", "Contraintes mises à jour")
             except:
@@ -855,6 +889,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
         ).pack(pady=10)
 
         def valider():
+            if self._optimisation_en_cours():
+                return
             try:
                 if entry_debut.get():
                     parts = entry_debut.get().replace('h', ':').split(':')
@@ -868,6 +904,8 @@ class Tab5CreationManuelle(ctk.CTkFrame):
                 else:
                     service.heure_fin_max = None
 
+                if self.session:
+                    self.session.modifier_limites(service)
                 self.rafraichir_services()
                 dialog.destroy()
                 msgbox.showinfo("Succès", "Contraintes mises à jour")
@@ -883,6 +921,9 @@ class Tab5CreationManuelle(ctk.CTkFrame):
     def completer_avec_ortools(self):
         """✅ NOUVEAU : Utilise le vrai solveur OR-Tools"""
 
+        if self._optimisation_en_cours():
+            return
+
         if not self.services:
             msgbox.showwarning("Attention", "Créez d'abord au moins un service")
             return
@@ -900,7 +941,7 @@ class Tab5CreationManuelle(ctk.CTkFrame):
         # Dialogue de configuration
         dialog = ctk.CTkToplevel(self)
         dialog.title("Optimisation OR-Tools")
-        dialog.geometry("600x600")
+        dialog.geometry("600x680")
         dialog.transient(self)
         dialog.grab_set()
 
@@ -951,6 +992,18 @@ class Tab5CreationManuelle(ctk.CTkFrame):
         entry_temps.insert(0, "60")
         entry_temps.pack(pady=5)
 
+        # Profil du solveur
+        ctk.CTkLabel(frame_config, text="⚙️ Profil du solveur :", font=("Arial", 11)).pack(pady=5)
+        combo_profil = ctk.CTkComboBox(frame_config, values=NOMS_PROFILS, width=200, height=35)
+        combo_profil.set("auto")
+        combo_profil.pack(pady=5)
+
+        # Mode du modèle : chaînes d'enchaînements (arcs) ou interdictions deux à deux
+        ctk.CTkLabel(frame_config, text="🔗 Mode du modèle :", font=("Arial", 11)).pack(pady=5)
+        combo_mode = ctk.CTkComboBox(frame_config, values=["arcs", "paires"], width=200, height=35)
+        combo_mode.set("arcs")
+        combo_mode.pack(pady=5)
+
         def lancer():
             try:
                 battement_min = int(entry_battement_min.get())
@@ -958,9 +1011,12 @@ class Tab5CreationManuelle(ctk.CTkFrame):
                 battement_max = int(battement_max_str) if battement_max_str else None
                 verifier = check_arrets.get() == 1
                 temps_limite = int(entry_temps.get())
+                profil = combo_profil.get()
+                mode = combo_mode.get()
                 
                 dialog.destroy()
-                self._executer_ortools(voyages_non_assignes, battement_min, battement_max, verifier, temps_limite)
+                self._executer_ortools(voyages_non_assignes, battement_min, battement_max, verifier,
+                                       temps_limite, profil, mode)
             except ValueError:
                 msgbox.showerror("Erreur", "Valeurs invalides pour les paramètres")
 
@@ -971,64 +1027,135 @@ class Tab5CreationManuelle(ctk.CTkFrame):
             font=("Arial", 14, "bold")
         ).pack(pady=20)
 
-    def _executer_ortools(self, voyages_non_assignes, battement_min, battement_max, verifier_arrets, temps_limite):
-        """✅ NOUVEAU : Exécute l'optimisation OR-Tools"""
-        
-        try:
-            # Importer et lancer l'optimisation
-            success, resultats = optimiser_affectation(
-                voyages=voyages_non_assignes,
+    def _session_pour(self, battement_min, battement_max, verifier_arrets, mode="arcs"):
+        """
+        Réutilise la session OR-Tools si voyages, services, battements et mode
+        n'ont pas changé (première résolution : indice glouton, décomposition
+        en groupes indépendants, voir SessionOptimisation.resoudre)
+        """
+        if self.session is None or not self.session.est_valide(
+            self.voyages_disponibles, self.services, battement_min, battement_max, verifier_arrets, mode
+        ):
+            self.session = SessionOptimisation(
+                voyages=self.voyages_disponibles,
                 services=self.services,
                 battement_min=battement_min,
                 battement_max=battement_max,
                 verifier_arrets=verifier_arrets,
-                temps_limite=temps_limite
+                mode=mode
             )
-            
-            if success:
-                # Mettre à jour le tracking des voyages assignés
-                for j, service in enumerate(self.services):
-                    for i in resultats['affectations'][j]:
-                        v = voyages_non_assignes[i]
-                        self.voyages_assignes[id(v)] = service
-                
-                # Rafraîchir l'interface
-                self.remplir_liste_voyages()
-                self.rafraichir_services()
-                if self.service_selectionne:
-                    self.afficher_details_service(self.service_selectionne)
-                
-                # Message de succès
-                nb_affectes = resultats['nb_affectes']
-                nb_restants = len(voyages_non_assignes) - nb_affectes
-                temps = resultats['temps']
-                
-                if nb_restants > 0:
-                    msg = f"✅ Optimisation terminée !\n\n"
-                    msg += f"📊 {nb_affectes} voyage(s) affecté(s)\n"
-                    msg += f"⚠️ {nb_restants} voyage(s) non assignable(s)\n"
-                    msg += f"⏱️ Temps: {temps:.2f}s"
-                else:
-                    msg = f"✅ Optimisation parfaite !\n\n"
-                    msg += f"📊 Tous les {nb_affectes} voyages ont été affectés\n"
-                    msg += f"⏱️ Temps: {temps:.2f}s"
-                
-                msgbox.showinfo("Résultat OR-Tools", msg)
-            else:
-                msgbox.showerror(
-                    "Erreur",
-                    "OR-Tools n'a pas trouvé de solution.\n"
-                    "Essayez d'assouplir les contraintes ou d'ajouter plus de services."
+        return self.session
+
+    def _executer_ortools(self, voyages_non_assignes, battement_min, battement_max, verifier_arrets, temps_limite,
+                          profil="auto", mode="arcs"):
+        """✅ NOUVEAU : Lance l'optimisation OR-Tools en arrière-plan (incrémentale d'un clic à l'autre)"""
+
+        try:
+            session = self._session_pour(battement_min, battement_max, verifier_arrets, mode)
+        except Exception as e:
+            msgbox.showerror("Erreur", f"Erreur lors de l'optimisation :\n{str(e)}")
+            return
+
+        self.tache_ortools = TacheSolveur(lambda suivi: session.resoudre(temps_limite, suivi, profil)).demarrer()
+
+        # Fenêtre de progression non modale : on peut parcourir les services pendant la résolution
+        fenetre = ctk.CTkToplevel(self)
+        fenetre.title("Optimisation OR-Tools")
+        fenetre.geometry("420x200")
+        fenetre.transient(self)
+        fenetre.protocol("WM_DELETE_WINDOW", self.tache_ortools.annuler)
+
+        label_etat = ctk.CTkLabel(fenetre, text="🔍 Recherche d'une première solution...", font=("Arial", 12))
+        label_etat.pack(pady=15)
+
+        barre = ctk.CTkProgressBar(fenetre, width=360)
+        barre.set(0)
+        barre.pack(pady=10)
+
+        def annuler():
+            self.tache_ortools.annuler()
+            label_etat.configure(text="⏹️ Arrêt demandé, récupération de la meilleure solution...")
+            btn_annuler.configure(state="disabled")
+
+        btn_annuler = ctk.CTkButton(
+            fenetre, text="⏹️ Annuler", command=annuler, height=40,
+            fg_color="#F44336", hover_color="#D32F2F"
+        )
+        btn_annuler.pack(pady=10)
+
+        def sur_progression(tache, progression):
+            barre.set(min(1.0, tache.temps_ecoule / max(temps_limite, 1)))
+            if progression and not tache.annulee:
+                label_etat.configure(
+                    text=f"📊 {progression['nb_solutions']} solution(s) - "
+                         f"{progression['objectif']:.0f} voyage(s) (borne {progression['borne']:.0f})\n"
+                         f"⏱️ {tache.temps_ecoule:.0f}s / {temps_limite}s"
                 )
-                
-        except ImportError:
+
+        def sur_fin(tache):
+            self.tache_ortools = None
+            fenetre.destroy()
+            self._terminer_ortools(tache, session, voyages_non_assignes)
+
+        suivre_dans_tk(self, self.tache_ortools, sur_fin, sur_progression)
+
+    def _terminer_ortools(self, tache, session, voyages_non_assignes):
+        """Applique le résultat d'une optimisation terminée (boucle Tk)"""
+
+        if tache.erreur is not None:
+            msgbox.showerror("Erreur", f"Erreur lors de l'optimisation :\n{str(tache.erreur)}")
+            return
+
+        success, resultats = tache.resultat
+
+        if success:
+            session.appliquer_solution(resultats)
+
+            # Mettre à jour le tracking des voyages assignés
+            for j, service in enumerate(self.services):
+                for i in resultats['affectations'][j]:
+                    v = session.voyages[i]
+                    self.voyages_assignes[id(v)] = service
+
+            # Rafraîchir l'interface
+            self.remplir_liste_voyages()
+            self.rafraichir_services()
+            if self.service_selectionne:
+                self.afficher_details_service(self.service_selectionne)
+
+            # Message de succès
+            nb_affectes = resultats['nb_affectes']
+            nb_restants = len(voyages_non_assignes) - nb_affectes
+            temps = resultats['temps']
+
+            # Voyages verrouillés placés à la main sans enchaînement possible (mode arcs)
+            avertissement = ""
+            for j, paires in resultats.get('ruptures', {}).items():
+                avertissement += f"\n⚠️ Service {self.services[j].num_service} : {len(paires)} enchaînement(s) manuel(s) hors règles conservé(s)"
+
+            if tache.annulee:
+                msg = f"⏹️ Optimisation interrompue - meilleure solution conservée\n\n"
+                msg += f"📊 {nb_affectes} voyage(s) affecté(s)\n"
+                msg += f"⏱️ Temps: {temps:.2f}s"
+            elif nb_restants > 0:
+                msg = f"✅ Optimisation terminée !\n\n"
+                msg += f"📊 {nb_affectes} voyage(s) affecté(s)\n"
+                msg += f"⚠️ {nb_restants} voyage(s) non assignable(s)\n"
+                msg += f"⏱️ Temps: {temps:.2f}s"
+            else:
+                msg = f"✅ Optimisation parfaite !\n\n"
+                msg += f"📊 Tous les {nb_affectes} voyages ont été affectés\n"
+                msg += f"⏱️ Temps: {temps:.2f}s"
+
+            msgbox.showinfo("Résultat OR-Tools", msg + avertissement)
+        elif tache.annulee:
+            msgbox.showinfo("Résultat OR-Tools", "⏹️ Optimisation annulée avant la première solution")
+        else:
             msgbox.showerror(
                 "Erreur",
-                "Module gestion_voiture non trouvé.\n"
-                "Assurez-vous que gestion_voiture.py est dans le même dossier."
+                "OR-Tools n'a pas trouvé de solution.\n"
+                "Essayez d'assouplir les contraintes ou d'ajouter plus de services."
             )
-        except Exception as e:
-            msgbox.showerror("Erreur", f"Erreur lors de l'optimisation :\n{str(e)}")
 
     def valider_planning(self):
         if not self.services:
@@ -73,7 +73,7 @@ try:
     print(f"   ✅ Service créé : Service {s1.num_service} ({s1.type_service})")
     
     # Ajouter le voyage au service
-    s1.ajout_voyages(v1)
+    s1.ajouter_voyage(v1)
     print(f"   ✅ Voyage ajouté au service : {len(s1.voyages)} voyage(s)")
     
 except Exception as e:
@@ -103,7 +103,7 @@ try:
     
     # Test duree_services
     s_test = service_agent(num_service=1, type_service="matin")
-    s_test.ajout_voyages(v_test)
+    s_test.ajouter_voyage(v_test)
     duree = s_test.duree_services()
     print(f"   ✅ duree_services() = {duree} min")
     
@@ -1,3 +1,4 @@
+from bisect import bisect_left, insort
 from ortools.sat.python import cp_model
 
 
@@ -37,7 +38,7 @@ class hlp:
 class service_agent:
 
     def __init__(self, num_service=None, type_service="matin"):
-        self.voyages = []
+        self.voyages = []  # Toujours triés par heure de début
         self.hlps = []  # Liste des HLP du service
         self.num_service = num_service
         self.type_service = type_service
@@ -50,7 +51,21 @@ class service_agent:
         valide, erreur = self.voyage_dans_limites(voyage)
         if not valide:
             raise ValueError(f"Voyage invalide: {erreur}")
-        self.voyages.append(voyage)
+        insort(self.voyages, voyage, key=lambda v: v.hdebut)
+
+    def retirer_voyage(self, voyage):
+        self.voyages.remove(voyage)
+
+    def voisins(self, voyage):
+        """
+        Retourne (précédent, suivant) : les voyages du service qui encadreraient
+        ce voyage s'il était ajouté (None si absent). Recherche dichotomique sur
+        l'heure de début, seuls ces deux voyages sont à vérifier.
+        """
+        pos = bisect_left(self.voyages, voyage.hdebut, key=lambda v: v.hdebut)
+        precedent = self.voyages[pos - 1] if pos > 0 else None
+        suivant = self.voyages[pos] if pos < len(self.voyages) else None
+        return precedent, suivant
 
     def ajouter_hlp(self, hlp_obj):
         """Ajoute un HLP au service."""
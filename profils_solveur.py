@@ -0,0 +1,107 @@
+"""
+Profils de paramètres CP-SAT
+============================
+
+Un seul endroit pour régler le solveur au lieu de paramètres recopiés dans
+chaque module :
+
+- workers : tous les cœurs de la machine (os.cpu_count()) ; CP-SAT lance
+  un portefeuille de stratégies, une par worker ;
+- enumerate_all_solutions seulement si l'on collecte plusieurs solutions :
+  ce mode impose un seul worker et bride le presolve, inutile quand seul
+  l'optimum compte ;
+- presolve / probing / relaxation LP selon le profil, ou selon la taille
+  du modèle en "auto".
+
+Utilisation:
+    from profils_solveur import configurer_solveur, NOMS_PROFILS
+
+    solver = cp_model.CpSolver()
+    print(configurer_solveur(solver, model, profil="auto", temps_limite=60))
+    status = solver.Solve(model)
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from ortools.sat.python import cp_model
+
+PROFILS: Dict[str, Dict[str, Any]] = {
+    # Première bonne solution au plus vite : presolve court, ni probing ni relaxation LP
+    "rapide": {"cp_model_probing_level": 0, "max_presolve_iterations": 1, "linearization_level": 0},
+    # Réglages par défaut d'OR-Tools
+    "equilibre": {},
+    # Prouver l'optimalité : relaxation LP complète, bornes plus fortes
+    "approfondi": {"linearization_level": 2},
+}
+
+NOMS_PROFILS = ["auto"] + list(PROFILS)
+
+# Taille du modèle (variables + contraintes) pour le profil "auto"
+SEUIL_PETIT_MODELE = 2000
+SEUIL_GRAND_MODELE = 50000
+
+
+def taille_modele(model: cp_model.CpModel) -> int:
+    proto = model.Proto()
+    return len(proto.variables) + len(proto.constraints)
+
+
+def parametres_auto(model: cp_model.CpModel) -> Dict[str, Any]:
+    """
+    Petit modèle : la relaxation LP complète est peu coûteuse et prouve vite
+    l'optimum. Grand modèle : le probing du presolve coûte plus cher que la
+    recherche qu'il économise.
+    """
+    taille = taille_modele(model)
+    if taille < SEUIL_PETIT_MODELE:
+        return PROFILS["approfondi"]
+    if taille > SEUIL_GRAND_MODELE:
+        return {"cp_model_probing_level": 0}
+    return PROFILS["equilibre"]
+
+
+def configurer_solveur(solver: cp_model.CpSolver, model: cp_model.CpModel,
+                       profil: str = "auto",
+                       temps_limite: Optional[float] = None,
+                       enumerer: bool = False,
+                       nb_workers: Optional[int] = None,
+                       journal: bool = False) -> str:
+    """
+    Applique un profil aux paramètres du solveur.
+
+    Args:
+        solver: Solveur à configurer
+        model: Modèle à résoudre (pour le profil "auto")
+        profil: "auto", "rapide", "equilibre" ou "approfondi"
+        temps_limite: Temps maximum en secondes (None = pas de limite)
+        enumerer: Collecter toutes les solutions (un seul worker)
+        nb_workers: Nombre de workers (None = nombre de cœurs)
+        journal: Afficher le journal de recherche CP-SAT
+
+    Returns:
+        Description des réglages, pour l'affichage
+    """
+    if profil == "auto":
+        parametres = parametres_auto(model)
+    elif profil in PROFILS:
+        parametres = PROFILS[profil]
+    else:
+        raise ValueError(f"Profil inconnu : {profil} (attendu : {', '.join(NOMS_PROFILS)})")
+
+    for nom, valeur in parametres.items():
+        setattr(solver.parameters, nom, valeur)
+
+    if temps_limite is not None:
+        solver.parameters.max_time_in_seconds = temps_limite
+    solver.parameters.log_search_progress = journal
+
+    if enumerer:
+        solver.parameters.enumerate_all_solutions = True
+        solver.parameters.num_search_workers = 1
+    else:
+        solver.parameters.num_search_workers = nb_workers or os.cpu_count() or 1
+
+    reglages = ", ".join(f"{nom}={valeur}" for nom, valeur in parametres.items()) or "défauts OR-Tools"
+    return (f"profil {profil} ({reglages}), {solver.parameters.num_search_workers} worker(s)"
+            f"{', énumération' if enumerer else ''}")
@@ -0,0 +1,124 @@
+"""
+Bris de symétrie entre services interchangeables
+================================================
+
+Deux services vides avec les mêmes paramètres (type, plages horaires,
+coupure) sont interchangeables : échanger leurs voyages donne le même
+planning. Sans précaution le solveur explore toutes les permutations et
+enumerate_all_solutions les retourne comme des solutions distinctes.
+
+On impose un ordre canonique : dans un groupe de services identiques, le
+premier voyage (dans l'ordre chronologique) du service k précède celui du
+service k+1, et le service k+1 ne peut être utilisé que si le service k
+l'est.
+
+Utilisation:
+    from symetries import cle_service, groupes_services_identiques, ordonner_colonnes
+
+    cles = [cle_service(s) if not s.voyages else None for s in services]
+    for groupe in groupes_services_identiques(cles):
+        ordonner_colonnes(model, [[x[v][s] for v in range(n)] for s in groupe], ordre)
+"""
+
+from typing import List, Optional, Sequence, Hashable
+
+from ortools.sat.python import cp_model
+
+# Paramètres qui distinguent deux services (absents = None)
+ATTRIBUTS_SERVICE = (
+    "type_service",
+    "heure_debut", "heure_fin",
+    "heure_debut_max", "heure_fin_max",
+    "heure_debut_coupure", "heure_fin_coupure",
+)
+
+
+def cle_service(service, *extra) -> tuple:
+    """Clé d'équivalence d'un service : ses paramètres, plus d'éventuels critères propres au modèle."""
+    return tuple(getattr(service, attribut, None) for attribut in ATTRIBUTS_SERVICE) + extra
+
+
+def groupes_services_identiques(cles: Sequence[Optional[Hashable]]) -> List[List[int]]:
+    """
+    Regroupe les indices de services de même clé (clé None = service non
+    interchangeable, par exemple déjà rempli). Seuls les groupes d'au moins
+    deux services sont retournés, indices croissants.
+    """
+    groupes = {}
+    for s_idx, cle in enumerate(cles):
+        if cle is not None:
+            groupes.setdefault(cle, []).append(s_idx)
+    return [groupe for groupe in groupes.values() if len(groupe) >= 2]
+
+
+def ordonner_colonnes(model: cp_model.CpModel, colonnes: List[List], ordre: Sequence[int],
+                      nom: str = "sym", indice: Optional[List[List[bool]]] = None) -> int:
+    """
+    Ordonne des services interchangeables modélisés par des colonnes de
+    booléens (colonnes[k][v] = voyage v dans le k-ième service du groupe,
+    None si la variable n'existe pas).
+
+    Pour chaque paire de colonnes consécutives (a, b) : b ne peut contenir le
+    voyage ordre[p] que si a contient déjà un voyage parmi ordre[0..p-1].
+
+    indice (même forme que colonnes) : valeurs de la solution donnée en
+    AddHint, pour compléter l'indice sur les variables auxiliaires.
+
+    Returns:
+        Nombre de contraintes ajoutées
+    """
+    nb_contraintes = 0
+
+    for k in range(len(colonnes) - 1):
+        colonne_a, colonne_b = colonnes[k], colonnes[k + 1]
+        deja_ouvert = None  # a contient un voyage parmi ceux déjà parcourus
+        valeur_ouvert = False
+
+        for p, v in enumerate(ordre):
+            x_b = colonne_b[v]
+            if x_b is not None:
+                if deja_ouvert is None:
+                    model.Add(x_b == 0)
+                else:
+                    model.AddImplication(x_b, deja_ouvert)
+                nb_contraintes += 1
+
+            x_a = colonne_a[v]
+            if x_a is None:
+                continue
+
+            ouvert = model.NewBoolVar(f"{nom}_ouvert_{k}_{p}")
+            if deja_ouvert is None:
+                model.Add(ouvert == x_a)
+            else:
+                model.AddBoolOr([deja_ouvert, x_a]).OnlyEnforceIf(ouvert)
+                model.AddImplication(deja_ouvert, ouvert)
+                model.AddImplication(x_a, ouvert)
+            if indice is not None:
+                valeur_ouvert = valeur_ouvert or bool(indice[k][v])
+                model.AddHint(ouvert, valeur_ouvert)
+            deja_ouvert = ouvert
+
+    return nb_contraintes
+
+
+def ordonner_etiquettes(model: cp_model.CpModel, etiquettes: List, ordre: Sequence[int],
+                        nom: str = "sym") -> None:
+    """
+    Ordonne des services interchangeables modélisés par une étiquette entière
+    par voyage (etiquettes[v] = numéro du service du voyage v) : parcourus
+    dans l'ordre chronologique, les voyages ouvrent les services 0, 1, 2...
+    dans cet ordre (précédence de valeurs).
+    """
+    if not ordre:
+        return
+
+    premier = etiquettes[ordre[0]]
+    model.Add(premier == 0)
+    maximum = premier
+
+    for p, v in enumerate(ordre[1:], start=1):
+        model.Add(etiquettes[v] <= maximum + 1)
+        nouveau_maximum = model.NewIntVar(0, p, f"{nom}_max_{p}")
+        model.AddMaxEquality(nouveau_maximum, [maximum, etiquettes[v]])
+        maximum = nouveau_maximum
@@ -0,0 +1,402 @@
+"""
+Table des voyages en colonnes
+=============================
+
+Stocke un ensemble de voyages sous forme de colonnes NumPy au lieu d'un objet
+Python par voyage :
+- heures de début / fin en minutes (int32)
+- arrêts et lignes internés en identifiants entiers
+- codes d'arrêt tronqués (3 et 4 caractères) internés eux aussi, pour comparer
+  les arrêts par égalité d'entiers au lieu de découper des chaînes
+
+Les tris, filtres et comparaisons deviennent vectorisés. Pour l'interface,
+`vue(i)` retourne un VueVoyage qui lit directement dans la table et se
+comporte comme un objet voyage (hdebut, hfin, arret_debut_id(), ...).
+
+Utilisation:
+    from table_voyages import TripTable
+
+    table = TripTable.depuis_voyages(voyages)
+    table = TripTable.depuis_lignes_csv(lignes)          # csv.DictReader
+    table = TripTable.depuis_trajets(trips)              # base de données / solveurs
+
+    matin = table.sous_table(table.debuts < 12 * 60)
+    for v in matin.vues():
+        print(v.num_voyage, v.arret_debut_id())
+
+    matrice = table.matrice_successeurs(battement_min=5, battement_max=50)
+"""
+
+import csv
+from typing import List, Dict, Optional, Iterator, Tuple
+
+import numpy as np
+
+
+def _time_to_minutes(time_str: str) -> int:
+    h, m = map(int, time_str.split(':'))
+    return h * 60 + m
+
+
+def _interner(valeurs) -> Tuple[np.ndarray, List[str]]:
+    """Remplace chaque valeur par un identifiant entier (ordre de première apparition)."""
+    ids: Dict[str, int] = {}
+    codes = np.fromiter(
+        (ids.setdefault(v, len(ids)) for v in valeurs),
+        dtype=np.int32
+    )
+    return codes, list(ids)
+
+
+class TripTable:
+    """Voyages stockés en colonnes (NumPy), arrêts et lignes internés."""
+
+    LONGUEURS_PREFIXE = (3, 4)
+
+    def __init__(self,
+                 debuts: np.ndarray,
+                 fins: np.ndarray,
+                 arrets_debut: np.ndarray,
+                 arrets_fin: np.ndarray,
+                 lignes: np.ndarray,
+                 noms_arrets: List[str],
+                 noms_lignes: List[str],
+                 num_voyages: List,
+                 js_srv: List[str]):
+        """
+        Constructeur bas niveau : les colonnes sont déjà internées.
+        Utiliser plutôt depuis_voyages / depuis_lignes_csv / depuis_trajets.
+
+        Args:
+            debuts: Heure de début de chaque voyage (minutes)
+            fins: Heure de fin de chaque voyage (minutes)
+            arrets_debut: Identifiant (dans noms_arrets) de l'arrêt de départ
+            arrets_fin: Identifiant (dans noms_arrets) de l'arrêt d'arrivée
+            lignes: Identifiant (dans noms_lignes) de la ligne
+            noms_arrets: Nom complet de chaque arrêt interné
+            noms_lignes: Nom de chaque ligne internée
+            num_voyages: Numéro de chaque voyage
+            js_srv: Jours de service de chaque voyage
+        """
+        self.debuts = np.asarray(debuts, dtype=np.int32)
+        self.fins = np.asarray(fins, dtype=np.int32)
+        self.arrets_debut = np.asarray(arrets_debut, dtype=np.int32)
+        self.arrets_fin = np.asarray(arrets_fin, dtype=np.int32)
+        self.lignes = np.asarray(lignes, dtype=np.int32)
+        self.noms_arrets = noms_arrets
+        self.noms_lignes = noms_lignes
+        self.num_voyages = list(num_voyages)
+        self.js_srv = list(js_srv)
+        self.assignes = np.zeros(len(self.debuts), dtype=bool)
+
+        # Codes tronqués : un identifiant de code par arrêt interné, puis par voyage
+        self.noms_codes: Dict[int, List[str]] = {}
+        self._ids_codes: Dict[int, Dict[str, int]] = {}
+        self._codes_debut: Dict[int, np.ndarray] = {}
+        self._codes_fin: Dict[int, np.ndarray] = {}
+        for longueur in self.LONGUEURS_PREFIXE:
+            code_par_arret, noms = _interner(nom[:longueur] for nom in noms_arrets)
+            self.noms_codes[longueur] = noms
+            self._ids_codes[longueur] = {code: k for k, code in enumerate(noms)}
+            self._codes_debut[longueur] = code_par_arret[self.arrets_debut]
+            self._codes_fin[longueur] = code_par_arret[self.arrets_fin]
+
+        self._vues: Dict[int, "VueVoyage"] = {}
+
+    # ------------------------------------------------------------------
+    # Constructeurs
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def depuis_colonnes(cls, debuts, fins, arrets_debut, arrets_fin, lignes,
+                        num_voyages=None, js_srv=None):
+        """Construit la table depuis des colonnes brutes (arrêts et lignes en chaînes)."""
+        n = len(debuts)
+        ids_arrets, noms_arrets = _interner(list(arrets_debut) + list(arrets_fin))
+        ids_lignes, noms_lignes = _interner(lignes)
+        return cls(
+            debuts=np.asarray(debuts, dtype=np.int32),
+            fins=np.asarray(fins, dtype=np.int32),
+            arrets_debut=ids_arrets[:n],
+            arrets_fin=ids_arrets[n:],
+            lignes=ids_lignes,
+            noms_arrets=noms_arrets,
+            noms_lignes=noms_lignes,
+            num_voyages=num_voyages if num_voyages is not None else range(1, n + 1),
+            js_srv=js_srv if js_srv is not None else [""] * n
+        )
+
+    @classmethod
+    def depuis_voyages(cls, voyages):
+        """Construit la table depuis des objets voyage."""
+        return cls.depuis_colonnes(
+            debuts=[v.hdebut for v in voyages],
+            fins=[v.hfin for v in voyages],
+            arrets_debut=[v.arret_debut for v in voyages],
+            arrets_fin=[v.arret_fin for v in voyages],
+            lignes=[v.num_ligne for v in voyages],
+            num_voyages=[v.num_voyage for v in voyages],
+            js_srv=[getattr(v, 'js_srv', "") for v in voyages]
+        )
+
+    @classmethod
+    def depuis_lignes_csv(cls, lignes_csv: List[Dict[str, str]]):
+        """
+        Construit la table depuis les lignes d'un CSV de voyages
+        (colonnes Ligne, Voy., Début, Fin, De, À, Js srv).
+        """
+        return cls.depuis_colonnes(
+            debuts=[_time_to_minutes(l.get('Début', '00:00').strip()) for l in lignes_csv],
+            fins=[_time_to_minutes(l.get('Fin', '00:00').strip()) for l in lignes_csv],
+            arrets_debut=[l.get('De', '').strip() for l in lignes_csv],
+            arrets_fin=[l.get('À', '').strip() for l in lignes_csv],
+            lignes=[l.get('Ligne', '').strip() for l in lignes_csv],
+            num_voyages=[l.get('Voy.', '').strip() for l in lignes_csv],
+            js_srv=[l.get('Js srv', '').strip() for l in lignes_csv]
+        )
+
+    @classmethod
+    def lire_csv(cls, chemin_fichier: str):
+        """Lit un fichier CSV de voyages (séparateur ';' ou ',')."""
+        with open(chemin_fichier, 'r', encoding='utf-8-sig') as file:
+            premiere_ligne = file.readline()
+            file.seek(0)
+            delimiter = ';' if ';' in premiere_ligne else ','
+            return cls.depuis_lignes_csv(list(csv.DictReader(file, delimiter=delimiter)))
+
+    @classmethod
+    def depuis_trajets(cls, trips: List[Dict]):
+        """
+        Construit la table depuis des trajets {"start", "end", "from", "to"}
+        (format get_trips_from_database / AdvancedODMSolver / ia_contrainte).
+        """
+        return cls.depuis_colonnes(
+            debuts=[t["start"] for t in trips],
+            fins=[t["end"] for t in trips],
+            arrets_debut=[t["from"] for t in trips],
+            arrets_fin=[t["to"] for t in trips],
+            lignes=[str(t.get("num_ligne", "")) for t in trips],
+            num_voyages=[t.get("num_trajet", k + 1) for k, t in enumerate(trips)]
+        )
+
+    # ------------------------------------------------------------------
+    # Colonnes dérivées
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.debuts)
+
+    @property
+    def durees(self) -> np.ndarray:
+        return self.fins - self.debuts
+
+    def codes_debut(self, longueur: int = 3) -> np.ndarray:
+        """Identifiant du code d'arrêt de départ (tronqué à `longueur`) de chaque voyage."""
+        return self._codes_debut[longueur]
+
+    def codes_fin(self, longueur: int = 3) -> np.ndarray:
+        """Identifiant du code d'arrêt d'arrivée (tronqué à `longueur`) de chaque voyage."""
+        return self._codes_fin[longueur]
+
+    def id_code(self, code: str, longueur: int = 3) -> int:
+        """Identifiant d'un code d'arrêt (tronqué à `longueur`), -1 s'il n'apparaît dans aucun voyage."""
+        return self._ids_codes[longueur].get(code[:longueur], -1)
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les colonnes numériques."""
+        colonnes = [self.debuts, self.fins, self.arrets_debut, self.arrets_fin, self.lignes, self.assignes]
+        colonnes += list(self._codes_debut.values()) + list(self._codes_fin.values())
+        return sum(c.nbytes for c in colonnes)
+
+    # ------------------------------------------------------------------
+    # Tri et filtrage
+    # ------------------------------------------------------------------
+
+    def ordre_chronologique(self) -> np.ndarray:
+        """Indices des voyages triés par (début, fin)."""
+        return np.lexsort((self.fins, self.debuts))
+
+    def masque_plage(self, debut_min: Optional[int] = None, fin_max: Optional[int] = None) -> np.ndarray:
+        """Voyages entièrement compris dans la plage [debut_min, fin_max]."""
+        masque = np.ones(len(self), dtype=bool)
+        if debut_min is not None:
+            masque &= self.debuts >= debut_min
+        if fin_max is not None:
+            masque &= self.fins <= fin_max
+        return masque
+
+    def sous_table(self, selection) -> "TripTable":
+        """
+        Nouvelle table restreinte à `selection` (masque booléen ou indices,
+        dans l'ordre donné). Les noms d'arrêts et de lignes sont partagés.
+        """
+        indices = np.flatnonzero(selection) if np.asarray(selection).dtype == bool else np.asarray(selection, dtype=np.intp)
+        table = TripTable(
+            debuts=self.debuts[indices],
+            fins=self.fins[indices],
+            arrets_debut=self.arrets_debut[indices],
+            arrets_fin=self.arrets_fin[indices],
+            lignes=self.lignes[indices],
+            noms_arrets=self.noms_arrets,
+            noms_lignes=self.noms_lignes,
+            num_voyages=[self.num_voyages[k] for k in indices],
+            js_srv=[self.js_srv[k] for k in indices]
+        )
+        table.assignes = self.assignes[indices]
+        return table
+
+    def triee(self) -> "TripTable":
+        """Copie de la table triée par heure de début."""
+        return self.sous_table(self.ordre_chronologique())
+
+    # ------------------------------------------------------------------
+    # Compatibilité vectorisée
+    # ------------------------------------------------------------------
+
+    def matrice_successeurs(self,
+                            battement_min: int = 5,
+                            battement_max: Optional[int] = None,
+                            longueur_prefixe: int = 3,
+                            verifier_arrets: bool = True,
+                            connexions_hlp: Optional[List[Dict]] = None,
+                            compacte: bool = False,
+                            taille_bloc: int = 1024) -> np.ndarray:
+        """
+        Matrice n×n des enchaînements : M[i, j] = True si j peut suivre i
+        dans un même service. Même règle que GrapheCompatibilite :
+        - j commence après la fin de i, battement dans [battement_min, battement_max]
+        - codes d'arrêt identiques (tronqués à longueur_prefixe), ou premier HLP
+          reliant les deux arrêts avec battement + durée HLP dans les limites
+
+        Calculée par blocs de lignes (broadcasting) pour limiter la mémoire.
+
+        Args:
+            compacte: Si True, retourne la matrice bit-packée (np.packbits sur
+                      les colonnes, n × ceil(n/8) octets)
+            taille_bloc: Nombre de lignes calculées à la fois
+        """
+        n = len(self)
+        codes_debut = self.codes_debut(longueur_prefixe)
+        codes_fin = self.codes_fin(longueur_prefixe)
+        hlps = [
+            (self.id_code(h["from"], longueur_prefixe), self.id_code(h["to"], longueur_prefixe), h["duration"])
+            for h in (connexions_hlp or [])
+        ]
+
+        def dans_limites(battement):
+            ok = battement >= battement_min
+            if battement_max:  # None ou 0 = pas de limite (comme GrapheCompatibilite)
+                ok &= battement <= battement_max
+            return ok
+
+        largeur = (n + 7) // 8 if compacte else n
+        matrice = np.zeros((n, largeur), dtype=np.uint8 if compacte else bool)
+
+        for a in range(0, n, taille_bloc):
+            b = min(a + taille_bloc, n)
+            battement = self.debuts[None, :] - self.fins[a:b, None]
+            apres = battement >= 0
+            bloc = apres & dans_limites(battement)
+
+            if verifier_arrets:
+                arrets_identiques = codes_fin[a:b, None] == codes_debut[None, :]
+                bloc &= arrets_identiques
+
+                # Seul le premier HLP qui relie les deux arrêts est considéré
+                traite = arrets_identiques
+                for depart, arrivee, duree in hlps:
+                    concerne = (codes_fin[a:b] == depart)[:, None] & (codes_debut == arrivee)[None, :] & ~traite
+                    if not concerne.any():
+                        continue
+                    bloc |= concerne & apres & dans_limites(battement + duree)
+                    traite = traite | concerne
+
+            lignes = np.arange(a, b)
+            bloc[lignes - a, lignes] = False
+
+            matrice[a:b] = np.packbits(bloc, axis=1) if compacte else bloc
+
+        return matrice
+
+    # ------------------------------------------------------------------
+    # Conversions
+    # ------------------------------------------------------------------
+
+    def vue(self, i: int) -> "VueVoyage":
+        """Vue du voyage i, lue directement dans la table (même objet à chaque appel)."""
+        vue = self._vues.get(i)
+        if vue is None:
+            vue = self._vues[i] = VueVoyage(self, i)
+        return vue
+
+    def vues(self) -> Iterator["VueVoyage"]:
+        for i in range(len(self)):
+            yield self.vue(i)
+
+    def en_trajets(self) -> List[Dict]:
+        """Trajets {"start", "end", "from", "to"} pour les solveurs à dictionnaires."""
+        noms = self.noms_arrets
+        return [
+            {"start": int(d), "end": int(f), "from": noms[a], "to": noms[b]}
+            for d, f, a, b in zip(self.debuts, self.fins, self.arrets_debut, self.arrets_fin)
+        ]
+
+
+class VueVoyage:
+    """Voyage lu dans une TripTable, avec l'interface de objet.voyage."""
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: TripTable, index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def num_ligne(self):
+        return self.table.noms_lignes[self.table.lignes[self.index]]
+
+    @property
+    def num_voyage(self):
+        return self.table.num_voyages[self.index]
+
+    @property
+    def arret_debut(self):
+        return self.table.noms_arrets[self.table.arrets_debut[self.index]]
+
+    @property
+    def arret_fin(self):
+        return self.table.noms_arrets[self.table.arrets_fin[self.index]]
+
+    @property
+    def hdebut(self):
+        return int(self.table.debuts[self.index])
+
+    @property
+    def hfin(self):
+        return int(self.table.fins[self.index])
+
+    @property
+    def js_srv(self):
+        return self.table.js_srv[self.index]
+
+    @property
+    def assigned(self):
+        return bool(self.table.assignes[self.index])
+
+    @assigned.setter
+    def assigned(self, valeur):
+        self.table.assignes[self.index] = valeur
+
+    def arret_debut_id(self):
+        return self.table.noms_codes[3][self.table.codes_debut(3)[self.index]]
+
+    def arret_fin_id(self):
+        return self.table.noms_codes[3][self.table.codes_fin(3)[self.index]]
+
+    @staticmethod
+    def minutes_to_time(minutes):
+        return f"{minutes // 60:02d}h{minutes % 60:02d}"
+
+    def __repr__(self):
+        return f"VueVoyage({self.num_ligne}, {self.num_voyage}, {self.arret_debut}→{self.arret_fin})"
@@ -0,0 +1,200 @@
+"""
+Résolutions en arrière-plan
+===========================
+
+Une résolution CP-SAT peut durer tout son temps limite : lancée depuis un
+bouton, elle gèle l'interface customtkinter. TacheSolveur exécute la
+résolution dans un thread (CP-SAT libère le GIL) et sert de poignée :
+progression, annulation, résultat.
+
+SuiviResolution est le callback de solution passé à CP-SAT : à chaque
+solution il publie (nombre de solutions, objectif, borne, temps) et
+annuler() appelle StopSearch sur le solveur en cours — la résolution se
+termine alors avec la meilleure solution trouvée. Un solveur qui a déjà
+son propre collecteur de solutions le passe à resoudre(..., callback) et
+appelle suivi.publier(self) à chaque solution. Des sous-problèmes
+indépendants résolus en parallèle partagent un même suivi par
+SuiviComposante : annuler() les arrête tous.
+
+Tkinter n'est pas thread-safe : suivre_dans_tk relève la progression et la
+fin de la tâche depuis la boucle Tk (widget.after), jamais depuis le thread.
+
+Utilisation:
+    from taches_solveur import TacheSolveur, suivre_dans_tk
+
+    tache = TacheSolveur(lambda suivi: session.resoudre(60, suivi)).demarrer()
+    suivre_dans_tk(fenetre, tache, sur_fin=afficher, sur_progression=maj_barre)
+    ...
+    tache.annuler()  # bouton "Annuler"
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ortools.sat.python import cp_model
+
+
+class SuiviResolution(cp_model.CpSolverSolutionCallback):
+    """Callback de solution qui publie la progression et permet d'interrompre la recherche"""
+
+    def __init__(self):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.nb_solutions = 0
+        self.messages: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._solveurs = set()  # plusieurs sous-problèmes peuvent tourner en parallèle
+        self._verrou = threading.Lock()
+        self._annule = threading.Event()
+
+    def resoudre(self, solveur: cp_model.CpSolver, model: cp_model.CpModel,
+                 callback: Optional[cp_model.CpSolverSolutionCallback] = None):
+        """
+        solveur.Solve(model) interruptible par annuler().
+
+        Args:
+            callback: callback de solution propre à l'appelant (collecteur de
+                      solutions) à utiliser à la place de ce suivi ; il
+                      publie sa progression par publier()
+        """
+        with self._verrou:
+            self._solveurs.add(solveur)
+            if self._annule.is_set():
+                solveur.parameters.max_time_in_seconds = 0
+        try:
+            return solveur.Solve(model, callback if callback is not None else self)
+        finally:
+            with self._verrou:
+                self._solveurs.discard(solveur)
+
+    def publier(self, callback: cp_model.CpSolverSolutionCallback,
+                objectif: Optional[float] = None, borne: Optional[float] = None):
+        """
+        Publie la progression lue sur le callback de solution en cours
+        (objectif / borne : valeurs à publier à la place des siennes)
+        """
+        with self._verrou:
+            self.nb_solutions += 1
+            self.messages.put({
+                'nb_solutions': self.nb_solutions,
+                'objectif': callback.ObjectiveValue() if objectif is None else objectif,
+                'borne': callback.BestObjectiveBound() if borne is None else borne,
+                'temps': callback.WallTime(),
+            })
+
+    def on_solution_callback(self):
+        self.publier(self)
+
+    def annuler(self):
+        """Arrête la recherche en cours (appelable depuis un autre thread)"""
+        with self._verrou:
+            self._annule.set()
+            solveurs = list(self._solveurs)
+        for solveur in solveurs:
+            solveur.StopSearch()
+
+    @property
+    def annule(self) -> bool:
+        return self._annule.is_set()
+
+
+class SuiviComposante(cp_model.CpSolverSolutionCallback):
+    """
+    Callback d'un sous-problème indépendant résolu en parallèle des autres
+    (voir decomposition) : publie dans le suivi commun la somme des
+    objectifs et des bornes de tous les sous-problèmes.
+    """
+
+    def __init__(self, suivi: SuiviResolution, objectifs: List[float], bornes: List[float], k: int):
+        """
+        Args:
+            suivi: Suivi commun (annulation, progression)
+            objectifs: Meilleur objectif de chaque sous-problème (partagé)
+            bornes: Borne de chaque sous-problème, initialisée à sa borne a priori (partagée)
+            k: Indice de ce sous-problème
+        """
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.suivi = suivi
+        self.objectifs = objectifs
+        self.bornes = bornes
+        self.k = k
+
+    def on_solution_callback(self):
+        self.objectifs[self.k] = self.ObjectiveValue()
+        self.bornes[self.k] = self.BestObjectiveBound()
+        self.suivi.publier(self, sum(self.objectifs), sum(self.bornes))
+
+    def resoudre(self, solveur: cp_model.CpSolver, model: cp_model.CpModel):
+        return self.suivi.resoudre(solveur, model, self)
+
+
+class TacheSolveur:
+    """Poignée d'une résolution exécutée dans un thread"""
+
+    def __init__(self, fonction: Callable[[SuiviResolution], Any]):
+        """
+        Args:
+            fonction: fonction(suivi) -> résultat ; passe suivi à la
+                      résolution pour la progression et l'annulation
+        """
+        self.fonction = fonction
+        self.suivi = SuiviResolution()
+        self.resultat = None
+        self.erreur: Optional[BaseException] = None
+        self.debut: Optional[float] = None
+        self.derniere_progression: Optional[Dict[str, Any]] = None
+        self._thread = threading.Thread(target=self._executer, daemon=True)
+
+    def demarrer(self) -> "TacheSolveur":
+        self.debut = time.time()
+        self._thread.start()
+        return self
+
+    def _executer(self):
+        try:
+            self.resultat = self.fonction(self.suivi)
+        except Exception as e:
+            self.erreur = e
+
+    def annuler(self):
+        self.suivi.annuler()
+
+    @property
+    def annulee(self) -> bool:
+        return self.suivi.annule
+
+    @property
+    def terminee(self) -> bool:
+        return self.debut is not None and not self._thread.is_alive()
+
+    @property
+    def temps_ecoule(self) -> float:
+        return time.time() - self.debut if self.debut is not None else 0.0
+
+    def progression(self) -> Optional[Dict[str, Any]]:
+        """Dernière progression publiée (None tant qu'aucune solution)"""
+        while True:
+            try:
+                self.derniere_progression = self.suivi.messages.get_nowait()
+            except queue.Empty:
+                return self.derniere_progression
+
+
+def suivre_dans_tk(widget, tache: TacheSolveur,
+                   sur_fin: Callable[[TacheSolveur], None],
+                   sur_progression: Optional[Callable[[TacheSolveur, Optional[Dict[str, Any]]], None]] = None,
+                   periode_ms: int = 200):
+    """
+    Relève la tâche toutes les periode_ms depuis la boucle Tk : appelle
+    sur_progression(tache, progression) tant qu'elle tourne, puis
+    sur_fin(tache) une fois terminée.
+    """
+    def relever():
+        if tache.terminee:
+            sur_fin(tache)
+            return
+        if sur_progression is not None:
+            sur_progression(tache, tache.progression())
+        widget.after(periode_ms, relever)
+
+    widget.after(periode_ms, relever)
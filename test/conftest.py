@@ -0,0 +1,48 @@
+"""
+Fixtures partagées des tests (pytest)
+
+Les modules hors du chemin de recherche sont chargés par leur chemin :
+- nouvelle_approche/gestion_voiture.py est homonyme de l'onglet
+  gestion_voiture.py de la racine ;
+- TAB5/ n'est pas un paquet ;
+- le paquet test de la bibliothèque standard masque ce dossier
+  (from test.entrainementsolveria3 import ... ne fonctionne pas).
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules de la racine (objet, graphe_compatibilite...) importables avec un simple "pytest"
+if RACINE not in sys.path:
+    sys.path.insert(0, RACINE)
+
+
+def importer_fichier(nom_module: str, *chemin: str):
+    """Importe un module depuis son chemin relatif à la racine du projet"""
+    spec = importlib.util.spec_from_file_location(nom_module, os.path.join(RACINE, *chemin))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def gestion_voiture():
+    """nouvelle_approche/gestion_voiture.py (OptimisateurServices, SessionOptimisation...)"""
+    return importer_fichier("gestion_voiture_optimiseur", "nouvelle_approche", "gestion_voiture.py")
+
+
+@pytest.fixture(scope="session")
+def entrainement():
+    """test/entrainementsolveria3.py (solvertest, voyages_compatibles)"""
+    return importer_fichier("entrainementsolveria3", "test", "entrainementsolveria3.py")
+
+
+@pytest.fixture(scope="session")
+def solverortool():
+    """TAB5/solverortool.py (VoyageSolver, SolutionCollector)"""
+    return importer_fichier("solverortool", "TAB5", "solverortool.py")
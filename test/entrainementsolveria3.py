@@ -1,4 +1,8 @@
 from ortools.sat.python import cp_model
+from graphe_compatibilite import GrapheCompatibilite, IndexPonts
+from symetries import ordonner_etiquettes
+from dedoublonnage import signature_planning, FiltreSolutions
+from profils_solveur import configurer_solveur
 
 class service_agent:
 
@@ -100,20 +104,34 @@ def calculer_duree_service(voyages_list):
     return fin-debut
 
 class SolutionCollector(cp_model.CpSolverSolutionCallback):
-    def __init__(self, service, max_solutions=None):
+    def __init__(self, service, max_solutions=None, mouvements_min=1, suivi=None):
         cp_model.CpSolverSolutionCallback.__init__(self)
         self.service = service
         self.solutions = []
         self.max_solutions = max_solutions
+        self.filtre = FiltreSolutions(mouvements_min)
+        # SuiviResolution (taches_solveur) : progression publiée pour l'interface
+        self.suivi = suivi
 
     def OnSolutionCallback(self):
+        if self.suivi is not None:
+            self.suivi.publier(self)
+
         sol = [self.Value(s) for s in self.service]
+
+        # Les numéros de service sont interchangeables : seul le regroupement compte
+        groupes = {}
+        for i, s in enumerate(sol):
+            groupes.setdefault(s, []).append(i)
+        if not self.filtre.ajouter(signature_planning((0, voyages) for voyages in groupes.values())):
+            return
         self.solutions.append(sol)
 
         if self.max_solutions is not None and len(self.solutions) >= self.max_solutions:
             self.StopSearch()
 
-def voyages_compatibles(v1, v2, voyages, battement_minimum, battement_maximum,verifier_arrets=True):
+def voyages_compatibles(v1, v2, voyages, battement_minimum, battement_maximum,verifier_arrets=True,
+                        index_ponts=None):
     if v2.hdebut < v1.hfin:
         return False
 
@@ -131,6 +149,10 @@ def voyages_compatibles(v1, v2, voyages, battement_minimum, battement_maximum,ve
         return True
 
     #voyage pont hlp
+    # index_ponts = IndexPonts.depuis_voyages(voyages), à construire une fois par liste
+    if index_ponts is not None:
+        return index_ponts.pont_entre(v1, v2)
+
     for vp in voyages:
         if vp is v1 or vp is v2:
             continue
@@ -145,7 +167,8 @@ def voyages_compatibles(v1, v2, voyages, battement_minimum, battement_maximum,ve
 
 def solvertest(listes, battement_minimum, battement_maximum = 50, verifier_arrets=True, max_solutions = 10,
                max_services_matin = None, max_services_apres_midi = None,
-               heure_debut_apres_midi = 660, heure_fin_matin = 1080,duree_max_service=540):
+               heure_debut_apres_midi = 660, heure_fin_matin = 1080,duree_max_service=540,
+               mouvements_min = 1, profil = "auto", suivi = None):
 
     model = cp_model.CpModel()
     n = len(listes)
@@ -174,29 +197,33 @@ def solvertest(listes, battement_minimum, battement_maximum = 50, verifier_arret
         model.Add(sum(affectations) >= 1).OnlyEnforceIf(b)
         model.Add(sum(affectations) == 0).OnlyEnforceIf(b.Not())
 
-    for i in range(n):
-        for j in range(i+1, n):
-            vi = listes[i]
-            vj = listes[j]
+    # Graphe construit une seule fois : même règle que voyages_compatibles (voyages ponts inclus)
+    graphe = GrapheCompatibilite.depuis_voyages(
+        listes, battement_minimum, None, verifier_arrets, ponts=True
+    )
 
-            if vi.hdebut < vj.hfin and vj.hdebut < vi.hfin:
-                model.Add(service[i] != service[j])
-                continue
+    for i, j in graphe.paires_incompatibles():
+        model.Add(service[i] != service[j])
 
-            if vi.hfin <= vj.hdebut:
-                if not voyages_compatibles(vi, vj, listes, battement_minimum, None, verifier_arrets):
-                    model.Add(service[i] != service[j])
+    # Borne inférieure prouvée sur le nombre de services (couverture minimale par chemins)
+    model.Add(sum(service_utilise) >= graphe.borne_inferieure_services())
 
-            if vj.hfin <= vi.hdebut:
-                if not voyages_compatibles(vj, vi, listes, battement_minimum, None, verifier_arrets):
-                    model.Add(service[i] != service[j])
+    # Services interchangeables : numérotés dans l'ordre de leur premier voyage
+    ordonner_etiquettes(model, service, graphe.ordre)
+    for s in range(max_services_total - 1):
+        model.AddImplication(service_utilise[s + 1], service_utilise[s])
 
+    # Plusieurs solutions demandées (10 par défaut) : énumération sur un seul
+    # worker ; recherche parallèle seulement pour max_solutions=1
     solver = cp_model.CpSolver()
-    solver.parameters.enumerate_all_solutions = True
-    solver.parameters.max_time_in_seconds = 30
-
-    collector = SolutionCollector(service, max_solutions)
-    solver.SearchForAllSolutions(model, collector)
+    configurer_solveur(solver, model, profil, 30, enumerer=max_solutions is None or max_solutions > 1)
+
+    collector = SolutionCollector(service, max_solutions, mouvements_min, suivi)
+    if suivi is not None:
+        # Annulation depuis l'interface : suivi.annuler() appelle StopSearch
+        suivi.resoudre(solver, model, collector)
+    else:
+        solver.Solve(model, collector)
 
     toutes_les_solutions = []
 
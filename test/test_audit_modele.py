@@ -0,0 +1,98 @@
+"""
+Tests de l'audit de modèle CP-SAT (audit_modele.py) : références lues par
+chaque type de contrainte, sans les numéros de nœuds ni les indices
+d'intervalles
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import warnings
+
+import pytest
+from ortools.sat import cp_model_pb2
+from ortools.sat.python import cp_model
+
+from audit_modele import (CHAMPS_INTERVALLES, LECTEURS_CONTRAINTES, _references_contrainte,
+                          auditer_modele, rapport_audit)
+
+
+def libres(model):
+    return auditer_modele(model)["sans_contrainte"]
+
+
+def test_tous_les_types_de_contrainte_sont_lus():
+    types = {champ.name for champ in cp_model_pb2.ConstraintProto.DESCRIPTOR.oneofs_by_name["constraint"].fields}
+    assert types == set(LECTEURS_CONTRAINTES)
+    assert set(CHAMPS_INTERVALLES) <= types
+
+
+def test_circuit_numeros_de_noeuds():
+    # Les nœuds 0 et 1 ne désignent pas les variables u_0 et u_1
+    model = cp_model.CpModel()
+    u = [model.NewBoolVar(f"u_{i}") for i in range(3)]
+    a, b, c = (model.NewBoolVar(nom) for nom in ("a", "b", "c"))
+    model.AddCircuit([(0, 1, a), (1, 0, b), (0, 0, c)])
+    assert libres(model) == ["u_0", "u_1", "u_2"]
+
+
+def test_routes_numeros_de_noeuds():
+    model = cp_model.CpModel()
+    u = [model.NewBoolVar(f"u_{i}") for i in range(2)]
+    a, b = model.NewBoolVar("a"), model.NewBoolVar("b")
+    model.AddMultipleCircuit([(0, 1, a), (1, 0, b)])
+    assert libres(model) == ["u_0", "u_1"]
+
+
+def test_inverse_et_reservoir():
+    model = cp_model.CpModel()
+    directs = [model.NewIntVar(0, 1, f"direct_{i}") for i in range(2)]
+    inverses = [model.NewIntVar(0, 1, f"inverse_{i}") for i in range(2)]
+    model.AddInverse(directs, inverses)
+
+    temps = model.NewIntVar(0, 10, "temps")
+    actif = model.NewBoolVar("actif")
+    model.AddReservoirConstraintWithActive([temps], [2], [actif], 0, 5)
+    model.NewBoolVar("libre")
+    assert libres(model) == ["libre"]
+
+
+def test_presence_d_intervalle_lue_par_no_overlap():
+    model = cp_model.CpModel()
+    presences = [model.NewBoolVar(f"present_{i}") for i in range(2)]
+    intervalles = [model.NewOptionalFixedSizeIntervalVar(10 * i, 5, presences[i], f"intervalle_{i}")
+                   for i in range(2)]
+    model.AddNoOverlap(intervalles)
+    seul = model.NewBoolVar("seul")
+    model.NewOptionalFixedSizeIntervalVar(0, 5, seul, "isole")  # lu par aucune contrainte
+
+    audit = auditer_modele(model)
+    assert audit["sans_contrainte"] == []
+    assert audit["reifications_inutilisees"] == ["seul"]
+    assert audit["contraintes_par_type"] == {"interval": 3, "no_overlap": 1}
+
+
+def test_objectif_et_strategie():
+    model = cp_model.CpModel()
+    x = model.NewIntVar(0, 5, "x")
+    y = model.NewIntVar(0, 5, "y")
+    model.NewIntVar(0, 5, "z")
+    model.Minimize(x)
+    model.AddDecisionStrategy([y], cp_model.CHOOSE_FIRST, cp_model.SELECT_MIN_VALUE)
+    assert libres(model) == ["z"]
+
+
+def test_rapport_sans_avertissement():
+    model = cp_model.CpModel()
+    x = [model.NewBoolVar(f"x_{i}") for i in range(3)]
+    model.AddBoolOr(x[:2])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        rapport = rapport_audit(model, "Audit test")
+    assert rapport.startswith("Audit test: 3 variables, 1 contraintes")
+    assert "Variables sans contrainte: 1\n    x_2" in rapport
+
+
+def test_type_inconnu():
+    with pytest.raises(ValueError, match="non pris en charge"):
+        _references_contrainte("nouveau_type", None)
@@ -0,0 +1,70 @@
+"""
+Test de fumée du banc d'essai (nouvelle_approche/banc_essai.py) : quelques
+moteurs sur une journée synthétique d'une vingtaine de voyages, rapports
+JSON / CSV
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import csv
+import importlib
+import json
+import os
+
+import pytest
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MOTEURS = ["glouton", "ortools_arcs", "voyage_solver"]
+
+
+@pytest.fixture
+def banc_essai(monkeypatch):
+    # Comme PYTHONPATH=. python nouvelle_approche/banc_essai.py : nouvelle_approche
+    # en tête du chemin (gestion_voiture), racine ensuite. Les processus des
+    # essais (spawn) héritent de ce chemin pour réimporter banc_essai.
+    monkeypatch.syspath_prepend(os.path.join(RACINE, "nouvelle_approche"))
+    return importlib.import_module("banc_essai")
+
+
+def test_journee_synthetique_reproductible(banc_essai):
+    voyages = banc_essai.journee_synthetique(20, graine=3)
+    assert len(voyages) == 20
+    assert [v.hdebut for v in voyages] == sorted(v.hdebut for v in voyages)
+    assert ([(v.num_ligne, v.num_voyage, v.hdebut) for v in voyages]
+            == [(v.num_ligne, v.num_voyage, v.hdebut) for v in banc_essai.journee_synthetique(20, graine=3)])
+
+
+def test_lancer_banc_et_ecrire_rapport(banc_essai, tmp_path):
+    resultats = banc_essai.lancer_banc(MOTEURS, tailles=[20], temps_limite=5, nb_workers=1, fichiers={})
+
+    assert [(ligne["moteur"], ligne["jeu"], ligne["nb_voyages"]) for ligne in resultats] == [
+        (moteur, "synthetique_20", 20) for moteur in MOTEURS]
+    for ligne in resultats:
+        assert ligne["statut"] in ("OK", "OPTIMAL", "FEASIBLE"), ligne["message"]
+        assert ligne["voyages_non_couverts"] == 0
+        assert ligne["services_utilises"] >= 1 and ligne["temps_total"] is not None
+
+    chemin_base = str(tmp_path / "banc")
+    banc_essai.ecrire_rapport(resultats, chemin_base, {"moteurs": MOTEURS, "tailles": [20]})
+
+    with open(f"{chemin_base}.json", encoding="utf-8") as fichier:
+        rapport = json.load(fichier)
+    assert rapport["parametres"] == {"moteurs": MOTEURS, "tailles": [20]}
+    assert rapport["resultats"] == resultats
+    assert {"systeme", "python", "ortools", "nb_coeurs"} <= set(rapport["machine"])
+
+    with open(f"{chemin_base}.csv", encoding="utf-8", newline="") as fichier:
+        lignes = list(csv.DictReader(fichier, delimiter=";"))
+    assert [ligne["moteur"] for ligne in lignes] == MOTEURS
+    assert list(lignes[0]) == banc_essai.COLONNES_RAPPORT
+
+
+def test_moteur_inconnu_et_taille_max(banc_essai):
+    with pytest.raises(ValueError, match="Moteur"):
+        banc_essai.lancer_banc(["glouton", "simplexe"], tailles=[20], fichiers={})
+
+    # Au-delà de TAILLE_MAX, l'essai est ignoré sans lancer de processus
+    voyages = banc_essai.journee_synthetique(banc_essai.TAILLE_MAX["odm"] + 1)
+    ligne = banc_essai.executer_essai("odm", "synthetique", voyages)
+    assert ligne["statut"] == "IGNORE" and ligne["temps_total"] is None
@@ -0,0 +1,111 @@
+"""
+Tests de la décomposition en sous-problèmes indépendants (decomposition.py)
+et de son usage par optimiser_affectation (nouvelle_approche)
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from decomposition import composantes_independantes, resoudre_composantes
+from objet import voyage, service_agent
+
+
+def creer_service(num, debut, fin):
+    service = service_agent(num_service=num)
+    service.heure_debut_max = debut
+    service.heure_fin_max = fin
+    return service
+
+
+def test_composantes_plages_disjointes():
+    # Voyages 0-1 admissibles dans le service 0, 2-3 dans le service 1, 4 nulle part
+    admissible = {(0, 0), (1, 0), (2, 1), (3, 1)}
+    composantes = composantes_independantes(5, 2, lambda i, j: (i, j) in admissible)
+    assert composantes == [([0, 1], [0]), ([2, 3], [1]), ([4], [])]
+
+
+def test_composantes_service_sans_limite_relie_tout():
+    admissible = {(0, 0), (1, 1), (0, 2), (1, 2)}
+    composantes = composantes_independantes(2, 3, lambda i, j: (i, j) in admissible)
+    assert composantes == [([0, 1], [0, 1, 2])]
+
+
+def test_resoudre_composantes_ordre_et_journaux(capsys):
+    stdout = sys.stdout
+
+    def resoudre(composante, sortie):
+        voyages, _ = composante
+        assert sys.stdout is stdout  # jamais remplacé pendant la résolution
+        for k in range(3):
+            print(f"groupe {voyages[0]} ligne {k}", file=sortie)
+            time.sleep(0.01)
+        return sum(voyages)
+
+    composantes = [([0, 1], [0]), ([2, 3], [1]), ([4], [2])]
+    assert resoudre_composantes(composantes, resoudre, max_workers=3) == [1, 5, 4]
+    assert sys.stdout is stdout
+
+    # Journaux regroupés par composante, dans l'ordre des composantes
+    lignes = [ligne for ligne in capsys.readouterr().out.splitlines() if ligne.startswith("groupe")]
+    assert lignes == [f"groupe {g} ligne {k}" for g in (0, 2, 4) for k in range(3)]
+
+
+def test_resoudre_composantes_appels_concurrents(capsys):
+    # Deux décompositions en même temps (thread Tk + tâche de fond) : journaux séparés
+    stdout = sys.stdout
+    barriere = threading.Barrier(4)
+
+    def resoudre(nom):
+        def resoudre_composante(composante, sortie):
+            barriere.wait(timeout=5)
+            print(f"{nom} {composante[0][0]}", file=sortie)
+            return nom
+        return resoudre_composantes([([0], [0]), ([1], [1])], resoudre_composante, max_workers=2)
+
+    with ThreadPoolExecutor(max_workers=2) as executeur:
+        assert list(executeur.map(resoudre, ["a", "b"])) == [["a", "a"], ["b", "b"]]
+
+    sortie = capsys.readouterr().out
+    for nom in ("a", "b"):
+        # Chaque appel affiche ses deux groupes dans l'ordre, lignes intactes
+        assert f"{nom} 0\n" in sortie and f"{nom} 1\n" in sortie
+        assert sortie.index(f"{nom} 0") < sortie.index(f"{nom} 1")
+    assert sys.stdout is stdout
+
+
+def test_resoudre_composante_unique_ecrit_directement(capsys):
+    assert resoudre_composantes([([0], [0])], lambda c, sortie: print("direct", file=sortie)) == [None]
+    assert capsys.readouterr().out == "direct\n"
+
+
+def test_optimiser_affectation_garde_un_voyage_verrouille_hors_plage(gestion_voiture):
+    matin = [
+        voyage("L1", 1, "GARE1", "MAIR1", "06:00", "06:30"),
+        voyage("L1", 2, "MAIR1", "GARE1", "06:40", "07:10"),
+    ]
+    apres_midi = [
+        voyage("L1", 3, "GARE1", "MAIR1", "11:00", "11:30"),
+        voyage("L1", 4, "MAIR1", "GARE1", "11:40", "12:10"),
+    ]
+    # Voyage placé à la main dans le service du matin, dans la plage de l'après-midi
+    verrouille = voyage("L1", 5, "GARE1", "MAIR1", "12:20", "12:50")
+
+    service_matin = creer_service(1, 5 * 60, 10 * 60)
+    service_matin.ajouter_voyage(verrouille)
+    service_apres_midi = creer_service(2, 10 * 60 + 30, 14 * 60)
+
+    voyages = matin + apres_midi + [verrouille]
+    services = [service_matin, service_apres_midi]
+    success, resultats = gestion_voiture.optimiser_affectation(
+        voyages, services, battement_min=5, battement_max=60, temps_limite=5, decomposer=True
+    )
+
+    assert success
+    assert verrouille in service_matin.voyages
+    assert verrouille not in service_apres_midi.voyages
+    assert set(apres_midi) <= set(service_apres_midi.voyages)
@@ -0,0 +1,56 @@
+"""
+Tests du dédoublonnage des solutions (dedoublonnage.py)
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+from dedoublonnage import signature_planning, distance_plannings, FiltreSolutions
+
+
+def test_signature_ignore_la_numerotation():
+    a = signature_planning([("matin", [3, 1]), ("matin", [2]), ("soir", [5, 4]), ("matin", [])])
+    b = signature_planning([("soir", [4, 5]), ("matin", [2]), ("matin", [1, 3])])
+    assert a == b
+    assert a == (("matin", (1, 3)), ("matin", (2,)), ("soir", (4, 5)))
+
+
+def test_signature_distingue_les_etiquettes():
+    a = signature_planning([("matin", [1, 2]), ("soir", [3])])
+    b = signature_planning([("soir", [1, 2]), ("matin", [3])])
+    assert a != b
+    # Même regroupement mais services non interchangeables : tous les voyages changent de service
+    assert distance_plannings(a, b) == 3
+
+
+def test_distance_plannings():
+    base = signature_planning([(0, [1, 2, 3]), (0, [4, 5])])
+    assert distance_plannings(base, base) == 0
+    # Un voyage changé de service
+    assert distance_plannings(base, signature_planning([(0, [1, 2]), (0, [3, 4, 5])])) == 1
+    # Un voyage retiré (non affecté)
+    assert distance_plannings(base, signature_planning([(0, [1, 2, 3]), (0, [4])])) == 1
+    # Deux services échangés : même planning
+    assert distance_plannings(base, signature_planning([(0, [4, 5]), (0, [1, 2, 3])])) == 0
+    # Tout dans un seul service : le plus petit groupe est déplacé
+    assert distance_plannings(base, signature_planning([(0, [1, 2, 3, 4, 5])])) == 2
+    assert distance_plannings((), base) == 5
+
+
+def test_filtre_rejette_les_doublons():
+    filtre = FiltreSolutions()
+    assert filtre.ajouter(signature_planning([(0, [1, 2]), (0, [3])]))
+    assert not filtre.ajouter(signature_planning([(0, [3]), (0, [2, 1])]))
+    assert filtre.ajouter(signature_planning([(0, [1]), (0, [2, 3])]))
+    assert filtre.nb_rejetees == 1
+    assert len(filtre.retenues) == 2
+
+
+def test_filtre_mouvements_min():
+    filtre = FiltreSolutions(mouvements_min=2)
+    assert filtre.ajouter(signature_planning([(0, [1, 2, 3]), (0, [4, 5, 6])]))
+    # Un seul voyage déplacé : trop proche
+    assert not filtre.ajouter(signature_planning([(0, [1, 2]), (0, [3, 4, 5, 6])]))
+    # Deux voyages échangés : assez différent
+    assert filtre.ajouter(signature_planning([(0, [1, 2, 4]), (0, [3, 5, 6])]))
+    assert filtre.nb_rejetees == 1
@@ -0,0 +1,134 @@
+"""
+Tests de AdvancedODMSolver (gestion_contrainte.py) : chaînes de la
+génération de colonnes comparées à l'énumération complète, graphe mis en
+cache et tentatives randomisées dans un pool de processus
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import pytest
+
+import gestion_contrainte
+from gestion_contrainte import AdvancedODMSolver
+
+NB_MATIN, NB_APREM = 2, 1
+
+
+def navette(debut, nb_voyages, depart="GARE1", arrivee="MAIRE"):
+    """Allers-retours de 30 min séparés de 10 min de pause"""
+    trajets = []
+    for k in range(nb_voyages):
+        a, b = (depart, arrivee) if k % 2 == 0 else (arrivee, depart)
+        trajets.append({"start": debut + 40 * k, "end": debut + 40 * k + 30, "from": a, "to": b})
+    return trajets
+
+
+def trajets_journee():
+    # 13 voyages : deux navettes le matin, une l'après-midi
+    return navette(6 * 60, 5) + navette(6 * 60 + 20, 4) + navette(13 * 60, 4)
+
+
+def creer_solveur(trajets=None):
+    solveur = AdvancedODMSolver(trajets if trajets is not None else trajets_journee())
+    # Services courts pour garder une énumération complète petite
+    solveur.MIN_SERVICE_DURATION = 2 * 60
+    solveur.MAX_SERVICE_DURATION = 4 * 60
+    solveur.SEARCH_WORKERS = 1
+    return solveur
+
+
+def trajets_couverts(solveur, chaines):
+    noon = 12 * 60
+    matin = [c for c in chaines if c['start_time'] < noon]
+    apres_midi = [c for c in chaines if c['start_time'] >= noon]
+    solution = solveur._solve_with_constraints(matin, apres_midi, NB_MATIN, NB_APREM)
+    assert solution is not None
+    return len(solveur.trips) - len(solution['orphelins'])
+
+
+def test_chaines_generees_valides():
+    solveur = creer_solveur()
+    chaines = solveur._generate_chains_column_generation(NB_MATIN, NB_APREM)
+    assert chaines
+
+    enumerees = {tuple(c['trip_indices']) for c in solveur.iter_valid_chains()}
+    for chaine in chaines:
+        indices = chaine['trip_indices']
+        # Chemin du graphe, amplitude et HLP dans les limites : la vérification stricte l'accepte
+        assert all(solveur.graphe.compatible(i, j) for i, j in zip(indices, indices[1:]))
+        assert solveur._try_build_chain_strict(indices) == chaine
+        assert len(indices) <= 10 and tuple(indices) in enumerees
+
+
+def test_generation_colonnes_meme_couverture_que_enumeration():
+    solveur = creer_solveur()
+    enumeration = solveur._generate_chains(NB_MATIN, NB_APREM, "enumeration")
+    colonnes = solveur._generate_chains(NB_MATIN, NB_APREM, "column_generation")
+
+    # Pool plus petit, même couverture optimale (tous les voyages ici)
+    assert len(colonnes) < len(enumeration)
+    assert trajets_couverts(solveur, colonnes) == trajets_couverts(solveur, enumeration) == len(solveur.trips)
+
+
+def test_maitre_lp_pool_vide():
+    solveur = creer_solveur()
+    valeur, duales_voyages, duales_nombres = solveur._solve_master_lp([], NB_MATIN, NB_APREM)
+    # Pool vide : seuls les écarts (grand M) comptent, aucune duale de voyage
+    assert valeur == pytest.approx(-(len(solveur.trips) + 1) * (NB_MATIN + NB_APREM))
+    assert duales_voyages == [0] * len(solveur.trips)
+    # Chaque chaîne manquante coûte le grand M : toute chaîne a un coût réduit positif
+    assert duales_nombres == {'matin': -(len(solveur.trips) + 1), 'apres_midi': -(len(solveur.trips) + 1)}
+
+
+def test_mode_inconnu():
+    with pytest.raises(ValueError):
+        creer_solveur()._generate_chains(NB_MATIN, NB_APREM, "tout")
+
+
+def test_graphe_reconstruit_si_les_reglages_changent():
+    solveur = creer_solveur()
+    graphe = solveur.graphe
+    assert solveur.graphe is graphe
+
+    # Pauses de 10 min entre allers-retours : plus aucun enchaînement à 15 min minimum
+    solveur.MIN_PAUSE = 15
+    assert solveur.graphe is not graphe
+    assert solveur.graphe.nb_arcs() < graphe.nb_arcs()
+
+    solveur.hlp_connections = solveur.hlp_connections + [{"from": "MAIRE", "to": "GARE1", "duration": 5}]
+    avec_hlp = solveur.graphe
+    assert avec_hlp.hlp and solveur.graphe is avec_hlp
+
+
+def test_initialiser_tentatives_reglages_et_graphe():
+    parent = creer_solveur()
+    parent.MIN_PAUSE = 8
+    cache = (parent._reglages_graphe(), parent.graphe)
+    gestion_contrainte._initialiser_tentatives(parent.trips, parent.reglages(), cache, [], [], NB_MATIN, NB_APREM)
+
+    solveur = gestion_contrainte._CONTEXTE_TENTATIVES['solver']
+    assert solveur.MIN_SERVICE_DURATION == parent.MIN_SERVICE_DURATION and solveur.MIN_PAUSE == 8
+    assert solveur.SEARCH_WORKERS == 1
+    assert solveur.graphe is parent.graphe  # pas de reconstruction dans le processus
+
+    # Cache construit avec d'autres réglages : le processus reconstruit son graphe
+    parent.MIN_PAUSE = 15
+    gestion_contrainte._initialiser_tentatives(parent.trips, parent.reglages(), cache, [], [], NB_MATIN, NB_APREM)
+    solveur = gestion_contrainte._CONTEXTE_TENTATIVES['solver']
+    assert solveur.graphe is not cache[1]
+    assert solveur.graphe.successeurs == parent.graphe.successeurs
+
+
+def test_pool_processus_comme_sequentiel():
+    def signatures(max_processus):
+        solveur = creer_solveur()
+        solveur.MAX_PROCESSES = max_processus
+        chaines = solveur._generate_chains(NB_MATIN, NB_APREM, "enumeration")
+        matin = [c for c in chaines if c['start_time'] < 12 * 60]
+        apres_midi = [c for c in chaines if c['start_time'] >= 12 * 60]
+        solutions = solveur._iter_randomized_solutions(matin, apres_midi, NB_MATIN, NB_APREM, range(4))
+        return sorted(solveur._get_solution_signature(solution) for solution in solutions)
+
+    # Une recherche CP-SAT à un worker et graine fixe est déterministe
+    assert signatures(2) == signatures(1)
@@ -0,0 +1,232 @@
+"""
+Tests du graphe de compatibilité (graphe_compatibilite.py)
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import random
+from itertools import combinations
+
+from graphe_compatibilite import GrapheCompatibilite
+
+
+def creer_graphe(debuts, fins, arrets_debut=None, arrets_fin=None, **options):
+    n = len(debuts)
+    return GrapheCompatibilite(
+        debuts=debuts,
+        fins=fins,
+        arrets_debut=arrets_debut or ["A"] * n,
+        arrets_fin=arrets_fin or ["A"] * n,
+        **options
+    )
+
+
+def cliques(graphe):
+    return sorted(sorted(clique) for clique in graphe.cliques_chevauchement())
+
+
+def cliques_brutes(graphe):
+    """Cliques maximales par force brute : ensembles de voyages actifs à chaque instant."""
+    instants = sorted(set(graphe.debuts) | set(graphe.fins))
+    groupes = set()
+    for t in instants:
+        # Voyages actifs à t (intervalles ouverts à droite) et voyages de durée nulle à t
+        actifs = frozenset(
+            i for i in range(graphe.n)
+            if graphe.debuts[i] <= t < graphe.fins[i] or graphe.debuts[i] == graphe.fins[i] == t
+        )
+        # Un voyage de durée nulle ne chevauche que les voyages qui l'encadrent strictement
+        for i in [i for i in actifs if graphe.debuts[i] == graphe.fins[i]]:
+            groupes.add(frozenset(
+                k for k in actifs
+                if k == i or graphe.debuts[k] < t < graphe.fins[k]
+            ))
+        groupes.add(frozenset(k for k in actifs if graphe.debuts[k] < graphe.fins[k]))
+    maximales = [g for g in groupes if len(g) >= 2 and not any(g < autre for autre in groupes)]
+    return sorted(sorted(g) for g in maximales)
+
+
+# ----------------------------------------------------------------------
+# Cliques de chevauchement
+# ----------------------------------------------------------------------
+
+def test_cliques_voyage_de_duree_nulle_isole():
+    graphe = creer_graphe(debuts=[0, 60, 120, 200], fins=[0, 100, 150, 250])
+    assert cliques(graphe) == []
+
+
+def test_cliques_voyage_de_duree_nulle_encadre():
+    # Le voyage 1 (durée nulle à 30) est dans le voyage 0 ; le voyage 2 part après
+    graphe = creer_graphe(debuts=[0, 30, 60], fins=[60, 30, 90])
+    assert cliques(graphe) == [[0, 1]]
+    assert graphe.chevauchent(0, 1) and not graphe.chevauchent(1, 2)
+
+
+def test_cliques_voyage_de_duree_nulle_au_bord():
+    # Durée nulle exactement à la fin du voyage 0 et au début du voyage 2
+    graphe = creer_graphe(debuts=[0, 60, 60], fins=[60, 60, 90])
+    assert cliques(graphe) == []
+
+
+def test_cliques_intervalles_contigus():
+    # Un voyage qui finit à 7h00 ne chevauche pas celui qui part à 7h00
+    graphe = creer_graphe(debuts=[0, 60, 120], fins=[60, 120, 180])
+    assert cliques(graphe) == []
+
+
+def test_cliques_maximales():
+    graphe = creer_graphe(debuts=[0, 10, 20, 50], fins=[30, 40, 60, 70])
+    assert cliques(graphe) == [[0, 1, 2], [2, 3]]
+
+
+def test_cliques_coherentes_avec_chevauchent():
+    debuts = [0, 5, 5, 10, 20, 20, 35, 40, 40]
+    fins = [10, 20, 5, 30, 20, 45, 40, 40, 60]
+    graphe = creer_graphe(debuts, fins)
+    assert cliques(graphe) == cliques_brutes(graphe)
+
+    # Chaque paire qui se chevauche est couverte par une clique, et inversement
+    paires = set()
+    for clique in graphe.cliques_chevauchement():
+        paires.update(combinations(sorted(clique), 2))
+    attendues = {(i, j) for i, j in combinations(range(graphe.n), 2) if graphe.chevauchent(i, j)}
+    assert paires == attendues
+
+
+# ----------------------------------------------------------------------
+# Paires successives / incompatibles (matrices NumPy)
+# ----------------------------------------------------------------------
+
+def graphe_journee():
+    debuts = [360, 370, 400, 420, 420, 455, 480, 500, 530, 600, 610, 610]
+    fins = [390, 395, 430, 450, 420, 490, 510, 540, 560, 640, 650, 610]
+    arrets_debut = ["GAR", "MAI", "GAR", "MAI", "GAR", "GAR", "MAI", "GAR", "MAI", "GAR", "MAI", "MAI"]
+    arrets_fin = ["MAI", "GAR", "MAI", "GAR", "GAR", "MAI", "GAR", "MAI", "GAR", "MAI", "GAR", "MAI"]
+    return creer_graphe(debuts, fins, arrets_debut, arrets_fin, battement_min=5, battement_max=60)
+
+
+def test_paires_successives_brute_force():
+    graphe = graphe_journee()
+    attendues = [
+        (i, j) for i in range(graphe.n) for j in graphe.ordre
+        if j != i and graphe.debuts[j] >= graphe.fins[i]
+    ]
+    assert list(graphe.paires_successives()) == attendues
+
+
+def test_paires_battement_et_arrets_brute_force():
+    graphe = graphe_journee()
+    successives = list(graphe.paires_successives())
+    assert list(graphe.paires_battement_invalide()) == [
+        (i, j) for i, j in successives if not graphe.battement_valide(i, j)
+    ]
+    assert list(graphe.paires_arrets_incompatibles()) == [
+        (i, j) for i, j in successives if graphe.battement_valide(i, j) and not graphe.compatible(i, j)
+    ]
+    assert graphe.nb_arcs() > 0
+
+
+def test_paires_incompatibles_brute_force():
+    graphe = graphe_journee()
+    attendues = [
+        (i, j) for i in range(graphe.n) for j in range(i + 1, graphe.n)
+        if not graphe.compatible(i, j) and not graphe.compatible(j, i)
+    ]
+    assert list(graphe.paires_incompatibles()) == attendues
+
+
+def test_battement_max_nul_sans_limite():
+    # Comme l'ancien test "if battement_max and ...", 0 veut dire pas de limite
+    debuts, fins = [0, 40, 200], [30, 70, 230]
+    sans_limite = creer_graphe(debuts, fins, battement_min=5)
+    nul = creer_graphe(debuts, fins, battement_min=5, battement_max=0)
+    assert nul.battement_max is None
+    assert nul.successeurs == sans_limite.successeurs == [[1, 2], [2], []]
+    assert list(nul.paires_battement_invalide()) == []
+
+
+def test_battement_min_negatif_meme_regle():
+    # battement_min < 0 : les deux chemins (paire par paire et matrice) gardent la même règle
+    graphe = creer_graphe([0, 25, 40], [30, 50, 60], battement_min=-10, battement_max=20)
+    successives = list(graphe.paires_successives())
+    assert list(graphe.paires_battement_invalide()) == [
+        (i, j) for i, j in successives if not graphe.battement_valide(i, j)
+    ]
+    assert not graphe.battement_valide(0, 1)  # chevauchement : jamais valide
+
+
+def test_paires_graphe_vide():
+    graphe = creer_graphe([], [])
+    assert list(graphe.paires_successives()) == []
+    assert list(graphe.paires_incompatibles()) == []
+
+
+# ----------------------------------------------------------------------
+# Couverture minimale par chemins
+# ----------------------------------------------------------------------
+
+def couverture_brute(graphe):
+    """n - couplage maximum (voyage → successeur) par force brute."""
+    meilleur = 0
+
+    def parcourir(i, successeurs_pris, taille):
+        nonlocal meilleur
+        if i == graphe.n:
+            meilleur = max(meilleur, taille)
+            return
+        parcourir(i + 1, successeurs_pris, taille)
+        for j in graphe.successeurs[i]:
+            if j not in successeurs_pris:
+                parcourir(i + 1, successeurs_pris | {j}, taille + 1)
+
+    parcourir(0, frozenset(), 0)
+    return graphe.n - meilleur
+
+
+def verifier_chaines(graphe, chaines):
+    assert sorted(i for chaine in chaines for i in chaine) == list(range(graphe.n))
+    for chaine in chaines:
+        for i, j in zip(chaine, chaine[1:]):
+            assert graphe.compatible(i, j)
+
+
+def test_couverture_minimale_optimum_connu():
+    # Deux navettes GAR <-> MAI décalées : 2 services suffisent, le voyage 6 en ajoute un
+    debuts = [360, 370, 400, 410, 440, 450, 380]
+    fins = [390, 400, 430, 440, 470, 480, 460]
+    arrets_debut = ["GAR", "MAI", "MAI", "GAR", "GAR", "MAI", "DEP"]
+    arrets_fin = ["MAI", "GAR", "GAR", "MAI", "MAI", "GAR", "DEP"]
+    graphe = creer_graphe(debuts, fins, arrets_debut, arrets_fin, battement_min=5, battement_max=60)
+
+    chaines = graphe.couverture_minimale()
+    verifier_chaines(graphe, chaines)
+    assert sorted(chaines) == [[0, 2, 4], [1, 3, 5], [6]]
+    assert graphe.borne_inferieure_services() == 3
+
+
+def test_couverture_minimale_brute_force():
+    graphe = graphe_journee()
+    chaines = graphe.couverture_minimale()
+    verifier_chaines(graphe, chaines)
+    assert len(chaines) == couverture_brute(graphe)
+
+
+def test_couverture_minimale_graphes_aleatoires():
+    rng = random.Random(3)
+    for _ in range(40):
+        n = rng.randint(1, 9)
+        debuts = [rng.randrange(0, 120, 10) for _ in range(n)]
+        fins = [d + rng.choice([0, 10, 20]) for d in debuts]
+        arrets_debut = [rng.choice("AB") for _ in range(n)]
+        arrets_fin = [rng.choice("AB") for _ in range(n)]
+        graphe = creer_graphe(debuts, fins, arrets_debut, arrets_fin, battement_min=0, battement_max=40)
+        chaines = graphe.couverture_minimale()
+        verifier_chaines(graphe, chaines)
+        assert len(chaines) == couverture_brute(graphe)
+
+
+def test_couverture_minimale_sans_arc():
+    graphe = creer_graphe(debuts=[0, 10, 20], fins=[30, 40, 50])
+    assert sorted(graphe.couverture_minimale()) == [[0], [1], [2]]
+    assert creer_graphe([], []).couverture_minimale() == []
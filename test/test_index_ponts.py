@@ -0,0 +1,73 @@
+"""
+Tests de IndexPonts (graphe_compatibilite.py) contre le parcours complet
+de voyages_compatibles (test/entrainementsolveria3.py)
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import random
+
+from graphe_compatibilite import GrapheCompatibilite, IndexPonts
+from objet import voyage
+
+
+def heure(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def journee_aleatoire(graine, nb_voyages=40):
+    """Voyages entre trois arrêts, dont quelques voyages de durée nulle."""
+    rng = random.Random(graine)
+    arrets = ["GARE1", "MAIR1", "HOPI1"]
+    voyages = []
+    for k in range(nb_voyages):
+        debut = rng.randrange(360, 600, 5)
+        duree = rng.choice([0, 10, 20, 30])
+        voyages.append(voyage("L1", k + 1, rng.choice(arrets), rng.choice(arrets),
+                              heure(debut), heure(debut + duree)))
+    return voyages
+
+
+def test_index_ponts_comme_parcours_complet(entrainement):
+    voyages_compatibles = entrainement.voyages_compatibles
+
+    for graine in range(5):
+        voyages = journee_aleatoire(graine)
+        index = IndexPonts.depuis_voyages(voyages)
+        graphe = GrapheCompatibilite.depuis_voyages(voyages, battement_min=5, battement_max=90, ponts=True)
+
+        nb_ponts = 0
+        for i, v1 in enumerate(voyages):
+            for j, v2 in enumerate(voyages):
+                if i == j:
+                    continue
+                attendu = voyages_compatibles(v1, v2, voyages, 5, 90)
+                assert voyages_compatibles(v1, v2, voyages, 5, 90, index_ponts=index) == attendu
+                assert graphe.compatible(i, j) == attendu
+                if attendu and v1.arret_fin_id() != v2.arret_debut_id():
+                    nb_ponts += 1
+        # Le cas du voyage pont est bien exercé
+        assert nb_ponts > 0
+
+
+def test_index_ponts_exclut_les_extremites():
+    # Le seul voyage GAR -> MAI entre les deux est v1 lui-même : pas de pont
+    v1 = voyage("L1", 1, "GARE1", "MAIR1", "06:00", "06:00")
+    v2 = voyage("L1", 2, "MAIR1", "GARE1", "06:30", "07:00")
+    index = IndexPonts.depuis_voyages([v1, v2])
+    assert not index.pont_entre(v1, voyage("L1", 3, "MAIR1", "GARE1", "06:10", "06:40"))
+    assert index.trouver("GAR", "MAI", 0, 24 * 60, exclus=(0,)) is None
+    assert index.trouver("GAR", "MAI", 0, 24 * 60) == 0
+
+
+def test_index_ponts_fenetre():
+    ponts = [
+        voyage("L1", 1, "GARE1", "MAIR1", "06:00", "06:40"),
+        voyage("L1", 2, "GARE1", "MAIR1", "06:10", "06:20"),
+        voyage("L1", 3, "GARE1", "MAIR1", "06:30", "07:30"),
+    ]
+    index = IndexPonts.depuis_voyages(ponts)
+    assert index.trouver("GAR", "MAI", 360, 380) == 1
+    assert index.trouver("GAR", "MAI", 375, 420) is None
+    assert index.trouver("MAI", "GAR", 0, 24 * 60) is None
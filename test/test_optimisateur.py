@@ -0,0 +1,89 @@
+"""
+Tests de OptimisateurServices (nouvelle_approche/gestion_voiture.py) :
+mode "arcs" (AddCircuit) sur une journée d'optimum connu, comparé au
+mode "paires"
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import io
+
+import pytest
+
+from graphe_compatibilite import GrapheCompatibilite
+from objet import voyage, service_agent
+
+
+def journee():
+    # Deux navettes GARE <-> MAIRIE décalées et un voyage de dépôt isolé :
+    # couverture minimale = 3 services, 6 voyages au mieux avec 2 services
+    return [
+        voyage("L1", 1, "GARE1", "MAIR1", "06:00", "06:30"),
+        voyage("L1", 2, "MAIR1", "GARE1", "06:10", "06:40"),
+        voyage("L1", 3, "MAIR1", "GARE1", "06:40", "07:10"),
+        voyage("L1", 4, "GARE1", "MAIR1", "06:50", "07:20"),
+        voyage("L1", 5, "GARE1", "MAIR1", "07:20", "07:50"),
+        voyage("L1", 6, "MAIR1", "GARE1", "07:30", "08:00"),
+        voyage("L2", 7, "DEPOT", "DEPOT", "06:20", "07:40"),
+    ]
+
+
+def resoudre(gestion_voiture, mode, nb_services):
+    voyages = journee()
+    services = [service_agent(num_service=k + 1) for k in range(nb_services)]
+    optimiseur = gestion_voiture.OptimisateurServices(
+        voyages, services, battement_min=5, battement_max=60, temps_limite=10,
+        mode=mode, journal=False
+    )
+    success, resultats = optimiseur.resoudre()
+    assert success
+    return voyages, resultats
+
+
+def test_arcs_atteint_la_couverture_minimale(gestion_voiture):
+    voyages, resultats = resoudre(gestion_voiture, "arcs", nb_services=3)
+    assert resultats['nb_affectes'] == len(voyages)
+
+    # Chaque service est une chaîne d'enchaînements possibles
+    graphe = GrapheCompatibilite.depuis_voyages(voyages, battement_min=5, battement_max=60)
+    assert graphe.borne_inferieure_services() == 3
+    for indices in resultats['affectations'].values():
+        indices = sorted(indices, key=lambda i: voyages[i].hdebut)
+        for i, j in zip(indices, indices[1:]):
+            assert graphe.compatible(i, j)
+
+
+def test_paires_interdit_les_voyages_relies_par_un_intermediaire(gestion_voiture):
+    # 1 -> 3 -> 5 est valide, mais 1 et 5 (MAIR / GARE) sont interdits deux à deux
+    _, resultats_paires = resoudre(gestion_voiture, "paires", nb_services=3)
+    _, resultats_arcs = resoudre(gestion_voiture, "arcs", nb_services=3)
+    assert resultats_paires['nb_affectes'] < resultats_arcs['nb_affectes']
+
+
+def test_arcs_services_insuffisants(gestion_voiture):
+    _, resultats = resoudre(gestion_voiture, "arcs", nb_services=2)
+    assert resultats['nb_affectes'] == 6
+
+
+def test_mode_inconnu(gestion_voiture):
+    with pytest.raises(ValueError):
+        gestion_voiture.OptimisateurServices(journee(), [], mode="flot")
+
+
+def test_exclusions_horaires_rapportees(gestion_voiture):
+    voyages = journee()
+    services = [service_agent(num_service=k + 1) for k in range(3)]
+    # Plage 06:00-07:15 : les voyages 4, 5, 6 et 7 finissent trop tard
+    services[0].heure_debut_max, services[0].heure_fin_max = 6 * 60, 7 * 60 + 15
+    # Voyage 1 verrouillé dans le service 3 : exclu des deux autres
+    services[2].ajouter_voyage(voyages[0])
+
+    journal = io.StringIO()
+    optimiseur = gestion_voiture.OptimisateurServices(voyages, services, battement_min=5, sortie=journal)
+    optimiseur.calculer_admissibles()
+
+    assert optimiseur.services_admissibles[0] == [2]
+    assert optimiseur.admissibles[0] == [1, 2]
+    assert "4 exclusions horaires, 2 par verrou" in journal.getvalue()
+    assert "Aucune contrainte horaire" not in journal.getvalue()
@@ -0,0 +1,59 @@
+"""
+Tests des profils de paramètres CP-SAT (profils_solveur.py) : seuils de
+taille du profil "auto" et réglages appliqués au solveur
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import pytest
+from ortools.sat.python import cp_model
+
+from profils_solveur import (PROFILS, SEUIL_GRAND_MODELE, SEUIL_PETIT_MODELE,
+                             configurer_solveur, parametres_auto, taille_modele)
+
+
+def modele_de_taille(taille):
+    """Modèle de taille variables + contraintes donnée (une contrainte, le reste en variables)"""
+    model = cp_model.CpModel()
+    x = [model.NewBoolVar(f"x{i}") for i in range(taille - 1)]
+    model.AddBoolOr(x[:2])
+    return model
+
+
+def test_taille_modele():
+    assert taille_modele(modele_de_taille(10)) == 10
+
+
+@pytest.mark.parametrize("taille, attendu", [
+    (SEUIL_PETIT_MODELE - 1, PROFILS["approfondi"]),
+    (SEUIL_PETIT_MODELE, PROFILS["equilibre"]),
+    (SEUIL_GRAND_MODELE, PROFILS["equilibre"]),
+    (SEUIL_GRAND_MODELE + 1, {"cp_model_probing_level": 0}),
+])
+def test_parametres_auto_seuils(taille, attendu):
+    assert parametres_auto(modele_de_taille(taille)) == attendu
+
+
+def test_configurer_solveur_auto_petit_modele():
+    solver = cp_model.CpSolver()
+    description = configurer_solveur(solver, modele_de_taille(10), temps_limite=5, nb_workers=3)
+    assert solver.parameters.linearization_level == 2
+    assert solver.parameters.max_time_in_seconds == 5
+    assert solver.parameters.num_search_workers == 3
+    assert not solver.parameters.enumerate_all_solutions
+    assert description.startswith("profil auto (linearization_level=2)")
+
+
+def test_configurer_solveur_enumeration_un_worker():
+    solver = cp_model.CpSolver()
+    configurer_solveur(solver, modele_de_taille(10), "rapide", enumerer=True, nb_workers=8)
+    assert solver.parameters.enumerate_all_solutions
+    assert solver.parameters.num_search_workers == 1
+    assert solver.parameters.cp_model_probing_level == 0
+    assert solver.parameters.max_presolve_iterations == 1
+
+
+def test_configurer_solveur_profil_inconnu():
+    with pytest.raises(ValueError, match="Profil inconnu"):
+        configurer_solveur(cp_model.CpSolver(), modele_de_taille(10), "turbo")
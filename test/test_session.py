@@ -0,0 +1,139 @@
+"""
+Tests de SessionOptimisation (nouvelle_approche/gestion_voiture.py) :
+deltas, validité de la session, indices et arcs manuels du mode "arcs"
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import pytest
+from ortools.sat.python import cp_model
+
+from objet import voyage, service_agent
+
+
+def heure(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def creer_services(nb):
+    return [service_agent(num_service=k + 1) for k in range(nb)]
+
+
+def journee_pont_partage():
+    """
+    Deux services verrouillent chacun GARE → MAIRIE à 6h00 puis GARE → MAIRIE
+    à 7h30 : sans arc direct, seul le voyage libre MAIRIE → GARE de 6h40
+    peut les relier, et il ne peut servir qu'à un seul service.
+    """
+    voyages = [
+        voyage("L1", 1, "GARE1", "MAIR1", "06:00", "06:30"),
+        voyage("L1", 2, "GARE1", "MAIR1", "07:30", "08:00"),
+        voyage("L1", 3, "GARE1", "MAIR1", "06:00", "06:30"),
+        voyage("L1", 4, "GARE1", "MAIR1", "07:30", "08:00"),
+        voyage("L1", 5, "MAIR1", "GARE1", "06:40", "07:10"),
+    ]
+    services = creer_services(2)
+    for service, verrous in zip(services, (voyages[0:2], voyages[2:4])):
+        for v in verrous:
+            service.ajouter_voyage(v)
+    return voyages, services
+
+
+def navettes():
+    """Allers-retours GARE <-> MAIRIE de 6h00 à 9h20, aucun voyage verrouillé"""
+    voyages = []
+    for k in range(6):
+        depart, arrivee = ("GARE1", "MAIR1") if k % 2 == 0 else ("MAIR1", "GARE1")
+        debut = 6 * 60 + 40 * k
+        voyages.append(voyage("L1", k + 1, depart, arrivee, heure(debut), heure(debut + 30)))
+    return voyages
+
+
+@pytest.mark.parametrize("decomposer", [True, False])
+def test_arcs_pont_partage_garde_un_arc_manuel(gestion_voiture, decomposer):
+    voyages, services = journee_pont_partage()
+    session = gestion_voiture.SessionOptimisation(voyages, services, battement_min=5, battement_max=60, mode="arcs")
+    assert session.ruptures(0) == [(0, 1)] and session.ruptures(1) == [(2, 3)]
+
+    success, resultats = session.resoudre(temps_limite=5, decomposer=decomposer)
+    assert success
+    # Le voyage libre relie un service, l'autre garde son arc manuel
+    assert resultats['nb_affectes'] == 1
+    (j_pont, [pont]), = [(j, indices) for j, indices in resultats['affectations'].items() if indices]
+    assert pont == 4
+    autre = 1 - j_pont
+    assert resultats['ruptures'] == {autre: session.ruptures(autre)}
+
+
+def test_deltas_recalculent_les_admissibles(gestion_voiture):
+    voyages = navettes()
+    services = creer_services(2)
+    session = gestion_voiture.SessionOptimisation(voyages, services, battement_min=5, battement_max=60, mode="arcs")
+    assert session.admissibles(0) == list(range(6))
+
+    # Voyage verrouillé : plus libre, et ses voisins trop proches sortent du service
+    assert session.verrouiller(voyages[2], services[0])
+    assert 2 not in session.admissibles(0) and 2 not in session.admissibles(1)
+    assert session.verrous == {2: 0}
+    assert session.liberer(voyages[2])
+    assert session.admissibles(1) == list(range(6)) and not session.verrous
+    assert not session.liberer(voyages[2])
+
+    # Plage horaire modifiée : prise en compte après modifier_limites
+    services[1].heure_debut_max = 6 * 60
+    services[1].heure_fin_max = 7 * 60 + 30
+    assert session.modifier_limites(services[1])
+    assert session.admissibles(1) == [0, 1]
+
+    # Objets inconnus de la session
+    assert not session.verrouiller(voyage("L9", 9, "GARE1", "MAIR1", "06:00", "06:30"), services[0])
+    assert not session.modifier_limites(service_agent(num_service=9))
+
+
+def test_est_valide(gestion_voiture):
+    voyages = navettes()
+    services = creer_services(2)
+    session = gestion_voiture.SessionOptimisation(voyages, services, 5, 60, True, mode="arcs")
+    assert session.est_valide(voyages, services, 5, 60, True, "arcs")
+    assert not session.est_valide(voyages, services, 5, 60, True, "paires")
+    assert not session.est_valide(voyages, services, 10, 60, True, "arcs")
+    assert not session.est_valide(voyages[:-1], services, 5, 60, True, "arcs")
+    assert not session.est_valide(voyages, creer_services(2), 5, 60, True, "arcs")
+
+
+@pytest.mark.parametrize("mode", ["paires", "arcs"])
+def test_indice_glouton_complet_et_realisable(gestion_voiture, mode):
+    voyages = navettes()
+    services = creer_services(2)
+    services[0].ajouter_voyage(voyages[1])
+    session = gestion_voiture.SessionOptimisation(voyages, services, battement_min=5, battement_max=60, mode=mode)
+
+    indice = session.affectation_gloutonne()
+    assert indice[1] == 0  # voyage verrouillé conservé
+    model, _, _ = session._construire_modele(list(range(len(services))), indice)
+
+    # L'indice fixe toutes les variables (complet) et respecte le modèle
+    solver = cp_model.CpSolver()
+    solver.parameters.fix_variables_to_their_hinted_value = True
+    assert solver.Solve(model) in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+@pytest.mark.parametrize("mode, nb_affectes", [("paires", 2), ("arcs", 6)])
+def test_resolutions_successives(gestion_voiture, mode, nb_affectes):
+    # En mode "paires", deux allers GARE → MAIRIE ne peuvent pas partager un service
+    voyages = navettes()
+    services = creer_services(1)
+    session = gestion_voiture.SessionOptimisation(voyages, services, battement_min=5, battement_max=60, mode=mode)
+
+    success, resultats = session.resoudre(temps_limite=5)
+    assert success and resultats['nb_affectes'] == nb_affectes
+    assert session.derniere_solution == {i: 0 for i in resultats['affectations'][0]}
+
+    session.appliquer_solution(resultats)
+    assert services[0].voyages == [voyages[i] for i in sorted(resultats['affectations'][0])]
+    assert set(session.verrous) == set(resultats['affectations'][0])
+
+    # Voyages placés verrouillés : rien de plus à affecter
+    success, resultats = session.resoudre(temps_limite=5)
+    assert success and resultats['nb_affectes'] == 0
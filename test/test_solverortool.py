@@ -0,0 +1,160 @@
+"""
+Tests de VoyageSolver (TAB5/solverortool.py) : objectif lexicographique
+(nombre de services puis équité), valeur d'équité des solutions énumérées
+et temps minimum entre voyages (AddNoOverlap, coupure)
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import io
+
+from ortools.sat.python import cp_model
+
+from objet import voyage, service_agent
+
+
+def heure(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def navette(nb_voyages=4):
+    # Allers-retours GARE <-> MAIRIE enchaînables : un seul service suffit
+    voyages = []
+    for k in range(nb_voyages):
+        depart, arrivee = ("GARE1", "MAIR1") if k % 2 == 0 else ("MAIR1", "GARE1")
+        debut = 6 * 60 + 40 * k
+        voyages.append(voyage("L1", k + 1, depart, arrivee, heure(debut), heure(debut + 30)))
+    return voyages
+
+
+def services_identiques(nb_services):
+    services = []
+    for k in range(nb_services):
+        service = service_agent(num_service=k + 1)
+        service.set_limites(6 * 60, 12 * 60)
+        services.append(service)
+    return services
+
+
+def nb_services_utilises(prop):
+    return sum(1 for s in prop.service if s.get_voyages())
+
+
+def somme_ecarts(prop, nb_ideal):
+    return sum(abs(len(s.get_voyages()) - ideal) for s, ideal in zip(prop.service, nb_ideal))
+
+
+def test_equite_repartit_sur_tous_les_services(solverortool):
+    solveur = solverortool.VoyageSolver(navette(), services_identiques(2))
+    [prop] = solveur.resoudre(max_solutions=1, timeout_seconds=10)
+    assert solveur.nb_ideal == [2, 2]
+    assert nb_services_utilises(prop) == 2 and somme_ecarts(prop, solveur.nb_ideal) == 0
+
+
+def test_lexicographique_minimise_les_services(solverortool):
+    solveur = solverortool.VoyageSolver(navette(), services_identiques(2), objectif="lexicographique")
+    [prop] = solveur.resoudre(max_solutions=1, timeout_seconds=10)
+    assert nb_services_utilises(prop) == 1
+    assert prop.total_voyages() == 4
+
+
+def test_etape_services_fige_le_minimum(solverortool):
+    solveur = solverortool.VoyageSolver(navette(), services_identiques(3), objectif="lexicographique")
+    solveur._construire_modele()
+    journal = io.StringIO()
+    status = solveur._resoudre_etape_services("auto", 10, nb_workers=1, sortie=journal)
+
+    assert status == solverortool.cp_model.OPTIMAL
+    assert "1 service(s) utilisé(s) sur 3" in journal.getvalue()
+    # Seconde étape : objectif d'équité, nombre de services figé à 1
+    assert solveur.model.Proto().objective.vars
+    solver = solverortool.cp_model.CpSolver()
+    solver.parameters.num_workers = 1
+    assert solver.Solve(solveur.model) == solverortool.cp_model.OPTIMAL
+    assert sum(solver.Value(vide) for vide in solveur.vides.values()) == 2
+
+
+def test_enumeration_triee_sur_l_equite_reelle(solverortool, monkeypatch):
+    collecteurs = []
+
+    class Collecteur(solverortool.SolutionCollector):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            collecteurs.append(self)
+
+    monkeypatch.setattr(solverortool, "SolutionCollector", Collecteur)
+
+    # Avec un écart toléré, la valeur relevée doit être la somme des |d|, pas
+    # un écart gonflé jusqu'à la borne optimum + ecart_tolere
+    solveur = solverortool.VoyageSolver(navette(8), services_identiques(3))
+    propositions = solveur.resoudre(max_solutions=20, timeout_seconds=10, ecart_tolere=6)
+    [collecteur] = collecteurs
+    assert collecteur._valeurs == [somme_ecarts(prop, solveur.nb_ideal) for prop in collecteur.get_solutions()]
+
+    ecarts = [somme_ecarts(prop, solveur.nb_ideal) for prop in propositions]
+    assert len(propositions) > 1 and ecarts[0] == 0
+    assert ecarts == sorted(ecarts)
+    assert max(ecarts) <= 6
+
+
+class Enumeration(cp_model.CpSolverSolutionCallback):
+    def __init__(self, solveur, lire_affectations):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.solveur = solveur
+        self.lire_affectations = lire_affectations
+        self.solutions = []
+
+    def on_solution_callback(self):
+        self.solutions.append(self.lire_affectations(
+            self.solveur.x, len(self.solveur.voyages), len(self.solveur.services), self.Value))
+
+
+def enumerer_temps_minimum(solverortool, voyages, services):
+    """Toutes les affectations du modèle réduit à voyage unique + temps minimum"""
+    solveur = solverortool.VoyageSolver(voyages, services, temps_minimum_entre_voyages=5)
+    solveur._creer_variables()
+    solveur._contrainte_voyage_unique()
+    solveur._contrainte_temps_minimum()
+
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    solver.parameters.num_workers = 1
+    enumeration = Enumeration(solveur, solverortool.lire_affectations)
+    assert solver.Solve(solveur.model, enumeration) == cp_model.OPTIMAL
+    return solveur, enumeration.solutions
+
+
+def ensemble(solutions, v1, v2):
+    """True si v1 et v2 sont dans un même service dans au moins une solution"""
+    return any(v1 in indices and v2 in indices for affectations in solutions for indices in affectations)
+
+
+def test_temps_minimum_entre_voyages(solverortool):
+    voyages = [
+        voyage("L1", 1, "GARE1", "MAIR1", "06:00", "06:30"),
+        voyage("L1", 2, "MAIR1", "GARE1", "06:33", "07:00"),  # 3 min après le voyage 1
+        voyage("L1", 3, "MAIR1", "GARE1", "06:35", "07:05"),  # 5 min après le voyage 1
+        voyage("L1", 4, "GARE1", "MAIR1", "07:10", "07:40"),
+    ]
+    _, solutions = enumerer_temps_minimum(solverortool, voyages, services_identiques(2))
+
+    assert not ensemble(solutions, 0, 1)  # moins de temps_min
+    assert not ensemble(solutions, 1, 2)  # chevauchement
+    assert ensemble(solutions, 0, 2) and ensemble(solutions, 2, 3)  # exactement temps_min
+
+
+def test_temps_minimum_coupure(solverortool):
+    coupe = service_agent(num_service=1, type_service="coupé")
+    coupe.set_limites(6 * 60, 12 * 60)
+    coupe.set_coupure(8 * 60, 9 * 60)
+    voyages = [
+        voyage("L1", 1, "GARE1", "MAIR1", "07:30", "08:00"),  # finit au début de la coupure
+        voyage("L1", 2, "MAIR1", "GARE1", "07:50", "08:20"),  # chevauche la coupure
+        voyage("L1", 3, "MAIR1", "GARE1", "09:00", "09:30"),  # commence à la fin de la coupure
+    ]
+    solveur, solutions = enumerer_temps_minimum(solverortool, voyages, [coupe] + services_identiques(1))
+
+    assert 0 not in solveur.x[1]
+    assert solutions and all(1 not in affectations[0] for affectations in solutions)
+    assert any(affectations[0] == [0, 2] for affectations in solutions)
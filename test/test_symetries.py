@@ -0,0 +1,105 @@
+"""
+Tests du bris de symétrie entre services interchangeables (symetries.py)
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+from ortools.sat.python import cp_model
+
+from objet import service_agent
+from symetries import cle_service, groupes_services_identiques, ordonner_colonnes, ordonner_etiquettes
+
+# Partitions de 4 voyages en au plus 3 services : S(4,1) + S(4,2) + S(4,3)
+NB_PARTITIONS = 1 + 7 + 6
+
+
+class Collecteur(cp_model.CpSolverSolutionCallback):
+
+    def __init__(self, variables):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self.variables = variables
+        self.solutions = []
+
+    def on_solution_callback(self):
+        self.solutions.append(tuple(self.Value(v) for v in self.variables))
+
+
+def enumerer(model, variables):
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    collecteur = Collecteur(variables)
+    solver.Solve(model, collecteur)
+    return collecteur.solutions
+
+
+def modele_colonnes(nb_voyages, nb_services, ordre=None, indice=None):
+    """x[s][v] = voyage v dans le service s, chaque voyage dans exactement un service."""
+    model = cp_model.CpModel()
+    x = [[model.NewBoolVar(f"x_v{v}_s{s}") for v in range(nb_voyages)] for s in range(nb_services)]
+    for v in range(nb_voyages):
+        model.AddExactlyOne(x[s][v] for s in range(nb_services))
+    if ordre is not None:
+        ordonner_colonnes(model, x, ordre, indice=indice)
+    return model, [x[s][v] for s in range(nb_services) for v in range(nb_voyages)]
+
+
+def services_par_voyage(solution, nb_voyages):
+    """Service de chaque voyage dans une solution de modele_colonnes."""
+    return [solution[v::nb_voyages].index(1) for v in range(nb_voyages)]
+
+
+def test_groupes_services_identiques():
+    services = [service_agent(num_service=k) for k in range(5)]
+    services[1].type_service = "apres_midi"
+    services[3].type_service = "apres_midi"
+    services[4].heure_fin_max = 600
+
+    cles = [cle_service(s) for s in services]
+    cles[2] = None  # service déjà rempli
+    assert groupes_services_identiques(cles) == [[1, 3]]
+    assert cle_service(services[0], "arcs") != cle_service(services[0])
+
+
+def test_ordonner_colonnes_une_solution_par_partition():
+    assert len(enumerer(*modele_colonnes(4, 3))) == 3 ** 4
+
+    ordre = [2, 0, 3, 1]  # ordre chronologique des voyages
+    solutions = enumerer(*modele_colonnes(4, 3, ordre))
+    assert len(solutions) == NB_PARTITIONS
+
+    # Forme canonique : les services s'ouvrent dans l'ordre chronologique
+    for solution in solutions:
+        affectation = services_par_voyage(solution, 4)
+        ouverts = []
+        for v in ordre:
+            if affectation[v] not in ouverts:
+                ouverts.append(affectation[v])
+        assert ouverts == list(range(len(ouverts)))
+
+
+def test_ordonner_colonnes_indice_complet():
+    # Indice canonique : voyages 0, 1 dans le service 0, voyage 2 dans le service 1
+    indice = [[1, 1, 0], [0, 0, 1], [0, 0, 0]]
+    model, variables = modele_colonnes(3, 3, [0, 1, 2], indice)
+    for variable, valeur in zip(variables, (valeur for ligne in indice for valeur in ligne)):
+        model.AddHint(variable, valeur)
+
+    solver = cp_model.CpSolver()
+    solver.parameters.fix_variables_to_their_hinted_value = True
+    assert solver.Solve(model) == cp_model.OPTIMAL
+
+
+def test_ordonner_etiquettes_une_solution_par_partition():
+    model = cp_model.CpModel()
+    etiquettes = [model.NewIntVar(0, 2, f"service_v{v}") for v in range(4)]
+    ordre = [1, 3, 0, 2]
+    ordonner_etiquettes(model, etiquettes, ordre)
+
+    solutions = enumerer(model, etiquettes)
+    assert len(solutions) == NB_PARTITIONS
+    for solution in solutions:
+        maximum = -1
+        for v in ordre:
+            assert solution[v] <= maximum + 1
+            maximum = max(maximum, solution[v])
@@ -0,0 +1,106 @@
+"""
+Tests de la matrice vectorisée TripTable.matrice_successeurs
+(table_voyages.py) contre la règle d'enchaînement évaluée paire par paire
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from graphe_compatibilite import GrapheCompatibilite
+from table_voyages import TripTable
+
+ARRETS = ["GARE_N", "GARE_S", "MAIRIE", "HOPITAL", "DEPOT"]
+HLPS = [
+    {"from": "MAIR", "to": "GARE", "duration": 10},
+    {"from": "MAIR", "to": "GARE", "duration": 99},  # ignoré : seul le premier HLP compte
+    {"from": "HOPI", "to": "DEPO", "duration": 25},
+]
+
+
+def trajets_aleatoires(graine, nb_trajets=60):
+    rng = random.Random(graine)
+    trajets = []
+    for k in range(nb_trajets):
+        debut = rng.randrange(300, 720, 5)
+        trajets.append({
+            "start": debut,
+            "end": debut + rng.choice([0, 15, 30, 45]),
+            "from": rng.choice(ARRETS),
+            "to": rng.choice(ARRETS),
+            "num_trajet": k + 1,
+        })
+    return trajets
+
+
+def enchainement(t1, t2, battement_min, battement_max, longueur, verifier_arrets, hlps):
+    """Règle de référence, écrite directement pour une paire de trajets."""
+    battement = t2["start"] - t1["end"]
+    if battement < 0:
+        return False
+
+    def dans_limites(valeur):
+        return valeur >= battement_min and (battement_max is None or valeur <= battement_max)
+
+    depart, arrivee = t1["to"][:longueur], t2["from"][:longueur]
+    if not verifier_arrets or depart == arrivee:
+        return dans_limites(battement)
+    for hlp in hlps:
+        if hlp["from"][:longueur] == depart and hlp["to"][:longueur] == arrivee:
+            return dans_limites(battement + hlp["duration"])
+    return False
+
+
+def matrice_reference(trajets, *regle):
+    n = len(trajets)
+    return np.array([
+        [i != j and enchainement(trajets[i], trajets[j], *regle) for j in range(n)]
+        for i in range(n)
+    ], dtype=bool).reshape(n, n)
+
+
+@pytest.mark.parametrize("battement_max", [None, 40])
+@pytest.mark.parametrize("longueur", [3, 4])
+@pytest.mark.parametrize("verifier_arrets", [True, False])
+def test_matrice_comme_regle_par_paire(battement_max, longueur, verifier_arrets):
+    for graine in range(3):
+        trajets = trajets_aleatoires(graine)
+        table = TripTable.depuis_trajets(trajets)
+        regle = (5, battement_max, longueur, verifier_arrets, HLPS)
+
+        # Petits blocs : le découpage en lignes ne doit rien changer
+        matrice = table.matrice_successeurs(5, battement_max, longueur, verifier_arrets, HLPS, taille_bloc=7)
+        assert np.array_equal(matrice, matrice_reference(trajets, *regle))
+
+        compacte = table.matrice_successeurs(5, battement_max, longueur, verifier_arrets, HLPS, compacte=True)
+        assert np.array_equal(np.unpackbits(compacte, axis=1, count=len(trajets)).astype(bool), matrice)
+
+
+def test_graphe_vectorise_comme_graphe_par_voyage():
+    trajets = trajets_aleatoires(7)
+    vectorise = GrapheCompatibilite.depuis_trajets(trajets, battement_min=5, battement_max=60,
+                                                   longueur_prefixe=4, connexions_hlp=HLPS)
+    par_voyage = GrapheCompatibilite(
+        debuts=[t["start"] for t in trajets],
+        fins=[t["end"] for t in trajets],
+        arrets_debut=[t["from"][:4] for t in trajets],
+        arrets_fin=[t["to"][:4] for t in trajets],
+        battement_min=5,
+        battement_max=60,
+        connexions_hlp=HLPS
+    )
+    assert vectorise.successeurs == par_voyage.successeurs
+    assert vectorise.predecesseurs == par_voyage.predecesseurs
+    # HLP retenus : codes internés d'un côté, chaînes de l'autre
+    assert {arc: hlp["duration"] for arc, hlp in vectorise.hlp.items()} == \
+        {arc: hlp["duration"] for arc, hlp in par_voyage.hlp.items()}
+    assert vectorise.hlp
+
+
+def test_matrice_table_vide():
+    table = TripTable.depuis_trajets([])
+    assert table.matrice_successeurs().shape == (0, 0)
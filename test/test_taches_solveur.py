@@ -0,0 +1,112 @@
+"""
+Tests des résolutions en arrière-plan (taches_solveur.py) sans interface :
+annulation, erreurs et progression de TacheSolveur / SuiviResolution
+
+Lancement depuis la racine du projet :
+    python -m pytest -q test
+"""
+
+import time
+
+from ortools.sat.python import cp_model
+
+from objet import voyage
+from taches_solveur import TacheSolveur
+
+
+def attendre(tache, delai=10.0):
+    """Attend la fin du thread de la tâche (False si le délai est dépassé)"""
+    limite = time.time() + delai
+    while not tache.terminee:
+        if time.time() > limite:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def modele_enumeration(nb_variables=20):
+    """2**nb_variables solutions : l'énumération dure bien plus que les tests"""
+    model = cp_model.CpModel()
+    for i in range(nb_variables):
+        model.NewBoolVar(f"x{i}")
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    solver.parameters.num_workers = 1
+    solver.parameters.max_time_in_seconds = 60
+    return solver, model
+
+
+def enumerer(suivi):
+    solver, model = modele_enumeration()
+    return solver.StatusName(suivi.resoudre(solver, model))
+
+
+def test_annuler_avant_resolution():
+    tache = TacheSolveur(enumerer)
+    tache.annuler()
+    debut = time.time()
+    tache.demarrer()
+
+    assert attendre(tache)
+    assert time.time() - debut < 5  # temps limite ramené à 0, pas 60 s
+    assert tache.annulee and tache.erreur is None
+    assert tache.resultat in ("FEASIBLE", "UNKNOWN")
+
+
+def test_annuler_pendant_resolution():
+    tache = TacheSolveur(enumerer).demarrer()
+    limite = time.time() + 10
+    while tache.progression() is None and time.time() < limite:
+        time.sleep(0.01)
+    assert tache.progression() is not None and not tache.terminee
+
+    tache.annuler()
+    assert attendre(tache)
+    assert tache.annulee and tache.resultat == "FEASIBLE"
+    # Arrêt bien avant la fin de l'énumération
+    assert tache.progression()['nb_solutions'] < 2 ** 20
+
+
+def test_erreur_transmise():
+    def echouer(suivi):
+        raise ValueError("données invalides")
+
+    tache = TacheSolveur(echouer).demarrer()
+    assert attendre(tache)
+    assert isinstance(tache.erreur, ValueError)
+    assert tache.resultat is None and not tache.annulee
+
+
+def test_progression_vide_la_file():
+    def resoudre(suivi):
+        solver, model = modele_enumeration(nb_variables=3)
+        return solver.StatusName(suivi.resoudre(solver, model))
+
+    tache = TacheSolveur(resoudre)
+    assert tache.progression() is None and tache.temps_ecoule == 0.0
+    tache.demarrer()
+    assert attendre(tache)
+    assert tache.resultat == "OPTIMAL"
+
+    # Seule la dernière des 8 solutions est gardée, la file est vidée
+    progression = tache.progression()
+    assert progression['nb_solutions'] == 8
+    assert tache.suivi.messages.empty()
+    assert tache.progression() is progression
+
+
+def test_solvertest_en_arriere_plan(entrainement):
+    # Chemin de l'onglet solveur de main.py : solvertest(..., suivi=suivi)
+    voyages = [
+        voyage("L1", 1, "GARE1", "MAIR1", "06:00", "06:30"),
+        voyage("L1", 2, "MAIR1", "GARE1", "06:40", "07:10"),
+        voyage("L1", 3, "GARE1", "MAIR1", "07:20", "07:50"),
+    ]
+    tache = TacheSolveur(lambda suivi: entrainement.solvertest(
+        voyages, battement_minimum=5, max_solutions=3, suivi=suivi)).demarrer()
+
+    assert attendre(tache, 30)
+    assert tache.erreur is None and tache.resultat
+    assert tache.progression()['nb_solutions'] >= 1
+    for solution in tache.resultat:
+        assert sorted(v.num_voyage for s in solution for v in s.get_voyages()) == [1, 2, 3]